@@ -0,0 +1,129 @@
+"""
+Map rendering: the draw_map_overlay that classified every tile, every frame,
+through the lru_cached terrain predicates versus the current renderer, both
+redrawing its static layer from the baked TerrainRaster every frame and
+reusing the cached layer as it does while the map sits open. Also reports the
+one-off raster compile and checks the renderers produce the same pixels.
+
+The old renderer is loaded from pygame_main.py at LEGACY_REV with git, so
+run this from a checkout with history.
+
+    python benchmarks/bench_map.py [frames]
+"""
+
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+import pygame
+
+from engine.game_state import GameState
+from pygame_main import (
+    HEIGHT,
+    MAP_BACKDROP,
+    MAP_GLYPH_CACHE,
+    WIDTH,
+    _MAP_LAYER,
+    _map_window,
+    draw_map_overlay,
+    get_terrain,
+)
+
+# Last revision whose map renderer classified every tile each frame.
+LEGACY_REV = "ceee64e10c44c96def8b26b5cfd2fc6924cbf420"
+
+# Glow and flicker follow the clock; pin it so both renderers draw the same frame.
+pygame.time.get_ticks = lambda: 0
+
+
+def legacy_module():
+    """pygame_main as of LEGACY_REV, imported under another name."""
+    source = subprocess.run(
+        ["git", "show", f"{LEGACY_REV}:src/pygame_main.py"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False, encoding="utf-8") as f:
+        f.write(source)
+    try:
+        spec = importlib.util.spec_from_file_location("legacy_pygame_main", f.name)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        os.unlink(f.name)
+    return module
+
+
+def scenarios():
+    start = GameState()
+    explored = GameState()
+    for rid in explored.rooms:
+        explored.player.discovered_rooms.add(rid)
+        explored.player.explored_rooms.add(rid)
+    explored.player.inventory["raft"] = 1
+    cabin = GameState()
+    cabin.current_room_id = "cabin_interior"
+    return [
+        ("new game", start, None),
+        ("all explored", explored, None),
+        ("cabin focus", cabin, "cabin_interior"),
+    ]
+
+
+def redraw_map_overlay(*args, **kwargs):
+    _MAP_LAYER.key = None
+    draw_map_overlay(*args, **kwargs)
+
+
+def ms_per_frame(draw, screen, fonts, state, focus, frames: int) -> float:
+    draw(screen, *fonts, state, focus_room_id=focus)   # warm caches
+    best = float("inf")
+    for _ in range(3):
+        t0 = time.perf_counter()
+        for _ in range(frames):
+            draw(screen, *fonts, state, focus_room_id=focus)
+        best = min(best, time.perf_counter() - t0)
+    return best / frames * 1000
+
+
+def pixels(draw, fonts, state, focus) -> bytes:
+    surf = pygame.Surface((WIDTH, HEIGHT))
+    surf.fill(MAP_BACKDROP)
+    draw(surf, *fonts, state, focus_room_id=focus)
+    return pygame.image.tobytes(surf, "RGB")
+
+
+def main() -> None:
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    fonts = (pygame.font.SysFont(None, 42, bold=True), pygame.font.SysFont(None, 24))
+
+    _cell, cols, rows, col0, row0 = _map_window()
+    t0 = time.perf_counter()
+    terrain = get_terrain(col0, row0, cols, rows)
+    compile_ms = (time.perf_counter() - t0) * 1000
+    print(f"raster compile: {compile_ms:8.1f} ms  ({terrain.cols}x{terrain.rows} tiles, "
+          f"{len(terrain.glyphs)} glyphs, {len(terrain.colors)} colours)")
+    legacy_draw_map_overlay = legacy_module().draw_map_overlay
+    for label, state, focus in scenarios():
+        old = ms_per_frame(legacy_draw_map_overlay, screen, fonts, state, focus, frames)
+        full = ms_per_frame(redraw_map_overlay, screen, fonts, state, focus, frames)
+        new = ms_per_frame(draw_map_overlay, screen, fonts, state, focus, frames)
+        same = pixels(legacy_draw_map_overlay, fonts, state, focus) == pixels(draw_map_overlay, fonts, state, focus)
+        print(f"{label:14s} predicates {old:7.2f} ms   raster {full:7.2f} ms   "
+              f"cached layer {new:6.2f} ms  ({old / new:.0f}x){'' if same else '  PIXELS DIFFER'}")
+    for cell, atlas in sorted(MAP_GLYPH_CACHE.items()):
+        print(f"glyph atlas {cell}px: {len(atlas)} of {atlas.capacity} glyphs, "
+              f"{atlas.surface.get_width()}x{atlas.surface.get_height()} px")
+
+
+if __name__ == "__main__":
+    main()
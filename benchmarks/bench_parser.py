@@ -0,0 +1,167 @@
+"""
+Parser throughput: the regex/list-slice parser that shipped before the
+compiled token tries versus engine.parser.parse_command.
+
+    python benchmarks/bench_parser.py [rounds]
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from engine.parser import (
+    DIRECTION_ALIASES,
+    SINGLE_ALIASES,
+    TARGET_FILLERS,
+    VERB_ALIASES,
+    get_matcher,
+    parse_cache_info,
+    parse_command,
+)
+
+COMMANDS = [
+    "go north", "n", "look", "take machete", "pick up the old map",
+    "examine the stump", "look at rope post", "walk to the east", "craft torch",
+    "combine rope with hook", "enter cabin", "read old map", "what now",
+    "where am i", "use climbing gear", "light the lighthouse light", "eat",
+    "gather wood", "drop stone", "inventory", "head towards the signal brazier",
+    "check the maintenance locker", "grab the climbing gear please", "xyzzy",
+    "take signal flare",
+]
+
+# The hand-maintained table the legacy parser relied on.
+LEGACY_TWO_WORD_TARGETS = {
+    ("climbing", "gear"): "climbing_gear",
+    ("old", "map"): "old_map",
+    ("river", "lake"): "river_lake",
+    ("river", "run"): "river_run",
+    ("flat", "stone"): "flat_stone",
+    ("cave", "tunnel"): "cave_tunnel",
+    ("cave", "chamber"): "cave_chamber",
+    ("cabin", "interior"): "cabin_interior",
+    ("loft", "ladder"): "loft_ladder",
+    ("cabin", "bunk"): "cabin_bunk",
+    ("work", "table"): "worktable",
+    ("stone", "column"): "stone_column",
+    ("echo", "pool"): "echo_pool",
+    ("chamber", "ledge"): "chamber_ledge",
+    ("flat", "rock"): "flat_rock",
+    ("rope", "post"): "rope_post",
+    ("fallen", "tree"): "fallen_tree",
+    ("trail", "marker"): "trail_marker",
+    ("cliff", "edge"): "cliff_edge",
+    ("tide", "pool"): "tide_pool",
+    ("signal", "brazier"): "signal_brazier",
+    ("signal", "lens"): "signal_lens",
+    ("signal", "lever"): "signal_lever",
+    ("spiral", "stairs"): "spiral_stairs",
+    ("fogged", "window"): "fogged_window",
+    ("maintenance", "locker"): "maintenance_locker",
+    ("winch", "console"): "winch_console",
+    ("shutter", "crank"): "shutter_crank",
+    ("catwalk", "hatch"): "catwalk_hatch",
+    ("lighthouse", "light"): "lighthouse_light",
+    ("fire", "pit"): "firepit",
+    ("far", "shore"): "far_shore",
+}
+
+
+def legacy_parse_command(text: str) -> tuple[str, str | None]:
+    def tokenize(text):
+        cleaned = re.sub(r"[^a-z0-9\s]", " ", text.lower()).strip()
+        return [t for t in cleaned.split() if t]
+
+    def trim(tokens):
+        idx = 0
+        while idx < len(tokens) and tokens[idx] in TARGET_FILLERS:
+            idx += 1
+        return tokens[idx:]
+
+    def map_target(tokens):
+        if not tokens:
+            return None
+        if len(tokens) >= 2:
+            mapped = LEGACY_TWO_WORD_TARGETS.get((tokens[0], tokens[1]))
+            if mapped:
+                return mapped
+        if tokens[0] == "rafter":
+            return "raft"
+        return tokens[0]
+
+    raw = text.strip().lower()
+    if raw == "?":
+        return "help", None
+    parts = tokenize(text)
+    if not parts:
+        return "", None
+    if len(parts) == 1:
+        d = DIRECTION_ALIASES.get(parts[0])
+        if d:
+            return "go", d
+        alias = SINGLE_ALIASES.get(parts[0])
+        if alias:
+            return alias
+    if parts[:2] == ["look", "around"]:
+        return "look", None
+    if parts[:2] == ["look", "at"]:
+        return "examine", map_target(trim(parts[2:]))
+    if parts[:3] == ["where", "am", "i"]:
+        return "look", None
+    if parts[:3] == ["how", "to", "play"]:
+        return "help", None
+    if parts[:4] == ["what", "do", "i", "do"] or parts[:2] == ["what", "now"]:
+        return "hint", None
+    if parts[:2] == ["pick", "up"]:
+        return "take", map_target(trim(parts[2:]))
+    verb = VERB_ALIASES.get(parts[0], parts[0])
+    rest = parts[1:]
+    if verb == "go":
+        dest_tokens = trim(rest)
+        if dest_tokens and dest_tokens[0] in DIRECTION_ALIASES:
+            return "go", DIRECTION_ALIASES[dest_tokens[0]]
+        return "go", map_target(dest_tokens)
+    if verb == "combine":
+        combo_parts = [t for t in rest if t not in {"the", "a", "an", "with", "and"}]
+        if not combo_parts:
+            return "combine", None
+        return "combine", " ".join(combo_parts)
+    target = map_target(trim(rest))
+    if verb == "read" and not target:
+        return "read", None
+    return verb, target
+
+
+def best_of(fn, rounds: int, runs: int = 5) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            for cmd in COMMANDS:
+                fn(cmd)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    parse_command("look")   # build the matcher outside the timed loop
+    total = rounds * len(COMMANDS)
+    old_s = best_of(legacy_parse_command, rounds)
+    new_s = best_of(get_matcher().parse, rounds)
+    cached_s = best_of(parse_command, rounds)
+    info = parse_cache_info()
+    print(f"commands parsed:  {total}")
+    print(f"legacy parser:    {total / old_s:10.0f} cmd/s")
+    print(f"compiled parser:  {total / new_s:10.0f} cmd/s  ({old_s / new_s:.2f}x)")
+    print(f"with parse cache: {total / cached_s:10.0f} cmd/s  ({old_s / cached_s:.2f}x, "
+          f"{info.hits} hits / {info.misses} misses)")
+    changed = [c for c in COMMANDS if legacy_parse_command(c) != parse_command(c)]
+    for cmd in changed:
+        print(f"  {cmd!r}: {legacy_parse_command(cmd)} -> {parse_command(cmd)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Headless replay throughput: rebuild a long recorded session with
+engine.replay and check it reproduces the recorded final snapshot.
+
+    python benchmarks/bench_replay.py [laps]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from engine.game_state import GameState
+from engine.replay import Recorder, diff_snapshots, replay
+
+OPENING = ["take note", "read note", "take machete", "go north"]
+LAP = ["go east", "go east", "look", "go south", "examine stump", "go west",
+       "go west", "inventory", "go north", "gather wood", "hint", "xyzzy"]
+
+
+def record(laps: int):
+    gs = GameState()
+    recorder = Recorder.attach(gs, from_start=True)
+    for text in OPENING:
+        gs.run_command(text)
+        while gs.combat is not None:
+            gs.combat_action("attack")
+    for _ in range(laps):
+        for text in LAP:
+            gs.run_command(text)
+    return recorder.finish(gs)
+
+
+def main() -> None:
+    laps = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    log = record(laps)
+    best = float("inf")
+    for _ in range(3):
+        t0 = time.perf_counter()
+        state = replay(log)
+        best = min(best, time.perf_counter() - t0)
+    diffs = diff_snapshots(log.final, state.snapshot())
+    print(f"events:         {len(log.events)}")
+    print(f"replay:         {best * 1000:8.1f} ms  ({len(log.events) / best:.0f} events/s)")
+    print(f"final snapshot: {'identical' if not diffs else f'{len(diffs)} differences'}")
+
+
+if __name__ == "__main__":
+    main()
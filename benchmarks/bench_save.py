@@ -0,0 +1,56 @@
+"""
+Per-move save cost: rewriting the full snapshot the way save_game_state
+used to versus appending a journal entry with engine.journal.SaveJournal,
+written inline or handed to the background writer thread (game-thread
+time only).
+
+    python benchmarks/bench_save.py [moves]
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from engine.game_state import GameState
+from engine.journal import SaveJournal
+
+ROUTE = ["east"] * 6 + ["south"] * 6 + ["west"] * 6 + ["north"] * 6
+
+
+def walk(state, moves: int, save) -> float:
+    elapsed = 0.0
+    for i in range(moves):
+        state.process_command("go", ROUTE[i % len(ROUTE)])
+        t0 = time.perf_counter()
+        save(state)
+        elapsed += time.perf_counter() - t0
+    return elapsed / moves * 1e6
+
+
+def main() -> None:
+    moves = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    tmp = Path(tempfile.mkdtemp())
+
+    def full_rewrite(state):
+        with (tmp / "full.json").open("w", encoding="utf-8") as f:
+            json.dump(state.snapshot(), f, ensure_ascii=False, separators=(",", ":"))
+
+    journal = SaveJournal(tmp / "journal.json")
+    full_us = walk(GameState(), moves, full_rewrite)
+    journal_us = walk(GameState(), moves, journal.record)
+    background = SaveJournal(tmp / "background.json", background=True)
+    background_us = walk(GameState(), moves, background.record)
+    background.close()
+    print(f"moves:             {moves}")
+    print(f"full snapshot:     {full_us:8.1f} us/save")
+    print(f"journal append:    {journal_us:8.1f} us/save  ({full_us / journal_us:.1f}x, "
+          f"compacting every {journal.compact_every})")
+    print(f"background writer: {background_us:8.1f} us/save  ({full_us / background_us:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+"Did you mean" lookups: difflib.get_close_matches over the full candidate
+list versus engine.suggest.SuggestionIndex, at growing vocabulary sizes.
+
+    python benchmarks/bench_suggest.py
+"""
+
+import difflib
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from engine.suggest import SuggestionIndex
+
+SYLLABLES = ["ba", "ro", "ken", "sha", "lf", "cab", "in", "bun", "ston", "e",
+             "col", "umn", "rop", "post", "tid", "pool", "sig", "nal", "lan", "tern"]
+
+
+def make_words(count: int, rng: random.Random) -> list[str]:
+    words = set()
+    while len(words) < count:
+        parts = ["".join(rng.choices(SYLLABLES, k=rng.randint(2, 3))) for _ in range(rng.randint(1, 2))]
+        words.add("_".join(parts))
+    return sorted(words)
+
+
+def typo(word: str, rng: random.Random) -> str:
+    i = rng.randrange(len(word) - 1)
+    kind = rng.randrange(3)
+    if kind == 0:
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    if kind == 1:
+        return word[:i] + word[i + 1:]
+    return word[:i] + rng.choice("aeiou") + word[i:]
+
+
+def per_lookup_us(fn, queries) -> float:
+    t0 = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - t0) / len(queries) * 1e6
+
+
+def main() -> None:
+    rng = random.Random(7)
+    print(f"{'words':>8}{'difflib us':>14}{'index us':>12}{'speedup':>10}{'same answer':>14}")
+    for count in (100, 1_000, 10_000, 30_000):
+        words = make_words(count, rng)
+        index = SuggestionIndex(words)
+        queries = [typo(rng.choice(words), rng) for _ in range(50)]
+        slow = per_lookup_us(lambda q: difflib.get_close_matches(q, words, n=1, cutoff=0.6), queries)
+        fast = per_lookup_us(index.suggest, queries)
+        same = sum(
+            (difflib.get_close_matches(q, words, n=1, cutoff=0.6) or [None])[0] == index.suggest(q)
+            for q in queries[:50]
+        )
+        print(f"{count:>8}{slow:>14.1f}{fast:>12.1f}{slow / fast:>10.1f}x{same:>11}/50")
+
+
+if __name__ == "__main__":
+    main()
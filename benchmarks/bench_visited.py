@@ -0,0 +1,110 @@
+"""
+Visited-tile storage: the set of (x, y) tuples with run-length save lists
+that shipped before versus engine.models.VisitedTiles (chunked bitset with
+base64 chunks), over a random walk revealing discs of REVEAL_RADIUS.
+
+    python benchmarks/bench_visited.py [steps]
+"""
+
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from engine.constants import REVEAL_RADIUS, decode_visited_tiles
+from engine.models import VisitedTiles
+
+
+def legacy_encode(tiles):
+    rows = {}
+    for x, y in tiles:
+        rows.setdefault(int(y), []).append(int(x))
+    encoded = []
+    for y in sorted(rows):
+        xs = sorted(set(rows[y]))
+        runs = []
+        start = prev = xs[0]
+        for x in xs[1:]:
+            if x == prev + 1:
+                prev = x
+                continue
+            runs.append([start, prev])
+            start = prev = x
+        runs.append([start, prev])
+        encoded.append([y, runs])
+    return encoded
+
+
+def legacy_mark(tiles, wx, wy):
+    r = REVEAL_RADIUS
+    for dy in range(-r, r + 1):
+        for dx in range(-r, r + 1):
+            if dx * dx + dy * dy <= r * r + 1:
+                tiles.add((wx + dx, wy + dy))
+
+
+def walk(steps):
+    rng = random.Random(3)
+    x = y = 0
+    path = []
+    for _ in range(steps):
+        dx, dy = rng.choice([(1, 0), (-1, 0), (0, 1), (0, -1)])
+        x, y = x + dx * 2, y + dy * 2
+        path.append((x, y))
+    return path
+
+
+def measure(make, mark, path):
+    t0 = time.perf_counter()
+    tiles = make()
+    for wx, wy in path:
+        mark(tiles, wx, wy)
+    mark_s = time.perf_counter() - t0
+    tracemalloc.start()
+    tiles = make()
+    for wx, wy in path:
+        mark(tiles, wx, wy)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return tiles, mark_s, size
+
+
+def timed(fn, runs=5):
+    best = float("inf")
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+
+def main() -> None:
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    path = walk(steps)
+    old, old_mark, old_mem = measure(set, legacy_mark, path)
+    new, new_mark, new_mem = measure(VisitedTiles, lambda t, x, y: t.reveal_disc(x, y, REVEAL_RADIUS), path)
+    assert new == old
+
+    old_enc, old_enc_s = timed(lambda: legacy_encode(old))
+    # Every chunk dirty, as after the first save of a session.
+    new_enc, new_enc_s = timed(lambda: (new._encoded.clear(), new.encode())[1])
+    _, new_enc_cached_s = timed(new.encode)
+    _, old_dec_s = timed(lambda: decode_visited_tiles(old_enc))
+    _, new_dec_s = timed(lambda: VisitedTiles.decode(new_enc))
+
+    print(f"tiles revealed:     {len(old)}")
+    print(f"{'':20}{'set + runs':>14}{'bitset':>14}")
+    print(f"{'memory KiB':20}{old_mem / 1024:>14.1f}{new_mem / 1024:>14.1f}")
+    print(f"{'mark all ms':20}{old_mark * 1e3:>14.1f}{new_mark * 1e3:>14.1f}")
+    print(f"{'encode ms':20}{old_enc_s * 1e3:>14.2f}{new_enc_s * 1e3:>14.2f}"
+          f"   ({new_enc_cached_s * 1e3:.3f} ms with clean chunks cached)")
+    print(f"{'decode ms':20}{old_dec_s * 1e3:>14.2f}{new_dec_s * 1e3:>14.2f}")
+    print(f"{'save bytes':20}{len(json.dumps(old_enc)):>14}{len(json.dumps(new_enc)):>14}")
+
+
+if __name__ == "__main__":
+    main()
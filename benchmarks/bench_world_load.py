@@ -0,0 +1,93 @@
+"""
+Cold-start benchmark: parse game.json and build rooms vs. load the compiled
+world bundle. Uses a synthetic world so the numbers scale past the shipped map.
+
+    python benchmarks/bench_world_load.py [room_count]
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from engine import loader
+
+
+def make_world(room_count: int) -> dict:
+    base = loader.load_game_data()
+    rooms = []
+    for i in range(room_count):
+        exits = {}
+        if i > 0:
+            exits["west"] = f"room_{i - 1}"
+        if i < room_count - 1:
+            exits["east"] = f"room_{i + 1}"
+        features = [
+            {
+                "id": f"feature_{i}_{j}",
+                "label": chr(ord("A") + j),
+                "desc": f"Feature {j} of room {i}.",
+                "examine_clue": "Nothing unusual." if j % 2 else "",
+                "pos": [j * 2, j + 1],
+            }
+            for j in range(6)
+        ]
+        rooms.append({
+            "id": f"room_{i}",
+            "name": f"Room {i}",
+            "description": f"A generated room number {i}.",
+            "description_with_lantern": "Light catches the walls.",
+            "exits": exits,
+            "gather": {"wood": 1, "stone": 1},
+            "actions": ["look", "gather"],
+            "requires": [],
+            "encounters": [],
+            "loot": {"wood": 1} if i % 3 == 0 else {},
+            "loot_hidden": {},
+            "loot_hint": {},
+            "width": 15,
+            "height": 11,
+            "features": features,
+        })
+    world = dict(base)
+    world["rooms"] = rooms
+    world["starting_room"] = "room_0"
+    return world
+
+
+def best_of(fn, runs=5) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        loader.clear_world_cache()
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    room_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = Path(tmp) / "game.json"
+        data_path.write_text(json.dumps(make_world(room_count)), encoding="utf-8")
+        bundle_path = loader.bundle_path_for(data_path)
+
+        json_s = best_of(lambda: loader.WorldTemplate(loader.load_game_data(data_path)))
+        loader.compile_world_bundle(data_path)
+        bundle_s = best_of(lambda: loader.load_world_bundle(bundle_path, data_path))
+        assert loader.load_world_template(data_path).rooms.keys() == \
+            loader.WorldTemplate(loader.load_game_data(data_path)).rooms.keys()
+
+        print(f"rooms:          {room_count}")
+        print(f"json + Room():  {json_s * 1000:8.1f} ms")
+        print(f"bundle:         {bundle_s * 1000:8.1f} ms")
+        print(f"speedup:        {json_s / bundle_s:8.2f}x")
+        print(f"json size:      {data_path.stat().st_size / 1024:8.0f} KiB")
+        print(f"bundle size:    {bundle_path.stat().st_size / 1024:8.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
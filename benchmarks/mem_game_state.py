@@ -0,0 +1,108 @@
+"""
+tracemalloc report: memory held per GameState with the old dict-based models
+(every session re-parsing game.json into its own rooms) versus the shared
+template with slotted Room/Player/Feature records.
+
+    python benchmarks/mem_game_state.py [sessions]
+"""
+
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from engine.game_state import GameState
+from engine.loader import load_game_data, load_world_template
+
+
+class LegacyRoom:
+    """The pre-slots Room, kept here only as a measuring baseline."""
+
+    def __init__(self, data: dict):
+        self.id          = data.get("id")
+        self.name        = data.get("name", "")
+        self.description = data.get("description", "")
+        self.exits       = data.get("exits", {})
+        self.gather      = data.get("gather", {})
+        self.actions     = data.get("actions", [])
+        self.requires    = data.get("requires", [])
+        self.encounters  = data.get("encounters", [])
+        self.loot        = dict(data.get("loot", {}))
+        self.loot_hidden = dict(data.get("loot_hidden", {}))
+        self.loot_hint   = dict(data.get("loot_hint", {}))
+        self._conditional_descs = {
+            k[len("description_with_"):]: v
+            for k, v in data.items()
+            if k.startswith("description_with_")
+        }
+        self.width       = int(data.get("width",  1))
+        self.height      = int(data.get("height", 1))
+        self.is_walkable = self.width > 1 or self.height > 1
+        self.features = []
+        for f in data.get("features", []):
+            pos = f.get("pos", [-1, -1])
+            self.features.append({
+                "id":           f.get("id", ""),
+                "label":        f.get("label", "?"),
+                "desc":         f.get("desc", ""),
+                "examine_clue": f.get("examine_clue", ""),
+                "enter_to":     f.get("enter_to"),
+                "pos":          (int(pos[0]), int(pos[1])),
+            })
+
+
+class LegacyPlayer:
+    def __init__(self, max_hp: int = 30):
+        self.max_hp = max_hp
+        self.hp     = max_hp
+        self.discovered_rooms = set()
+        self.explored_rooms   = set()
+        self.room_positions   = {}
+        self.current_pos      = (0, 0)
+        self.visited_tiles    = set()
+        self.inventory = {"wood": 0, "stone": 0, "food": 0}
+        self.torch_uses = None
+        self.overweight = False
+        self.defeated_enemies = set()
+
+
+def legacy_session():
+    game_data = load_game_data()
+    rooms = {r["id"]: LegacyRoom(r) for r in game_data["rooms"]}
+    return LegacyPlayer(), game_data, rooms
+
+
+def current_session():
+    gs = GameState()
+    for rid in gs.rooms:      # worst case: the session has touched every room
+        gs.rooms[rid]
+    return gs
+
+
+def measure(factory, sessions: int) -> float:
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    keep = [factory() for _ in range(sessions)]
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del keep
+    return used / sessions
+
+
+def main() -> None:
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    load_world_template()   # the shared template is paid once per process
+
+    legacy = measure(legacy_session, sessions)
+    current = measure(current_session, sessions)
+    untouched = measure(GameState, sessions)
+    print(f"sessions measured:            {sessions}")
+    print(f"old models, per GameState:    {legacy / 1024:8.1f} KiB")
+    print(f"slotted + shared template:    {current / 1024:8.1f} KiB  (every room touched)")
+    print(f"slotted + shared template:    {untouched / 1024:8.1f} KiB  (fresh session)")
+    print(f"reduction:                    {legacy / current:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
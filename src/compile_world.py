@@ -0,0 +1,14 @@
+import sys
+from pathlib import Path
+
+from engine.loader import DATA_PATH, compile_world_bundle
+
+
+def main() -> None:
+    data_path = Path(sys.argv[1]) if len(sys.argv) > 1 else DATA_PATH
+    bundle_path = compile_world_bundle(data_path)
+    print(f"Compiled {data_path.name} -> {bundle_path}")
+
+
+if __name__ == "__main__":
+    main()
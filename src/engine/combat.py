@@ -65,7 +65,7 @@ class CombatState:
         food = player.inventory.get("food", 0)
         if food <= 0:
             return ["no food left."]
-        player.inventory["food"] -= 1
+        player.inventory.remove("food")
         healed = min(5, player.max_hp - player.hp)
         player.hp = min(player.max_hp, player.hp + 5)
         self.eat_cooldown = 2
@@ -1,14 +1,43 @@
 from __future__ import annotations
 
-import difflib
-
-from engine.constants import ENTER_TARGET_ALIASES
+from engine.loader import load_world_template
+from engine.registry import command
 
 
 class CommandsMixin:
 
+    def _vocabulary(self):
+        return getattr(self, "vocabulary", None) or load_world_template().vocabulary
+
     def _resolve_enter_target(self, target: str) -> str:
-        return ENTER_TARGET_ALIASES.get(target, target)
+        return self._vocabulary().enter_aliases.get(target, target)
+
+    def _pick_target(self, target):
+        """First reading of a parsed phrase that fits the current room.
+
+        A phrase can spell a feature that only exists in another room
+        ("cabin door" outside the cabin); that reading is passed over for
+        a shorter one, down to the head word, as the parser read it before
+        phrases were generated from world ids.
+        """
+        candidates = getattr(target, "candidates", None)
+        if not candidates:
+            return target
+        feature_ids = self._vocabulary().feature_ids
+        room = self.get_current_room()
+        for name in candidates[:-1]:
+            if name not in feature_ids or (room is not None and room.find_feature(name) is not None):
+                return name
+        return candidates[-1]
+
+    def _did_you_mean(self, target: str, *kinds: str) -> list[str]:
+        vocabulary = self._vocabulary()
+        if target in vocabulary.ids:
+            return []
+        guess = vocabulary.suggest(target, *kinds)
+        if guess is None:
+            return []
+        return [f"Did you mean {guess.replace('_', ' ')}?"]
 
     def _context_hint(self, room) -> str | None:
         inv = self.player.inventory
@@ -84,6 +113,7 @@ class CommandsMixin:
         self.is_running = False
         return lines
 
+    @command("help", takes_target=False)
     def handle_help(self) -> list[str]:
         return [
             "Objective: reach the lighthouse top and signal SOS.",
@@ -95,6 +125,7 @@ class CommandsMixin:
             "Natural input works too: pick up raft, look at rope post, move north, go to cave.",
         ]
 
+    @command("hint", takes_target=False)
     def handle_hint(self) -> list[str]:
         room = self.get_current_room()
         if not room:
@@ -104,6 +135,7 @@ class CommandsMixin:
             return [hint]
         return ["Hint: examine nearby features and read any notes or maps you find."]
 
+    @command("enter")
     def handle_enter(self, target) -> list[str]:
         if not target:
             return ["Enter what? Example: enter cabin"]
@@ -120,26 +152,27 @@ class CommandsMixin:
             if self.player.inventory.get("raft", 0) > 0:
                 return self.handle_use("raft")
             return ["You step into the shallows. Move with go north, south, east, or west."]
-        for feat in room.features:
-            if feat["id"] == target or feat["label"].lower() == target:
-                revealed = room.reveal_loot_for_feature(feat["id"])
-                destination = feat.get("enter_to")
-                if destination:
-                    lines = [f"You step into the {feat['id'].replace('_',' ')}."]
-                    for item in revealed:
-                        item_data = self.item_registry.get(item, {})
-                        desc = item_data.get("desc", "")
-                        lines.append(f"You find a {item.replace('_',' ')} here. {desc}")
-                        lines.append(f"Type  take {item.replace('_',' ')}  to pick it up.")
-                    lines.extend(self._move_to_room_from_feature(destination))
-                    return lines
+        feat = room.find_feature(target)
+        if feat is not None:
+            revealed = room.reveal_loot_for_feature(feat["id"])
+            destination = feat.get("enter_to")
+            if destination:
                 lines = [f"You step into the {feat['id'].replace('_',' ')}."]
-                extra = self.handle_examine(feat["id"])
-                if extra and extra[0].startswith("You look closely"):
-                    extra = extra[1:]
-                return lines + extra
-        return [f"You cannot enter the {target.replace('_',' ')} here."]
-
+                for item in revealed:
+                    item_data = self.item_registry.get(item, {})
+                    desc = item_data.get("desc", "")
+                    lines.append(f"You find a {item.replace('_',' ')} here. {desc}")
+                    lines.append(f"Type  take {item.replace('_',' ')}  to pick it up.")
+                lines.extend(self._move_to_room_from_feature(destination))
+                return lines
+            lines = [f"You step into the {feat['id'].replace('_',' ')}."]
+            extra = self.handle_examine(feat["id"])
+            if extra and extra[0].startswith("You look closely"):
+                extra = extra[1:]
+            return lines + extra
+        return [f"You cannot enter the {target.replace('_',' ')} here."] + self._did_you_mean(target, "features")
+
+    @command("gather")
     def handle_gather(self, target) -> list[str]:
         if not target:
             return ["Gather what? Example: gather wood"]
@@ -154,6 +187,7 @@ class CommandsMixin:
         self._add_to_inventory(target, total)
         return [f"You gather {target}."]
 
+    @command("take")
     def handle_take(self, target) -> list[str]:
         if not target:
             return ["Take what? Example: take machete"]
@@ -164,12 +198,10 @@ class CommandsMixin:
         if available <= 0:
             if self.player.inventory.get(target, 0) > 0:
                 return [f"You already have the {target.replace('_',' ')}."]
-            return [f"There is no {target.replace('_',' ')} here."]
+            return [f"There is no {target.replace('_',' ')} here."] + self._did_you_mean(target, "items")
         if room.loot_hidden.get(target, False):
             return [f"You can't see anything like that. Try examining the area more carefully."]
-        room.loot[target] -= 1
-        if room.loot[target] <= 0:
-            del room.loot[target]
+        room.take_loot(target)
         self._add_to_inventory(target, 1)
         item_data = self.item_registry.get(target, {})
         desc = item_data.get("desc", "")
@@ -184,6 +216,7 @@ class CommandsMixin:
             self.player.torch_uses = item_data["uses"]
         return lines
 
+    @command("examine")
     def handle_examine(self, target) -> list[str]:
         if not target:
             return ["Examine what? Example: examine boulder"]
@@ -191,20 +224,20 @@ class CommandsMixin:
         if not room:
             return ["Error: current room not found."]
 
-        for feat in room.features:
-            if feat["id"] == target or feat["label"].lower() == target:
-                lines = [f"You look closely at the {feat['id'].replace('_',' ')}."]
-                lines.append(feat.get("desc", ""))
-                clue = feat.get("examine_clue", "")
-                if clue:
-                    lines.append(clue)
-                revealed = room.reveal_loot_for_feature(feat["id"])
-                for item in revealed:
-                    item_data = self.item_registry.get(item, {})
-                    desc = item_data.get("desc", "")
-                    lines.append(f"You find a {item.replace('_',' ')} here. {desc}")
-                    lines.append(f"Type  take {item.replace('_',' ')}  to pick it up.")
-                return lines
+        feat = room.find_feature(target)
+        if feat is not None:
+            lines = [f"You look closely at the {feat['id'].replace('_',' ')}."]
+            lines.append(feat.get("desc", ""))
+            clue = feat.get("examine_clue", "")
+            if clue:
+                lines.append(clue)
+            revealed = room.reveal_loot_for_feature(feat["id"])
+            for item in revealed:
+                item_data = self.item_registry.get(item, {})
+                desc = item_data.get("desc", "")
+                lines.append(f"You find a {item.replace('_',' ')} here. {desc}")
+                lines.append(f"Type  take {item.replace('_',' ')}  to pick it up.")
+            return lines
 
         if self.player.inventory.get(target, 0) > 0:
             item_data = self.item_registry.get(target, {})
@@ -220,8 +253,10 @@ class CommandsMixin:
                         item_data.get("desc", "No further detail."),
                         f"Type  take {target}  to pick it up."]
 
-        return [f"You don't see any {target.replace('_',' ')} to examine."]
+        return ([f"You don't see any {target.replace('_',' ')} to examine."]
+                + self._did_you_mean(target, "features", "items"))
 
+    @command("drop")
     def handle_drop(self, target) -> list[str]:
         if not target:
             return ["Drop what? Example: drop wood"]
@@ -231,9 +266,8 @@ class CommandsMixin:
         room = self.get_current_room()
         if not room:
             return ["Error: current room not found."]
-        self.player.inventory[target] -= 1
-        room.loot[target] = room.loot.get(target, 0) + 1
-        room.loot_hidden[target] = False
+        self.player.inventory.remove(target)
+        room.put_loot(target)
         return [f"You drop the {target.replace('_',' ')}.",
                 "It lands on the ground. You can take it again if you change your mind."]
 
@@ -257,6 +291,7 @@ class CommandsMixin:
         lines.append("Type craft <item>. Example: craft spear")
         return lines
 
+    @command("craft")
     def handle_craft(self, target) -> list[str]:
         if not self.recipes:
             return ["You do not know any recipes yet."]
@@ -264,10 +299,9 @@ class CommandsMixin:
             return self._crafting_recipe_lines()
         target = str(target).strip().lower().replace(" ", "_")
         if target not in self.recipes:
-            known = sorted(self.recipes.keys())
-            guess = difflib.get_close_matches(target, known, n=1, cutoff=0.60)
+            guess = self._vocabulary().suggest(target, "recipes")
             if guess:
-                return [f"You don't know how to craft {target.replace('_', ' ')}. Try: craft {guess[0].replace('_', ' ')}."]
+                return [f"You don't know how to craft {target.replace('_', ' ')}. Try: craft {guess.replace('_', ' ')}."]
             return [f"You don't know how to craft {target.replace('_', ' ')}.", "Type craft to list recipes."]
         recipe = self.recipes[target]
         required = recipe.get("requires", {})
@@ -282,7 +316,7 @@ class CommandsMixin:
         if missing:
             return [f"Cannot craft {target.replace('_', ' ')}. You need: {', '.join(missing)}."]
         for ingredient, amount in required.items():
-            self.player.inventory[ingredient] -= int(amount)
+            self.player.inventory.remove(ingredient, int(amount))
         self._add_to_inventory(target, 1)
         item_data = self.item_registry.get(target, {})
         desc = item_data.get("desc", "")
@@ -294,6 +328,7 @@ class CommandsMixin:
         lines.append(f"Carry weight: {carried:g} / {int(limit)} kg.")
         return lines
 
+    @command("read")
     def handle_read(self, target) -> list[str]:
         if not target:
             for item, count in self.player.inventory.items():
@@ -315,6 +350,7 @@ class CommandsMixin:
         text_lines = self.game_data.get(text_key, self.game_data.get("note_text", ["The page is blank."]))
         return [f"\n--- {target.replace('_', ' ').upper()} ---"] + text_lines + ["---"]
 
+    @command("use")
     def handle_use(self, target) -> list[str]:
         if not target:
             return ["Use what? Example: use raft"]
@@ -417,6 +453,7 @@ class CommandsMixin:
             desc if desc else "Nothing here needs it right now.",
         ]
 
+    @command("combine")
     def handle_combine(self, target) -> list[str]:
         if not target:
             return ["Combine what? Example: combine rope hook"]
@@ -432,8 +469,8 @@ class CommandsMixin:
         for item in (a, b):
             if self.player.inventory.get(item, 0) <= 0:
                 return [f"You are not carrying any {item.replace('_',' ')}."]
-        self.player.inventory[a] -= 1
-        self.player.inventory[b] -= 1
+        self.player.inventory.remove(a)
+        self.player.inventory.remove(b)
         result = recipe["result"]
         self._add_to_inventory(result, 1)
         desc = recipe.get("desc", "")
@@ -443,6 +480,7 @@ class CommandsMixin:
         lines.append(f"You now have: {result.replace('_',' ')}.")
         return lines
 
+    @command("eat")
     def handle_eat(self, target) -> list[str]:
         if not target:
             target = "food"
@@ -451,7 +489,7 @@ class CommandsMixin:
         count = self.player.inventory.get("food", 0)
         if count <= 0:
             return ["You have no food. Gather some first."]
-        self.player.inventory["food"] -= 1
+        self.player.inventory.remove("food")
         healed = min(5, self.player.max_hp - self.player.hp)
         self.player.hp = min(self.player.max_hp, self.player.hp + 5)
         lines = ["You eat some foraged food."]
@@ -461,9 +499,11 @@ class CommandsMixin:
             lines.append(f"You feel satisfied. ({self.player.hp}/{self.player.max_hp})")
         return lines
 
+    @command("save", takes_target=False)
     def handle_save(self) -> list[str]:
         return ["Game saved."]
 
+    @command("status", takes_target=False)
     def handle_status(self) -> list[str]:
         room = self.get_current_room()
         room_name = room.name if room else "Unknown"
@@ -499,7 +539,7 @@ class CommandsMixin:
                 max_uses = int(self.item_registry.get("lantern", {}).get("uses", 30))
                 self.player.torch_uses = max_uses
                 return ["Your lantern sputters out, then you trim the wick and relight it from reserve oil."]
-            self.player.inventory[light_item] -= 1
+            self.player.inventory.remove(light_item)
             self.player.torch_uses = None
             return [f"Your {light_item} gutters and dies. You are in darkness."]
         if self.player.torch_uses == 3:
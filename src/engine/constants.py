@@ -33,17 +33,15 @@ MAP_ROOM_POS: dict[str, tuple[int, int]] = {
 
 REVEAL_RADIUS = 2
 
+# Synonyms only; "shed", "stairs" and other last words of enterable feature
+# ids are generated per world by engine.vocab.
 ENTER_TARGET_ALIASES: dict[str, str] = {
     "tower": "lighthouse",
-    "stairs": "spiral_stairs",
     "staircase": "spiral_stairs",
     "top": "spiral_stairs",
     "upstairs": "spiral_stairs",
     "cave": "cave_tunnel",
-    "tunnel": "cave_tunnel",
     "chamber": "cave_tunnel",
-    "shed": "tool_shed",
-    "tool_shed": "tool_shed",
 }
 
 LIGHT_SOURCES = {"lantern", "torch"}
@@ -72,32 +70,6 @@ DIFFICULTY_PRESETS = {
 DEFAULT_DIFFICULTY = "normal"
 
 
-def encode_visited_tiles(tiles: set[tuple[int, int]]) -> list[list[object]]:
-    if not tiles:
-        return []
-    rows: dict[int, list[int]] = {}
-    for x, y in tiles:
-        rows.setdefault(int(y), []).append(int(x))
-    encoded: list[list[object]] = []
-    for y in sorted(rows):
-        xs = sorted(set(rows[y]))
-        if not xs:
-            continue
-        runs: list[list[int]] = []
-        start = xs[0]
-        prev = xs[0]
-        for x in xs[1:]:
-            if x == prev + 1:
-                prev = x
-                continue
-            runs.append([start, prev])
-            start = x
-            prev = x
-        runs.append([start, prev])
-        encoded.append([y, runs])
-    return encoded
-
-
 def decode_visited_tiles(encoded) -> set[tuple[int, int]]:
     out: set[tuple[int, int]] = set()
     if not isinstance(encoded, list):
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-import difflib
+import os
 
 from engine.models import Player
-from engine.loader import load_game_data, build_room_map
+from engine.loader import load_world_template
 from engine.constants import (
     DIFFICULTY_PRESETS,
     DEFAULT_DIFFICULTY,
@@ -16,29 +16,67 @@ from engine.movement import MovementMixin
 from engine.commands import CommandsMixin
 from engine.save import SaveMixin
 from engine.combat import CombatState
+from engine.parser import parse_command
+from engine.registry import CommandRegistry, command
+
+
+class CommandResult:
+    """What one raw command did: reply lines plus the flags a caller acts on."""
+
+    __slots__ = ("command", "verb", "target", "lines", "room_changed",
+                 "encounter", "is_running", "game_outcome")
+
+    def __init__(self, command: str, verb: str, target, lines: list[str],
+                 room_changed: bool, encounter: str | None, is_running: bool,
+                 game_outcome: str | None):
+        self.command = command
+        self.verb = verb
+        self.target = target
+        self.lines = lines
+        self.room_changed = room_changed
+        self.encounter = encounter
+        self.is_running = is_running
+        self.game_outcome = game_outcome
+
+    def __repr__(self) -> str:
+        return f"CommandResult({self.command!r}, lines={len(self.lines)}, is_running={self.is_running})"
 
 
 class GameState(CommandsMixin, MovementMixin, SaveMixin):
+    commands: CommandRegistry
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.commands = CommandRegistry.for_class(cls)
+
     def __init__(self, difficulty: str = DEFAULT_DIFFICULTY):
         preset = DIFFICULTY_PRESETS.get(difficulty, DIFFICULTY_PRESETS[DEFAULT_DIFFICULTY])
         self.difficulty: str = difficulty
         self.enemy_damage_mult: float = float(preset["enemy_damage_mult"])
         self.gather_mult: int = int(preset["gather_mult"])
 
+        world = load_world_template()
         self.player    = Player(max_hp=int(preset["player_hp"]))
-        self.game_data = load_game_data()
-        self.rooms     = build_room_map(self.game_data)
+        self.game_data = world.game_data
+        self.rooms     = world.new_session_rooms()
 
-        self.item_registry: dict = self.game_data.get("items", {})
-        self.recipes: dict = self.game_data.get("recipes", {})
+        self.item_registry: dict = world.item_registry
+        self.recipes: dict = world.recipes
+        self.vocabulary = world.vocabulary
 
-        self.current_room_id: str = self.game_data.get("starting_room")
+        self.current_room_id: str = world.starting_room
         self.is_running = True
         self.game_outcome: str | None = None
         self.end_lines: list[str] = []
         self.combat: CombatState | None = None
-        self.enemies: dict = self.game_data.get("enemies", {})
-        self.weapon_damage: dict = self.game_data.get("weapon_damage", {})
+        self.enemies: dict = world.enemies
+        self.weapon_damage: dict = world.weapon_damage
+        # Tiles revealed since the save journal last drained it, if one is attached.
+        self.visited_log: list | None = None
+        # Tiles revealed since the map's static layer last patched them, if open.
+        self.reveal_log: list | None = None
+        # engine.replay.Recorder capturing this session, if any.
+        self.recorder = None
 
         if self.current_room_id not in self.rooms:
             self.is_running = False
@@ -60,8 +98,9 @@ class GameState(CommandsMixin, MovementMixin, SaveMixin):
     def _item_exists_anywhere(self, item: str) -> bool:
         if self.player.inventory.get(item, 0) > 0:
             return True
-        for room in self.rooms.values():
-            if room.loot.get(item, 0) > 0:
+        peek = getattr(self.rooms, "peek", self.rooms.get)
+        for room_id in self.rooms:
+            if peek(room_id).loot.get(item, 0) > 0:
                 return True
         return False
 
@@ -71,8 +110,7 @@ class GameState(CommandsMixin, MovementMixin, SaveMixin):
         room = self.rooms.get(room_id)
         if not room:
             return
-        room.loot[item] = max(1, int(room.loot.get(item, 0)))
-        room.loot_hidden[item] = False
+        room.set_loot(item, max(1, int(room.loot.get(item, 0))))
 
     def _repair_progression_items(self):
         self._ensure_progression_item("lantern", "cabin_interior")
@@ -80,25 +118,23 @@ class GameState(CommandsMixin, MovementMixin, SaveMixin):
         if ("riverbank" in self.player.discovered_rooms) and self.player.inventory.get("raft", 0) <= 0:
             riverbank = self.rooms.get("riverbank")
             if riverbank:
-                riverbank.loot["raft"] = max(1, int(riverbank.loot.get("raft", 0)))
-                riverbank.loot_hidden["raft"] = False
+                riverbank.set_loot("raft", max(1, int(riverbank.loot.get("raft", 0))))
         cabin = self.rooms.get("cabin_interior")
         misplaced = 0
         for rid in ("cave_entrance", "cave_chamber"):
             room = self.rooms.get(rid)
             if not room:
                 continue
-            misplaced += int(room.loot.pop("climbing_gear", 0))
-            room.loot_hidden.pop("climbing_gear", None)
+            if "climbing_gear" in room.loot or "climbing_gear" in room.loot_hidden:
+                misplaced += room.remove_loot("climbing_gear")
         if self.player.inventory.get("climbing_gear", 0) <= 0:
             if cabin:
-                cabin.loot["climbing_gear"] = max(1, int(cabin.loot.get("climbing_gear", 0)), misplaced)
-                cabin.loot_hidden["climbing_gear"] = False
+                cabin.set_loot("climbing_gear", max(1, int(cabin.loot.get("climbing_gear", 0)), misplaced))
             else:
                 self._ensure_progression_item("climbing_gear", "cabin_interior")
 
     def _add_to_inventory(self, item: str, count: int = 1):
-        self.player.inventory[item] = self.player.inventory.get(item, 0) + count
+        self.player.inventory.add(item, count)
 
     def check_encounter(self) -> CombatState | None:
         room = self.get_current_room()
@@ -127,6 +163,31 @@ class GameState(CommandsMixin, MovementMixin, SaveMixin):
             self.is_running = False
         self.combat = None
 
+    def combat_action(self, action: str) -> list[str]:
+        """Resolve one combat turn: "attack", "eat", "flee" or an enemy "tick"."""
+        combat = self.combat
+        if combat is None or combat.finished:
+            return []
+        recorder = getattr(self, "recorder", None)
+        if recorder is not None:
+            recorder.combat(action)
+        lines: list[str] = []
+        if action == "attack":
+            lines += combat.player_attack(self.player.inventory)
+            lines += combat.enemy_attack(self.player)
+        elif action == "eat":
+            lines += combat.player_eat(self.player)
+            lines += combat.enemy_attack(self.player)
+        elif action == "flee":
+            lines += combat.player_flee(self.player)
+        elif action == "tick":
+            lines += combat.enemy_attack(self.player)
+        else:
+            raise ValueError(f"unknown combat action: {action}")
+        if combat.finished:
+            self.finish_combat()
+        return lines
+
     def get_intro_lines(self) -> list[str]:
         return list(self.game_data.get("intro_text", []))
 
@@ -155,75 +216,92 @@ class GameState(CommandsMixin, MovementMixin, SaveMixin):
             lines.append(hint)
         return lines
 
+    @command("look", takes_target=False)
+    def handle_look(self) -> list[str]:
+        return self.describe_current_room()
+
+    @command("inventory", takes_target=False)
+    def handle_inventory(self) -> list[str]:
+        return self.player.get_inventory_lines(self.item_registry)
+
+    @command("dig", takes_target=False)
+    def handle_dig(self) -> list[str]:
+        return self.handle_use("shovel")
+
+    @command("quit", takes_target=False)
+    def handle_quit(self) -> list[str]:
+        self.game_outcome = "quit"
+        self.end_lines = ["Goodbye."]
+        self.is_running = False
+        return ["Goodbye."]
+
+    @command("exit", takes_target=False)
+    def handle_exit(self) -> list[str]:
+        if self.current_room_id and self.current_room_id.endswith("_interior"):
+            room = self.get_current_room()
+            if room and room.exits:
+                return self.handle_leave()
+        return self.handle_quit()
+
     def process_command(self, verb: str, target) -> list[str]:
         if not self.is_running:
             return []
-        if verb == "leave":
-            return self.handle_leave()
-        if verb == "exit":
-            if self.current_room_id and self.current_room_id.endswith("_interior"):
-                room = self.get_current_room()
-                if room and room.exits:
-                    return self.handle_leave()
-            self.game_outcome = "quit"
-            self.end_lines = ["Goodbye."]
-            self.is_running = False
-            return ["Goodbye."]
-        if verb == "quit":
-            self.game_outcome = "quit"
-            self.end_lines = ["Goodbye."]
-            self.is_running = False
-            return ["Goodbye."]
+        target = self._pick_target(target)
+        recorder = getattr(self, "recorder", None)
+        if recorder is not None:
+            recorder.command(verb, target)
         if verb == "":
             return ["Please type a command."]
-        if verb == "look":
-            return self.describe_current_room()
-        if verb == "help":
-            return self.handle_help()
-        if verb == "hint":
-            return self.handle_hint()
-        if verb == "inventory":
-            return self.player.get_inventory_lines(self.item_registry)
-        if verb == "go":
-            return self.handle_go(target)
-        if verb == "gather":
-            return self.handle_gather(target)
-        if verb == "take":
-            return self.handle_take(target)
-        if verb == "craft":
-            return self.handle_craft(target)
-        if verb == "examine":
-            return self.handle_examine(target)
-        if verb == "enter":
-            return self.handle_enter(target)
-        if verb == "drop":
-            return self.handle_drop(target)
-        if verb == "read":
-            return self.handle_read(target)
-        if verb == "use":
-            return self.handle_use(target)
-        if verb == "dig":
-            return self.handle_use("shovel")
-        if verb == "combine":
-            return self.handle_combine(target)
-        if verb == "eat":
-            return self.handle_eat(target)
-        if verb == "save":
-            return self.handle_save()
-        if verb == "status":
-            return self.handle_status()
-        known = [
-            "look", "help", "hint", "go", "gather", "take", "craft",
-            "examine", "enter", "drop", "read", "use", "combine", "inventory", "quit", "dig",
-            "leave", "exit", "eat", "save", "status",
-        ]
-        guess = difflib.get_close_matches(verb, known, n=1, cutoff=0.60)
+        lines = self.commands.dispatch(self, verb, target)
+        if lines is not None:
+            return lines
+        guess = self.commands.suggest(verb)
         if guess:
             return [
-                f"Unknown command: {verb}. Did you mean {guess[0]}?",
+                f"Unknown command: {verb}. Did you mean {guess}?",
                 "Type help for controls and examples.",
             ]
         return [
             f"Unknown command: {verb}.",
             "Type help for controls and examples.",
         ]
+
+    def run_command(self, text: str, check_encounter: bool = True) -> CommandResult:
+        """Parse and dispatch one raw command string."""
+        prev_room = self.current_room_id
+        verb, target = parse_command(text)
+        lines = self.process_command(verb, target)
+        room_changed = self.current_room_id != prev_room
+        encounter = None
+        if check_encounter and room_changed and self.is_running and self.check_encounter():
+            encounter = self.combat.enemy_id
+        return CommandResult(text, verb, target, lines, room_changed, encounter,
+                             self.is_running, self.game_outcome)
+
+    def process_commands(self, commands, save=None) -> list[CommandResult]:
+        """Run raw command strings in order and return one result per command run.
+
+        Stops after a command that ends the game or starts a fight, since
+        combat is resolved outside the command loop. save, if given, is
+        called once with this state after the batch instead of per command.
+        """
+        results: list[CommandResult] = []
+        try:
+            for text in commands:
+                if not self.is_running or self.combat is not None:
+                    break
+                result = self.run_command(text)
+                results.append(result)
+                if result.encounter:
+                    break
+        finally:
+            if save is not None:
+                save(self)
+        return results
+
+
+GameState.commands = CommandRegistry.for_class(GameState)
+
+# Set to any value to print per-verb call counts and latency when the process exits.
+if os.environ.get("DARK_FOREST_COMMAND_STATS"):
+    GameState.commands.enable_timing(dump_at_exit=True)
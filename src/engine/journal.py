@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from engine.models import VisitedTiles
+from engine.save import touched_rooms
+from engine.save_writer import BackgroundWriter, FileWriter
+
+COMPACT_EVERY = 200
+
+# Player snapshot fields a journal entry may carry, in the order written.
+PLAYER_FIELDS = (
+    "hp", "max_hp", "torch_uses", "current_pos", "inventory", "discovered_rooms",
+    "explored_rooms", "defeated_enemies", "room_positions",
+)
+
+
+def merge_entry(snap: dict, entry: dict):
+    """Fold one journal entry into a snapshot dict in place."""
+    for key, value in entry.items():
+        if key == "player":
+            player = snap.setdefault("player", {})
+            for pkey, pvalue in value.items():
+                if pkey == "visited_add":
+                    tiles = player.get("_visited")
+                    if tiles is None:
+                        tiles = player["_visited"] = VisitedTiles.from_snapshot(player)
+                    for x, y in pvalue:
+                        tiles.mark(int(x), int(y))
+                else:
+                    player[pkey] = pvalue
+        elif key == "rooms":
+            snap.setdefault("rooms", {}).update(value)
+        elif key != "n":
+            snap[key] = value
+
+
+class SaveJournal:
+    """Append-only save log next to a full snapshot file.
+
+    record() appends one line holding only what changed since the last
+    entry, going by the state's save_versions(): nothing at all when no
+    section moved, otherwise position plus whichever player fields,
+    room loot and newly revealed tiles changed. The player's change_log and
+    the rooms' loot_log name what changed, so an entry costs the same
+    however much of the world has been touched. Every compact_every
+    entries, or on compact(), the snapshot is rewritten and the log
+    truncated. load() replays the log over the snapshot. Entries carry a
+    sequence number so a log left over from before a compaction is never
+    replayed onto the newer snapshot.
+
+    With background=True the files are written by a BackgroundWriter
+    thread; the game thread only builds the entry and snapshot dicts.
+    """
+
+    def __init__(self, path: Path, compact_every: int = COMPACT_EVERY, background: bool = False):
+        self.path = Path(path)
+        self.log_path = self.path.with_suffix(".journal")
+        self.compact_every = compact_every
+        writer = BackgroundWriter if background else FileWriter
+        self.writer = writer(self.path, self.log_path)
+        self._state = None
+        self._seq = 0
+        self._entries = 0
+        self._marks: dict = {}
+        self._versions: dict[str, int] = {}
+        self._saved: dict = {}
+
+    # Writing
+
+    def record(self, state):
+        """Append state's changes since the last record or compact."""
+        if state is not self._state:
+            self.compact(state)
+            return
+        versions = state.save_versions()
+        if versions == self._saved:
+            return
+        entry = self._delta(state, versions)
+        self._saved = versions
+        self._seq += 1
+        entry["n"] = self._seq
+        self._reporting(self.writer.append, entry)
+        self._entries += 1
+        if self._entries >= self.compact_every:
+            self.compact(state)
+
+    def compact(self, state):
+        """Write a full snapshot and start an empty log."""
+        versions = state.save_versions()
+        if state is self._state and not self._entries and versions == self._saved:
+            return
+        snap = state.snapshot()
+        snap["journal"] = self._seq
+        self._reporting(self.writer.snapshot, snap)
+        self._state = state
+        self._entries = 0
+        state.visited_log = []
+        state.player.change_log = set()
+        if hasattr(state.rooms, "loot_log"):
+            state.rooms.loot_log = set()
+        self._saved = versions
+        self._marks = self._player_marks(state.player)
+        self._versions = {
+            rid: room.loot_version for rid, room in touched_rooms(state.rooms).items()
+        }
+
+    @staticmethod
+    def _player_marks(p) -> dict:
+        # The containers change in place without an attribute assignment;
+        # see Player.state_key() for why their sizes are enough.
+        return {
+            "inventory": (id(p.inventory), p.inventory.version),
+            "discovered_rooms": len(p.discovered_rooms),
+            "explored_rooms": len(p.explored_rooms),
+            "defeated_enemies": len(p.defeated_enemies),
+            "room_positions": len(p.room_positions),
+        }
+
+    @staticmethod
+    def _player_field(p, key: str):
+        if key == "inventory":
+            return {k: int(v) for k, v in p.inventory.items() if int(v) > 0}
+        if key == "room_positions":
+            return {rid: [int(x), int(y)] for rid, (x, y) in p.room_positions.items()}
+        if key == "current_pos":
+            return [int(p.current_pos[0]), int(p.current_pos[1])]
+        if key in ("hp", "max_hp"):
+            return int(getattr(p, key))
+        value = getattr(p, key)
+        return sorted(value) if isinstance(value, set) else value
+
+    def _delta(self, state, versions: dict) -> dict:
+        entry = {
+            "current_room_id": state.current_room_id,
+            "local_x": int(state.local_x),
+            "local_y": int(state.local_y),
+        }
+        player: dict = {}
+        if versions["player"] != self._saved.get("player"):
+            p = state.player
+            log = p.change_log
+            if log is None:
+                # A player swapped in since the last compact; write all of it.
+                changed = set(PLAYER_FIELDS)
+                p.change_log = set()
+            else:
+                changed = {"inventory" if name == "_inventory" else name for name in log}
+                log.clear()
+            marks = self._player_marks(p)
+            for key, mark in marks.items():
+                if mark != self._marks.get(key):
+                    changed.add(key)
+            self._marks = marks
+            for key in PLAYER_FIELDS:
+                if key in changed:
+                    player[key] = self._player_field(p, key)
+
+        fresh = getattr(state, "visited_log", None)
+        if fresh:
+            player["visited_add"] = [[x, y] for x, y in fresh]
+            fresh.clear()
+        if player:
+            entry["player"] = player
+
+        if versions["rooms"] != self._saved.get("rooms"):
+            touched = touched_rooms(state.rooms)
+            log = getattr(state.rooms, "loot_log", None)
+            # Without a log (plain dict rooms, or rooms swapped in since the
+            # last compact) every touched room is checked.
+            rids = touched if log is None else sorted(log)
+            rooms = {}
+            for rid in rids:
+                room = touched[rid]
+                if self._versions.get(rid, 0) != room.loot_version:
+                    self._versions[rid] = room.loot_version
+                    rooms[rid] = {
+                        "loot": dict(room.loot),
+                        "loot_hidden": {k: bool(v) for k, v in room.loot_hidden.items()},
+                    }
+            if hasattr(state.rooms, "loot_log"):
+                state.rooms.loot_log = set()
+            if rooms:
+                entry["rooms"] = rooms
+        return entry
+
+    def flush(self):
+        self._reporting(self.writer.flush)
+
+    def check(self):
+        """Raise the error of a failed background write, if any."""
+        self._reporting(self.writer.check)
+
+    def close(self):
+        self._reporting(self.writer.close)
+
+    def _reporting(self, call, *args):
+        try:
+            call(*args)
+        except Exception:
+            # Whatever the failed write held is lost; rewrite everything next time.
+            self._state = None
+            raise
+
+    # Reading
+
+    def load(self) -> dict | None:
+        """Snapshot dict with the log replayed over it, or None."""
+        self.writer.wait()
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                snap = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(snap, dict):
+            return None
+        base = int(snap.pop("journal", 0))
+        seq = base
+        for entry in self._read_log():
+            n = entry.get("n", 0)
+            if n <= base:
+                continue
+            merge_entry(snap, entry)
+            seq = n
+        player = snap.get("player", {})
+        tiles = player.pop("_visited", None)
+        if tiles is not None:
+            player.pop("visited_runs", None)
+            player.pop("visited_tiles", None)
+            player["visited_bits"] = tiles.encode()
+        self._seq = seq
+        self._state = None
+        self._saved = {}
+        return snap
+
+    def _read_log(self):
+        try:
+            with self.log_path.open("r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A torn final line from a crash mid-append.
+                        break
+                    if isinstance(entry, dict):
+                        yield entry
+        except OSError:
+            return
+
+    def exists(self) -> bool:
+        self.writer.wait()
+        return self.path.exists()
+
+    def clear(self):
+        self.writer.discard()
+        for p in (self.path, self.log_path):
+            try:
+                p.unlink()
+            except FileNotFoundError:
+                pass
+        self._state = None
+        self._entries = 0
+        self._saved = {}
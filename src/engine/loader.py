@@ -1,12 +1,26 @@
+from __future__ import annotations
+
+import gc
 import json
+import os
+import pickle
 from pathlib import Path
 
-from engine.models import Room
+from engine.models import Room, SessionRooms
+from engine.vocab import Vocabulary, build_vocabulary
+
+
+DATA_PATH = Path(__file__).resolve().parents[2] / "data" / "game.json"
+
+# Bump whenever WorldTemplate or Room change shape so stale bundles are ignored.
+BUNDLE_FORMAT = 4
+
+_WORLD_CACHE: dict = {}
+_DEFAULT_KEY = str(DATA_PATH)
 
 
-def load_game_data() -> dict:
-    project_root = Path(__file__).resolve().parents[2]
-    data_path = project_root / "data" / "game.json"
+def load_game_data(data_path: Path | None = None) -> dict:
+    data_path = Path(data_path) if data_path else DATA_PATH
 
     with data_path.open("r", encoding="utf-8") as f:
         return json.load(f)
@@ -22,4 +36,97 @@ def build_room_map(game_data: dict) -> dict:
 
         room_map[room_id] = Room(room_data)
 
-    return room_map
\ No newline at end of file
+    return room_map
+
+
+class WorldTemplate:
+    """Parsed world shared by every session in the process.
+
+    Nothing here is mutated after construction. Sessions get their own
+    loot state through new_session_rooms().
+    """
+
+    def __init__(self, game_data: dict, rooms: dict | None = None,
+                 vocabulary: Vocabulary | None = None):
+        # Room data lives in self.rooms; keeping the raw list would double the footprint.
+        self.game_data = {k: v for k, v in game_data.items() if k != "rooms"}
+        self.rooms = build_room_map(game_data) if rooms is None else rooms
+        self.item_registry: dict = game_data.get("items", {})
+        self.recipes: dict = game_data.get("recipes", {})
+        self.enemies: dict = game_data.get("enemies", {})
+        self.weapon_damage: dict = game_data.get("weapon_damage", {})
+        self.starting_room: str | None = game_data.get("starting_room")
+        if vocabulary is None:
+            vocabulary = build_vocabulary(self.game_data, self.rooms)
+        self.vocabulary: Vocabulary = vocabulary
+
+    def new_session_rooms(self) -> SessionRooms:
+        return SessionRooms(self.rooms)
+
+
+def bundle_path_for(data_path: Path | None = None) -> Path:
+    data_path = Path(data_path) if data_path else DATA_PATH
+    return data_path.with_suffix(".bundle")
+
+
+def compile_world_bundle(data_path: Path | None = None, bundle_path: Path | None = None) -> Path:
+    data_path = Path(data_path) if data_path else DATA_PATH
+    bundle_path = Path(bundle_path) if bundle_path else bundle_path_for(data_path)
+    world = WorldTemplate(load_game_data(data_path))
+    payload = {
+        "format": BUNDLE_FORMAT,
+        "game_data": world.game_data,
+        "rooms": [room.to_record() for room in world.rooms.values()],
+        "vocabulary": world.vocabulary,
+    }
+    tmp_path = bundle_path.with_name(bundle_path.name + ".tmp")
+    with tmp_path.open("wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, bundle_path)
+    return bundle_path
+
+
+def load_world_bundle(bundle_path: Path, data_path: Path | None = None) -> WorldTemplate | None:
+    """Return the bundled world, or None if it is missing, stale or unreadable."""
+    data_path = Path(data_path) if data_path else DATA_PATH
+    # The bundle is one burst of container allocations; collector passes over
+    # it would only find live objects.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        if bundle_path.stat().st_mtime_ns <= data_path.stat().st_mtime_ns:
+            return None
+        with bundle_path.open("rb") as f:
+            payload = pickle.load(f)
+        if not isinstance(payload, dict) or payload.get("format") != BUNDLE_FORMAT:
+            return None
+        rooms = {}
+        for record in payload["rooms"]:
+            room = Room.from_record(record)
+            rooms[room.id] = room
+        return WorldTemplate(payload["game_data"], rooms, payload["vocabulary"])
+    except (OSError, EOFError, pickle.UnpicklingError, KeyError, TypeError, ValueError):
+        return None
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def load_world_template(data_path: Path | None = None) -> WorldTemplate:
+    if data_path is None:
+        world = _WORLD_CACHE.get(_DEFAULT_KEY)
+        if world is not None:
+            return world
+    data_path = Path(data_path) if data_path else DATA_PATH
+    key = str(data_path)
+    world = _WORLD_CACHE.get(key)
+    if world is None:
+        world = load_world_bundle(bundle_path_for(data_path), data_path)
+        if world is None:
+            world = WorldTemplate(load_game_data(data_path))
+        _WORLD_CACHE[key] = world
+    return world
+
+
+def clear_world_cache():
+    _WORLD_CACHE.clear()
@@ -1,19 +1,103 @@
 from __future__ import annotations
 
+import base64
+import sys
+from collections.abc import Mapping
+from functools import lru_cache
+
+from engine.constants import decode_visited_tiles
+
+
+def _intern_keys(d: dict) -> dict:
+    return {sys.intern(k): v for k, v in d.items()}
+
+
+class Feature:
+    """Static room feature. Supports feat["id"] / feat.get("pos") like the old dicts."""
+
+    __slots__ = ("id", "label", "desc", "examine_clue", "enter_to", "pos", "aliases")
+
+    def __init__(self, id: str, label: str, desc: str, examine_clue: str,
+                 enter_to: str | None, pos: tuple[int, int], aliases: tuple[str, ...] = ()):
+        self.id           = sys.intern(id)
+        self.label        = label
+        self.desc         = desc
+        self.examine_clue = examine_clue
+        self.enter_to     = sys.intern(enter_to) if enter_to else enter_to
+        self.pos          = pos
+        self.aliases      = aliases
+
+    def lookup_keys(self) -> tuple[str, ...]:
+        """Every name examine/enter/go accept for this feature, in match order."""
+        return (self.id, self.label.lower()) + self.aliases
+
+    @classmethod
+    def from_data(cls, f: dict) -> "Feature":
+        pos = f.get("pos", [-1, -1])
+        return cls(
+            f.get("id", ""),
+            f.get("label", "?"),
+            f.get("desc", ""),
+            f.get("examine_clue", ""),
+            f.get("enter_to"),
+            (int(pos[0]), int(pos[1])),
+            tuple(a.strip().lower().replace(" ", "_") for a in f.get("aliases", [])),
+        )
+
+    def astuple(self) -> tuple:
+        return (self.id, self.label, self.desc, self.examine_clue, self.enter_to,
+                self.pos, self.aliases)
+
+    def __reduce__(self):
+        return (Feature, self.astuple())
+
+    def __getitem__(self, key: str):
+        if key not in Feature.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        if key not in Feature.__slots__:
+            return default
+        return getattr(self, key)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Feature):
+            return NotImplemented
+        return self.astuple() == other.astuple()
+
+    def __hash__(self) -> int:
+        return hash(self.astuple())
+
+    def __repr__(self) -> str:
+        return f"Feature({self.id!r}, pos={self.pos})"
+
 
 class Room:
+    __slots__ = (
+        "id", "name", "description", "exits", "gather", "actions", "requires",
+        "encounters", "loot", "loot_hidden", "loot_hint", "_conditional_descs",
+        "width", "height", "is_walkable", "features",
+        # Derived lookups; never part of the bundle record.
+        "_feature_index", "_feature_tiles", "loot_version", "_session",
+        "_item_pos", "_item_tiles", "_item_order", "_items_version",
+    )
+
     def __init__(self, data: dict):
-        self.id          = data.get("id")
+        room_id = data.get("id")
+        self.id          = sys.intern(room_id) if room_id else room_id
         self.name        = data.get("name", "")
         self.description = data.get("description", "")
-        self.exits       = data.get("exits", {})
+        self.exits       = {d: sys.intern(r) for d, r in data.get("exits", {}).items()}
         self.gather      = data.get("gather", {})
         self.actions     = data.get("actions", [])
         self.requires    = data.get("requires", [])
-        self.encounters  = data.get("encounters", [])
-        self.loot: dict[str, int]  = dict(data.get("loot", {}))
-        self.loot_hidden: dict[str, bool] = dict(data.get("loot_hidden", {}))
-        self.loot_hint:   dict[str, str]  = dict(data.get("loot_hint", {}))
+        self.encounters  = [sys.intern(e) for e in data.get("encounters", [])]
+        self.loot: dict[str, int]  = _intern_keys(data.get("loot", {}))
+        self.loot_hidden: dict[str, bool] = _intern_keys(data.get("loot_hidden", {}))
+        self.loot_hint:   dict[str, str]  = {
+            sys.intern(k): sys.intern(v) for k, v in data.get("loot_hint", {}).items()
+        }
 
         # Conditional descriptions keyed by "description_with_<item>"
         self._conditional_descs: dict[str, str] = {
@@ -26,17 +110,205 @@ class Room:
         self.height      = int(data.get("height", 1))
         self.is_walkable = self.width > 1 or self.height > 1
 
-        self.features: list[dict] = []
-        for f in data.get("features", []):
-            pos = f.get("pos", [-1, -1])
-            self.features.append({
-                "id":           f.get("id", ""),
-                "label":        f.get("label", "?"),
-                "desc":         f.get("desc", ""),
-                "examine_clue": f.get("examine_clue", ""),
-                "enter_to":     f.get("enter_to"),
-                "pos":          (int(pos[0]), int(pos[1])),
-            })
+        self.features: list[Feature] = [Feature.from_data(f) for f in data.get("features", [])]
+        self._index_features()
+
+    _RECORD_FIELDS = __slots__[:__slots__.index("features")]
+
+    def _index_features(self):
+        # First feature in list order wins a shared name or tile, as the old
+        # linear scans did.
+        index: dict[str, Feature] = {}
+        tiles: dict[tuple[int, int], tuple[int, Feature]] = {}
+        for order, feat in enumerate(self.features):
+            for key in feat.lookup_keys():
+                index.setdefault(key, feat)
+            tiles.setdefault(feat.pos, (order, feat))
+        self._feature_index = index
+        self._feature_tiles = tiles
+        self._reset_loot_state()
+
+    def _reset_loot_state(self):
+        self.loot_version = 0
+        self._session = None
+        self._reset_item_cache()
+
+    def _reset_item_cache(self):
+        self._item_pos: dict[str, tuple[int, int]] = {}
+        self._item_tiles: dict[tuple[int, int], list[str]] = {}
+        self._item_order: dict[str, int] = {}
+        self._items_version = -1
+
+    def find_feature(self, target: str) -> Feature | None:
+        """Feature whose id, lowercase label or alias is target."""
+        return self._feature_index.get(target)
+
+    def to_record(self) -> tuple:
+        """Flat, already-normalised form used by the compiled world bundle.
+
+        The feature lookups ride along so loading does not rebuild them;
+        pickle keeps them pointing at the same Feature objects.
+        """
+        return tuple(getattr(self, k) for k in self._RECORD_FIELDS) + (
+            self.features, self._feature_index, self._feature_tiles)
+
+    @classmethod
+    def from_record(cls, record: tuple) -> "Room":
+        room = object.__new__(cls)
+        for key, value in zip(cls._RECORD_FIELDS, record):
+            setattr(room, key, value)
+        room.features, room._feature_index, room._feature_tiles = record[-3:]
+        room._reset_loot_state()
+        return room
+
+    def session_copy(self) -> "Room":
+        """Copy that shares all static room data and owns its own loot state."""
+        room = object.__new__(Room)
+        for key in Room.__slots__:
+            setattr(room, key, getattr(self, key))
+        room.loot = dict(self.loot)
+        room.loot_hidden = dict(self.loot_hidden)
+        room._reset_item_cache()
+        return room
+
+    def feature_near(self, x: int, y: int) -> Feature | None:
+        """First feature (in room order) on or next to tile (x, y)."""
+        tiles = self._feature_tiles
+        best = None
+        for ny in (y - 1, y, y + 1):
+            for nx in (x - 1, x, x + 1):
+                hit = tiles.get((nx, ny))
+                if hit is not None and (best is None or hit[0] < best[0]):
+                    best = hit
+        return best[1] if best else None
+
+    def item_near(self, x: int, y: int) -> str | None:
+        """First placed item (in placement order) on or next to tile (x, y)."""
+        if self._items_version != self.loot_version:
+            self._sync_item_tiles()
+        tiles, order = self._item_tiles, self._item_order
+        best = None
+        for ny in (y - 1, y, y + 1):
+            for nx in (x - 1, x, x + 1):
+                for item in tiles.get((nx, ny), ()):
+                    if best is None or order[item] < order[best]:
+                        best = item
+        return best
+
+    def item_positions(self) -> dict[str, tuple[int, int]]:
+        """Where each visible item sits. Recomputed only after a loot change."""
+        if self._items_version != self.loot_version:
+            self._sync_item_tiles()
+        return self._item_pos
+
+    def items_at(self, x: int, y: int) -> list[str]:
+        if self._items_version != self.loot_version:
+            self._sync_item_tiles()
+        items = self._item_tiles.get((x, y), ())
+        if len(items) > 1:
+            return sorted(items, key=self._item_order.__getitem__)
+        return list(items)
+
+    def _sync_item_tiles(self):
+        # Re-place visible loot and move only the items whose tile changed.
+        new_pos = self._place_items()
+        old_pos = self._item_pos
+        tiles = self._item_tiles
+        for item, pos in old_pos.items():
+            if new_pos.get(item) != pos:
+                here = tiles[pos]
+                here.remove(item)
+                if not here:
+                    del tiles[pos]
+        for item, pos in new_pos.items():
+            if old_pos.get(item) != pos:
+                tiles.setdefault(pos, []).append(item)
+        self._item_pos = new_pos
+        self._item_tiles = tiles
+        self._item_order = {item: i for i, item in enumerate(new_pos)}
+        self._items_version = self.loot_version
+
+    def _place_items(self) -> dict[str, tuple[int, int]]:
+        visible_items = list(self.visible_loot().keys())
+        if not visible_items:
+            return {}
+
+        positions: dict[str, tuple[int, int]] = {}
+        used: set[tuple[int, int]] = set()
+
+        for item in visible_items:
+            feat_id = self.loot_hint.get(item)
+            feat = self._feature_index.get(feat_id) if feat_id else None
+            if feat is not None and feat.id == feat_id:
+                px, py = feat.pos
+                px = max(0, min(self.width - 1, int(px)))
+                py = max(0, min(self.height - 1, int(py)))
+                positions[item] = (px, py)
+                used.add((px, py))
+
+        unplaced = [item for item in visible_items if item not in positions]
+        if not unplaced:
+            return positions
+
+        row = min(self.height - 1, max(0, self.height // 2 + 2))
+        half = len(unplaced) // 2
+        for idx, item in enumerate(unplaced):
+            x = self.width // 2 + idx - half
+            x = max(0, min(self.width - 1, x))
+            pos = (x, row)
+            if pos in used:
+                found = None
+                for ddx in range(1, self.width):
+                    for cand in ((x + ddx, row), (x - ddx, row)):
+                        cx, cy = cand
+                        if 0 <= cx < self.width and (cx, cy) not in used:
+                            found = (cx, cy)
+                            break
+                    if found:
+                        break
+                if found:
+                    pos = found
+            positions[item] = pos
+            used.add(pos)
+        return positions
+
+    def _loot_changed(self):
+        self.loot_version += 1
+        if self._session is not None:
+            self._session.loot_changed(self.id)
+
+    def take_loot(self, item: str, count: int = 1):
+        left = self.loot.get(item, 0) - count
+        if left > 0:
+            self.loot[item] = left
+        else:
+            self.loot.pop(item, None)
+        self._loot_changed()
+
+    def put_loot(self, item: str, count: int = 1):
+        """Add visible loot, e.g. a dropped item."""
+        item = sys.intern(item)
+        self.loot[item] = self.loot.get(item, 0) + count
+        self.loot_hidden[item] = False
+        self._loot_changed()
+
+    def set_loot(self, item: str, count: int, hidden: bool = False):
+        item = sys.intern(item)
+        self.loot[item] = count
+        self.loot_hidden[item] = hidden
+        self._loot_changed()
+
+    def remove_loot(self, item: str) -> int:
+        """Drop item from this room entirely and return how many there were."""
+        count = int(self.loot.pop(item, 0))
+        self.loot_hidden.pop(item, None)
+        self._loot_changed()
+        return count
+
+    def replace_loot(self, loot: dict[str, int], loot_hidden: dict[str, bool]):
+        self.loot = _intern_keys(loot)
+        self.loot_hidden = _intern_keys(loot_hidden)
+        self._loot_changed()
 
     def gather_amount(self, resource: str) -> int:
         return int(self.gather.get(resource, 0) or 0)
@@ -52,6 +324,8 @@ class Room:
                 self.loot_hidden[item] = False
                 if self.loot.get(item, 0) > 0:
                     revealed.append(item)
+        if revealed:
+            self._loot_changed()
         return revealed
 
     def get_description(self, inventory: dict) -> str:
@@ -64,17 +338,350 @@ class Room:
         return "\n".join(lines)
 
 
+class SessionRooms(Mapping):
+    """Room map for one session, layered over shared template rooms.
+
+    A room is copied from its template the first time it is looked up, so
+    building a session does not touch rooms the player never reaches.
+
+    loot_version counts loot changes across all of the session's rooms, and
+    while loot_log is a set it collects the ids of rooms whose loot changed.
+    """
+
+    __slots__ = ("_templates", "_rooms", "loot_version", "loot_log")
+
+    def __init__(self, templates: dict):
+        self._templates = templates
+        self._rooms: dict[str, Room] = {}
+        self.loot_version = 0
+        self.loot_log: set[str] | None = None
+
+    def __getitem__(self, room_id: str) -> Room:
+        room = self._rooms.get(room_id)
+        if room is None:
+            room = self._templates[room_id].session_copy()
+            room._session = self
+            self._rooms[room_id] = room
+        return room
+
+    def loot_changed(self, room_id: str):
+        self.loot_version += 1
+        if self.loot_log is not None:
+            self.loot_log.add(room_id)
+
+    def __contains__(self, room_id) -> bool:
+        return room_id in self._templates
+
+    def __iter__(self):
+        return iter(self._templates)
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def template(self, room_id: str) -> Room | None:
+        return self._templates.get(room_id)
+
+    def peek(self, room_id: str) -> Room | None:
+        """Read-only lookup that does not copy an untouched room."""
+        return self._rooms.get(room_id) or self._templates.get(room_id)
+
+    def touched(self) -> dict[str, Room]:
+        return self._rooms
+
+
+class Inventory(dict):
+    """Item counts that keep a running carried weight and carry bonus.
+
+    Totals follow every count change once bind() has given them an item
+    registry, so weight and bonus reads never walk the inventory. version
+    counts changes so savers can tell when the counts need rewriting.
+    """
+
+    __slots__ = ("_registry", "_weight", "_bonus", "version")
+
+    BONUS_ITEM = "backpack"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._registry: dict | None = None
+        self._weight = 0.0
+        self._bonus  = 0
+        self.version = 0
+        self.update(*args, **kwargs)
+
+    def __reduce__(self):
+        return (Inventory, (dict(self),))
+
+    def bind(self, item_registry: dict):
+        if item_registry is self._registry:
+            return
+        self._registry = item_registry
+        self._weight = 0.0
+        self._bonus  = 0
+        for item, count in self.items():
+            self._adjust(item, 0, count)
+
+    def _adjust(self, item: str, old: int, new: int):
+        data = self._registry.get(item) if self._registry is not None else None
+        if data is None:
+            return
+        self._weight += data.get("weight", 0) * (max(new, 0) - max(old, 0))
+        if item == self.BONUS_ITEM:
+            self._bonus = data.get("carry_bonus", 0) if new > 0 else 0
+
+    def weight(self, item_registry: dict) -> float:
+        self.bind(item_registry)
+        return self._weight
+
+    def carry_bonus(self, item_registry: dict):
+        self.bind(item_registry)
+        return self._bonus
+
+    def add(self, item: str, count: int = 1):
+        item = sys.intern(item)
+        self[item] = self.get(item, 0) + count
+
+    def remove(self, item: str, count: int = 1):
+        self[item] = self.get(item, 0) - count
+
+    def __setitem__(self, item: str, count: int):
+        self._adjust(item, self.get(item, 0), count)
+        super().__setitem__(item, count)
+        self.version += 1
+
+    def __delitem__(self, item: str):
+        self._adjust(item, self[item], 0)
+        super().__delitem__(item)
+        self.version += 1
+
+    _MISSING = object()
+
+    def pop(self, item: str, default=_MISSING):
+        if item in self:
+            count = self[item]
+            del self[item]
+            return count
+        if default is Inventory._MISSING:
+            raise KeyError(item)
+        return default
+
+    def popitem(self):
+        item, count = super().popitem()
+        self._adjust(item, count, 0)
+        self.version += 1
+        return item, count
+
+    def setdefault(self, item: str, default: int = 0):
+        if item not in self:
+            self[item] = default
+        return self[item]
+
+    def update(self, *args, **kwargs):
+        for item, count in dict(*args, **kwargs).items():
+            self[item] = count
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        super().clear()
+        self._weight = 0.0
+        self._bonus  = 0
+        self.version += 1
+
+    def copy(self) -> "Inventory":
+        return Inventory(self)
+
+
+@lru_cache(maxsize=None)
+def _disc_spans(radius: int) -> tuple[tuple[int, int], ...]:
+    """(dy, half-width) rows of the disc dx*dx + dy*dy <= radius*radius + 1."""
+    limit = radius * radius + 1
+    rows = []
+    for dy in range(-radius, radius + 1):
+        span = min(radius, int((limit - dy * dy) ** 0.5))
+        while span * span > limit - dy * dy:
+            span -= 1
+        rows.append((dy, span))
+    return tuple(rows)
+
+
+class VisitedTiles:
+    """Set of revealed (x, y) map tiles kept as a chunked bitset.
+
+    Each CHUNK x CHUNK block of the world is one bytearray, so marking and
+    testing a tile is a dict lookup and a bit operation, and a save is a
+    base64 string per chunk rather than a list of coordinates. Chunks are
+    re-encoded only after they change.
+    """
+
+    __slots__ = ("_chunks", "_count", "_encoded")
+
+    CHUNK = 32
+    SHIFT = 5
+    MASK  = CHUNK - 1
+    CHUNK_BYTES = CHUNK * CHUNK // 8
+
+    def __init__(self, tiles=()):
+        self._chunks: dict[tuple[int, int], bytearray] = {}
+        self._count = 0
+        self._encoded: dict[tuple[int, int], str] = {}
+        for tile in tiles:
+            self.add(tile)
+
+    def mark(self, x: int, y: int) -> bool:
+        """Mark tile (x, y); True if it was not marked before."""
+        key = (x >> self.SHIFT, y >> self.SHIFT)
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            chunk = self._chunks[key] = bytearray(self.CHUNK_BYTES)
+        idx = ((y & self.MASK) << self.SHIFT) | (x & self.MASK)
+        bit = 1 << (idx & 7)
+        byte = chunk[idx >> 3]
+        if byte & bit:
+            return False
+        chunk[idx >> 3] = byte | bit
+        self._count += 1
+        self._encoded.pop(key, None)
+        return True
+
+    def add(self, tile: tuple[int, int]):
+        self.mark(int(tile[0]), int(tile[1]))
+
+    def update(self, tiles):
+        for tile in tiles:
+            self.add(tile)
+
+    def has(self, x: int, y: int) -> bool:
+        chunk = self._chunks.get((x >> self.SHIFT, y >> self.SHIFT))
+        if chunk is None:
+            return False
+        idx = ((y & self.MASK) << self.SHIFT) | (x & self.MASK)
+        return bool(chunk[idx >> 3] & (1 << (idx & 7)))
+
+    def __contains__(self, tile) -> bool:
+        return self.has(tile[0], tile[1])
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self):
+        shift, size = self.SHIFT, self.CHUNK
+        for (cx, cy), chunk in self._chunks.items():
+            for i, byte in enumerate(chunk):
+                if not byte:
+                    continue
+                for b in range(8):
+                    if byte & (1 << b):
+                        idx = (i << 3) | b
+                        yield ((cx << shift) + idx % size, (cy << shift) + idx // size)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, VisitedTiles):
+            return self._count == other._count and all(
+                other._chunks.get(key, b"") == chunk or not any(chunk)
+                for key, chunk in self._chunks.items()
+            )
+        if isinstance(other, (set, frozenset)):
+            return self._count == len(other) and all(tile in self for tile in other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def reveal_disc(self, cx: int, cy: int, radius: int) -> list[tuple[int, int]]:
+        """Mark every tile with dx*dx + dy*dy <= radius*radius + 1; return the new ones."""
+        fresh = []
+        chunks, encoded = self._chunks, self._encoded
+        shift, mask, size = self.SHIFT, self.MASK, self.CHUNK_BYTES
+        for dy, span in _disc_spans(radius):
+            y = cy + dy
+            row = (y & mask) << shift
+            ky = y >> shift
+            key = chunk = None
+            for x in range(cx - span, cx + span + 1):
+                kx = x >> shift
+                if key is None or key[0] != kx:
+                    key = (kx, ky)
+                    chunk = chunks.get(key)
+                    if chunk is None:
+                        chunk = chunks[key] = bytearray(size)
+                idx = row | (x & mask)
+                bit = 1 << (idx & 7)
+                byte = chunk[idx >> 3]
+                if not byte & bit:
+                    chunk[idx >> 3] = byte | bit
+                    encoded.pop(key, None)
+                    fresh.append((x, y))
+        self._count += len(fresh)
+        return fresh
+
+    def encode(self) -> dict:
+        """{"chunk": CHUNK, "chunks": {"cx,cy": base64 bitmap}} for saving."""
+        encoded = self._encoded
+        for key, chunk in self._chunks.items():
+            if key not in encoded and any(chunk):
+                encoded[key] = base64.b64encode(bytes(chunk)).decode("ascii")
+        return {
+            "chunk": self.CHUNK,
+            "chunks": {f"{cx},{cy}": text for (cx, cy), text in sorted(encoded.items())},
+        }
+
+    @classmethod
+    def decode(cls, data) -> "VisitedTiles":
+        tiles = cls()
+        if not isinstance(data, dict) or data.get("chunk") != cls.CHUNK:
+            return tiles
+        for name, text in data.get("chunks", {}).items():
+            try:
+                cx, cy = (int(part) for part in name.split(","))
+                raw = base64.b64decode(text)
+            except (ValueError, TypeError):
+                continue
+            if len(raw) != cls.CHUNK_BYTES:
+                continue
+            tiles._chunks[(cx, cy)] = bytearray(raw)
+            tiles._count += sum(bin(byte).count("1") for byte in raw)
+            tiles._encoded[(cx, cy)] = text
+        return tiles
+
+    @classmethod
+    def from_snapshot(cls, player: dict) -> "VisitedTiles":
+        """Read visited_bits, or the older visited_runs / visited_tiles lists."""
+        if "visited_bits" in player:
+            return cls.decode(player["visited_bits"])
+        if "visited_runs" in player:
+            return cls(decode_visited_tiles(player["visited_runs"]))
+        tiles = cls()
+        for tile in player.get("visited_tiles", []):
+            if isinstance(tile, (list, tuple)) and len(tile) == 2:
+                tiles.mark(int(tile[0]), int(tile[1]))
+        return tiles
+
+
 class Player:
+    __slots__ = (
+        "max_hp", "hp", "discovered_rooms", "explored_rooms", "room_positions",
+        "current_pos", "_visited", "_inventory", "torch_uses", "overweight",
+        "defeated_enemies", "version", "change_log",
+    )
+
+    # Assignments to these do not change the saved player section.
+    _UNVERSIONED = frozenset({"version", "overweight", "_visited", "change_log"})
+
     def __init__(self, max_hp: int = 30):
+        object.__setattr__(self, "version", 0)
+        # While a set, collects the names of versioned attributes assigned.
+        self.change_log: set[str] | None = None
         self.max_hp = max_hp
         self.hp     = max_hp
         self.discovered_rooms: set[str]                  = set()
         self.explored_rooms:   set[str]                  = set()
         self.room_positions:   dict[str, tuple[int,int]] = {}
         self.current_pos:      tuple[int,int]            = (0, 0)
-        self.visited_tiles:    set[tuple[int,int]]       = set()
+        self.visited_tiles = VisitedTiles()
 
-        self.inventory: dict[str, int] = {
+        self.inventory = {
             "wood": 0, "stone": 0, "food": 0
         }
 
@@ -82,17 +689,47 @@ class Player:
         self.overweight: bool = False
         self.defeated_enemies: set[str] = set()
 
+    def __setattr__(self, name: str, value):
+        object.__setattr__(self, name, value)
+        if name not in Player._UNVERSIONED:
+            object.__setattr__(self, "version", self.version + 1)
+            if self.change_log is not None:
+                self.change_log.add(name)
+
+    def state_key(self) -> tuple:
+        """Changes whenever anything snapshot() saves for the player does.
+
+        The room and enemy sets only grow in place during play (loading
+        replaces them, which bumps version), and room_positions entries are
+        only rewritten alongside current_pos, so their sizes stand in for
+        per-set counters.
+        """
+        return (
+            self.version, self._inventory.version, len(self.discovered_rooms),
+            len(self.explored_rooms), len(self.defeated_enemies), len(self.room_positions),
+        )
+
+    @property
+    def visited_tiles(self) -> VisitedTiles:
+        return self._visited
+
+    @visited_tiles.setter
+    def visited_tiles(self, tiles):
+        self._visited = tiles if isinstance(tiles, VisitedTiles) else VisitedTiles(tiles)
+
+    @property
+    def inventory(self) -> Inventory:
+        return self._inventory
+
+    @inventory.setter
+    def inventory(self, items: dict):
+        self._inventory = items if isinstance(items, Inventory) else Inventory(items)
+
     def carry_limit(self, item_registry: dict) -> float:
-        base  = 20.0
-        bonus = item_registry.get("backpack", {}).get("carry_bonus", 0)                 if self.inventory.get("backpack", 0) > 0 else 0
-        return base + bonus
+        return 20.0 + self._inventory.carry_bonus(item_registry)
 
     def carried_weight(self, item_registry: dict) -> float:
-        total = 0.0
-        for item, count in self.inventory.items():
-            if count > 0 and item in item_registry:
-                total += item_registry[item].get("weight", 0) * count
-        return total
+        return self._inventory.weight(item_registry)
 
     def get_inventory_lines(self, item_registry: dict | None = None) -> list[str]:
         lines = ["\nInventory:"]
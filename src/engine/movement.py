@@ -7,6 +7,7 @@ from engine.constants import (
     REVEAL_RADIUS,
     LIGHT_SOURCES,
 )
+from engine.registry import command
 
 WATER_ROOMS = {"river_run", "river_lake", "far_shore", "open_waters"}
 WATER_STEP_SIZE = 2
@@ -25,12 +26,13 @@ class MovementMixin:
         wp = self._world_pos()
         if wp is None:
             return
-        wx, wy = wp
-        r = REVEAL_RADIUS
-        for dy in range(-r, r + 1):
-            for dx in range(-r, r + 1):
-                if dx * dx + dy * dy <= r * r + 1:
-                    self.player.visited_tiles.add((wx + dx, wy + dy))
+        fresh = self.player.visited_tiles.reveal_disc(wp[0], wp[1], REVEAL_RADIUS)
+        if not fresh:
+            return
+        for name in ("visited_log", "reveal_log"):
+            log = getattr(self, name, None)
+            if log is not None:
+                log.extend(fresh)
 
     def _at_exit_edge(self, direction: str, room) -> bool:
         if direction == "north": return self.local_y == 0
@@ -52,73 +54,25 @@ class MovementMixin:
         nearby_lines: list[str] = []
         registry = getattr(self, "item_registry", {})
 
-        for feat in getattr(room, "features", []):
-            fx, fy = feat.get("pos", (-1, -1))
-            if abs(fx - self.local_x) <= 1 and abs(fy - self.local_y) <= 1:
-                nearby_lines.append(f"[nearby] {feat.get('desc', '')}")
-                break
-
-        for item, pos in self._item_positions(room).items():
-            ix, iy = pos
-            if abs(ix - self.local_x) <= 1 and abs(iy - self.local_y) <= 1:
-                item_data = registry.get(item, {})
-                desc = item_data.get("desc", "")
-                name = item.replace("_", " ")
-                item_line = f"[nearby item] {name}."
-                if desc:
-                    item_line += f" {desc}"
-                nearby_lines.append(item_line)
-                nearby_lines.append(f"Type take {item} or examine {item}.")
-                break
+        feat = room.feature_near(self.local_x, self.local_y)
+        if feat is not None:
+            nearby_lines.append(f"[nearby] {feat.get('desc', '')}")
+
+        item = room.item_near(self.local_x, self.local_y)
+        if item is not None:
+            item_data = registry.get(item, {})
+            desc = item_data.get("desc", "")
+            name = item.replace("_", " ")
+            item_line = f"[nearby item] {name}."
+            if desc:
+                item_line += f" {desc}"
+            nearby_lines.append(item_line)
+            nearby_lines.append(f"Type take {item} or examine {item}.")
 
         if nearby_lines:
             return "\n".join(nearby_lines)
         return None
 
-    def _item_positions(self, room) -> dict[str, tuple[int, int]]:
-        visible_items = list(room.visible_loot().keys())
-        if not visible_items:
-            return {}
-
-        positions: dict[str, tuple[int, int]] = {}
-        feature_pos = {f.get("id"): f.get("pos", (-1, -1)) for f in getattr(room, "features", [])}
-        used: set[tuple[int, int]] = set()
-
-        for item in visible_items:
-            feat_id = room.loot_hint.get(item)
-            if feat_id and feat_id in feature_pos:
-                px, py = feature_pos[feat_id]
-                px = max(0, min(room.width - 1, int(px)))
-                py = max(0, min(room.height - 1, int(py)))
-                positions[item] = (px, py)
-                used.add((px, py))
-
-        unplaced = [item for item in visible_items if item not in positions]
-        if not unplaced:
-            return positions
-
-        row = min(room.height - 1, max(0, room.height // 2 + 2))
-        half = len(unplaced) // 2
-        for idx, item in enumerate(unplaced):
-            x = room.width // 2 + idx - half
-            x = max(0, min(room.width - 1, x))
-            pos = (x, row)
-            if pos in used:
-                found = None
-                for ddx in range(1, room.width):
-                    for cand in ((x + ddx, row), (x - ddx, row)):
-                        cx, cy = cand
-                        if 0 <= cx < room.width and (cx, cy) not in used:
-                            found = (cx, cy)
-                            break
-                    if found:
-                        break
-                if found:
-                    pos = found
-            positions[item] = pos
-            used.add(pos)
-        return positions
-
     def _blocked_edge_message(self, room) -> str:
         if not room:
             return "You cannot go that way."
@@ -171,6 +125,7 @@ class MovementMixin:
         self._mark_visited()
         return self.describe_current_room()
 
+    @command("leave", takes_target=False)
     def handle_leave(self) -> list[str]:
         room = self.get_current_room()
         if not room:
@@ -191,6 +146,7 @@ class MovementMixin:
         dirs = ", ".join(sorted(room.exits.keys()))
         return [f"Leave which way? Available exits: {dirs}."]
 
+    @command("go")
     def handle_go(self, target) -> list[str]:
         if not target:
             return ["Go where? Example: go north"]
@@ -199,7 +155,7 @@ class MovementMixin:
             return ["Error: current room not found."]
         if target not in DIRECTION_DELTAS:
             enter_target = self._resolve_enter_target(target)
-            if any(feat["id"] == enter_target or feat["label"].lower() == enter_target for feat in room.features):
+            if room.find_feature(enter_target) is not None:
                 return self.handle_enter(enter_target)
             return ["Map supports only: north, south, east, west"]
 
@@ -1,4 +1,8 @@
-import re
+from __future__ import annotations
+
+from functools import lru_cache
+
+from engine.loader import load_world_template
 
 
 DIRECTION_ALIASES = {
@@ -78,120 +82,218 @@ TARGET_FILLERS = {
     "in", "inside", "around", "from", "with", "up", "for", "my",
 }
 
+# Multi-word targets are generated from world ids (see engine.vocab); these
+# are only the phrases that are not spelled like an id.
 TWO_WORD_TARGETS = {
-    ("climbing", "gear"): "climbing_gear",
-    ("old", "map"): "old_map",
-    ("river", "lake"): "river_lake",
-    ("river", "run"): "river_run",
-    ("flat", "stone"): "flat_stone",
-    ("cave", "tunnel"): "cave_tunnel",
-    ("cave", "chamber"): "cave_chamber",
-    ("cabin", "interior"): "cabin_interior",
-    ("loft", "ladder"): "loft_ladder",
-    ("cabin", "bunk"): "cabin_bunk",
     ("work", "table"): "worktable",
-    ("stone", "column"): "stone_column",
-    ("echo", "pool"): "echo_pool",
-    ("chamber", "ledge"): "chamber_ledge",
-    ("flat", "rock"): "flat_rock",
-    ("rope", "post"): "rope_post",
-    ("fallen", "tree"): "fallen_tree",
-    ("trail", "marker"): "trail_marker",
-    ("cliff", "edge"): "cliff_edge",
-    ("tide", "pool"): "tide_pool",
-    ("signal", "brazier"): "signal_brazier",
-    ("signal", "lens"): "signal_lens",
-    ("signal", "lever"): "signal_lever",
-    ("spiral", "stairs"): "spiral_stairs",
-    ("fogged", "window"): "fogged_window",
-    ("maintenance", "locker"): "maintenance_locker",
-    ("winch", "console"): "winch_console",
-    ("shutter", "crank"): "shutter_crank",
-    ("catwalk", "hatch"): "catwalk_hatch",
-    ("lighthouse", "light"): "lighthouse_light",
     ("fire", "pit"): "firepit",
-    ("far", "shore"): "far_shore",
+    ("lighthouse", "light"): "lighthouse_light",
+}
+
+
+INTENT_PHRASES = {
+    ("look", "around"): ("look", False),
+    ("look", "at"): ("examine", True),
+    ("where", "am", "i"): ("look", False),
+    ("how", "to", "play"): ("help", False),
+    ("what", "do", "i", "do"): ("hint", False),
+    ("what", "now"): ("hint", False),
+    ("pick", "up"): ("take", True),
+}
+
+TARGET_ALIASES = {
+    "rafter": "raft",
 }
 
+COMBINE_FILLERS = {"the", "a", "an", "with", "and"}
+
+
+class _Node:
+    __slots__ = ("next", "value")
+
+    def __init__(self):
+        self.next: dict[str, _Node] = {}
+        self.value = None
+
+
+class TokenTrie:
+    """Maps token sequences to values; lookups return the longest match."""
+
+    def __init__(self, entries=()):
+        self.root = _Node()
+        for tokens, value in entries:
+            self.add(tokens, value)
+
+    def add(self, tokens, value):
+        node = self.root
+        for tok in tokens:
+            child = node.next.get(tok)
+            if child is None:
+                child = node.next[tok] = _Node()
+            node = child
+        node.value = value
+
+    def match(self, tokens: list[str], start: int = 0) -> tuple[object, int]:
+        """(value, tokens consumed) for the longest entry at tokens[start:]."""
+        node = self.root
+        best, best_len = None, 0
+        i = start
+        end = len(tokens)
+        while i < end:
+            node = node.next.get(tokens[i])
+            if node is None:
+                break
+            i += 1
+            if node.value is not None:
+                best, best_len = node.value, i - start
+        return best, best_len
+
+    def matches(self, tokens: list[str], start: int = 0) -> list[object]:
+        """Values of every entry that is a prefix of tokens[start:], longest first."""
+        node = self.root
+        found = []
+        for i in range(start, len(tokens)):
+            node = node.next.get(tokens[i])
+            if node is None:
+                break
+            if node.value is not None:
+                found.append(node.value)
+        found.reverse()
+        return found
+
+
+class Target(str):
+    """A target phrase with more than one reading.
+
+    The string is the longest match; candidates lists every reading,
+    longest first, ending with the phrase's head word. The command layer
+    picks the first one that makes sense in the player's room.
+    """
+
+    def __new__(cls, candidates: tuple[str, ...]):
+        target = super().__new__(cls, candidates[0])
+        target.candidates = candidates
+        return target
+
+
+class _CleanTable(dict):
+    # str.translate table: keep ascii letters, digits and whitespace, blank the rest.
+    def __missing__(self, code: int):
+        ch = chr(code)
+        keep = ch.isspace() or "a" <= ch <= "z" or "0" <= ch <= "9"
+        self[code] = code if keep else 32
+        return self[code]
+
+
+_CLEAN = _CleanTable()
+
 
 def _tokenize(text: str) -> list[str]:
-    cleaned = re.sub(r"[^a-z0-9\s]", " ", text.lower()).strip()
-    return [t for t in cleaned.split() if t]
+    return text.lower().translate(_CLEAN).split()
+
+
+class CommandMatcher:
+    """Compiled parser tables: command-start phrases and multiword targets."""
+
+    def __init__(self, phrases: dict[tuple[str, ...], str] | None = None):
+        commands = TokenTrie()
+        for alias, verb in VERB_ALIASES.items():
+            commands.add((alias,), (verb, True))
+        for phrase, intent in INTENT_PHRASES.items():
+            commands.add(phrase, intent)
+        self.commands = commands
+
+        if phrases is None:
+            phrases = dict(TWO_WORD_TARGETS)
+            phrases.update(((alias,), target) for alias, target in TARGET_ALIASES.items())
+        self.targets = TokenTrie(phrases.items())
+
+    def map_target(self, tokens: list[str], start: int = 0) -> str | None:
+        while start < len(tokens) and tokens[start] in TARGET_FILLERS:
+            start += 1
+        if start >= len(tokens):
+            return None
+        candidates = self.targets.matches(tokens, start)
+        head = tokens[start]
+        if head not in candidates:
+            candidates.append(head)
+        if len(candidates) == 1:
+            return head
+        return Target(tuple(candidates))
+
+    def parse(self, text: str) -> tuple[str, str | None]:
+        if text.strip() == "?":
+            return "help", None
+
+        parts = _tokenize(text)
+        if not parts:
+            return "", None
+
+        if len(parts) == 1:
+            d = DIRECTION_ALIASES.get(parts[0])
+            if d:
+                return "go", d
+            alias = SINGLE_ALIASES.get(parts[0])
+            if alias:
+                return alias
 
+        intent, used = self.commands.match(parts)
+        if intent is None:
+            verb, used = parts[0], 1
+        else:
+            verb, takes_target = intent
+            if not takes_target:
+                return verb, None
 
-def _trim_fillers(tokens: list[str]) -> list[str]:
-    idx = 0
-    while idx < len(tokens) and tokens[idx] in TARGET_FILLERS:
-        idx += 1
-    return tokens[idx:]
+        # "go to the north", "walk west", "move right"
+        if verb == "go":
+            i = used
+            while i < len(parts) and parts[i] in TARGET_FILLERS:
+                i += 1
+            if i < len(parts) and parts[i] in DIRECTION_ALIASES:
+                return "go", DIRECTION_ALIASES[parts[i]]
+            return "go", self.map_target(parts, i)
 
+        if verb == "combine":
+            combo_parts = [t for t in parts[used:] if t not in COMBINE_FILLERS]
+            if not combo_parts:
+                return "combine", None
+            return "combine", " ".join(combo_parts)
 
-def _map_target(tokens: list[str]) -> str | None:
-    if not tokens:
-        return None
-    if len(tokens) >= 2:
-        mapped = TWO_WORD_TARGETS.get((tokens[0], tokens[1]))
-        if mapped:
-            return mapped
-    if tokens[0] == "rafter":
-        return "raft"
-    return tokens[0]
+        return verb, self.map_target(parts, used)
+
+
+_MATCHER: tuple[object, CommandMatcher] | None = None
+
+PARSE_CACHE_SIZE = 1024
+
+
+def get_matcher() -> CommandMatcher:
+    """Matcher for the current world's vocabulary, rebuilt if the world reloads."""
+    global _MATCHER
+    vocabulary = load_world_template().vocabulary
+    if _MATCHER is None or _MATCHER[0] is not vocabulary:
+        _MATCHER = (vocabulary, CommandMatcher(vocabulary.phrases))
+        _parse_cached.cache_clear()
+    return _MATCHER[1]
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_cached(text: str) -> tuple[str, str | None]:
+    return _MATCHER[1].parse(text)
 
 
 def parse_command(text: str) -> tuple[str, str | None]:
-    raw = text.strip().lower()
-    if raw == "?":
-        return "help", None
-
-    parts = _tokenize(text)
-    if not parts:
-        return "", None
-
-    if len(parts) == 1:
-        d = DIRECTION_ALIASES.get(parts[0])
-        if d:
-            return "go", d
-        alias = SINGLE_ALIASES.get(parts[0])
-        if alias:
-            return alias
-
-    # Common natural-language intents for first-time players.
-    if parts[:2] == ["look", "around"]:
-        return "look", None
-    if parts[:2] == ["look", "at"]:
-        target = _map_target(_trim_fillers(parts[2:]))
-        return "examine", target
-    if parts[:3] == ["where", "am", "i"]:
-        return "look", None
-    if parts[:3] == ["how", "to", "play"]:
-        return "help", None
-    if parts[:4] == ["what", "do", "i", "do"] or parts[:2] == ["what", "now"]:
-        return "hint", None
-    if parts[:2] == ["pick", "up"]:
-        target = _map_target(_trim_fillers(parts[2:]))
-        return "take", target
-
-    verb = VERB_ALIASES.get(parts[0], parts[0])
-    rest = parts[1:]
-
-    # "go to the north", "walk west", "move right"
-    if verb == "go":
-        dest_tokens = _trim_fillers(rest)
-        if dest_tokens and dest_tokens[0] in DIRECTION_ALIASES:
-            return "go", DIRECTION_ALIASES[dest_tokens[0]]
-        return "go", _map_target(dest_tokens)
-
-    if verb in ("combine",):
-        combo_parts = [t for t in rest if t not in {"the", "a", "an", "with", "and"}]
-        if not combo_parts:
-            return "combine", None
-        return "combine", " ".join(combo_parts)
-
-    target_tokens = _trim_fillers(rest)
-    target = _map_target(target_tokens)
-
-    # Bare read should try first readable item in inventory.
-    if verb == "read" and not target:
-        return "read", None
-
-    return verb, target
+    get_matcher()
+    return _parse_cached(text)
+
+
+def parse_cache_info():
+    """functools hits/misses/maxsize/currsize for the raw-string parse cache."""
+    return _parse_cached.cache_info()
+
+
+def clear_parse_cache():
+    global _MATCHER
+    _MATCHER = None
+    _parse_cached.cache_clear()
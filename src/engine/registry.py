@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import atexit
+import sys
+from time import perf_counter
+from typing import Callable
+
+from engine.suggest import SuggestionIndex
+
+Handler = Callable[[object, object], list]
+
+
+def command(*verbs: str, takes_target: bool = True):
+    """Mark a GameState (or mixin) method as the handler for verbs."""
+    def mark(fn):
+        fn._command_verbs = getattr(fn, "_command_verbs", ()) + tuple(
+            (verb, takes_target) for verb in verbs
+        )
+        return fn
+    return mark
+
+
+class CommandRegistry:
+    """verb -> handler(state, target) table used by GameState.process_command."""
+
+    def __init__(self, handlers: dict[str, Handler] | None = None):
+        self._handlers: dict[str, Handler] = dict(handlers or {})
+        self._verbs: tuple[str, ...] | None = None
+        self._index: SuggestionIndex | None = None
+        self._stats: dict[str, list] | None = None
+        self._dump_registered = False
+
+    @classmethod
+    def for_class(cls, owner: type) -> "CommandRegistry":
+        """Collect every @command method visible on owner, subclasses winning."""
+        registry = cls()
+        marked: dict[str, tuple] = {}
+        for klass in reversed(owner.__mro__):
+            for name, attr in vars(klass).items():
+                verbs = getattr(attr, "_command_verbs", None)
+                if verbs:
+                    marked[name] = verbs
+        # An override without @command still handles the verbs it replaces.
+        for name, verbs in marked.items():
+            method = getattr(owner, name)
+            for verb, takes_target in verbs:
+                registry.register(verb, method, takes_target=takes_target)
+        return registry
+
+    def register(self, verb: str, handler: Callable, takes_target: bool = True):
+        if not takes_target:
+            fn = handler
+            handler = lambda state, target: fn(state)
+        self._handlers[verb] = handler
+        self._verbs = None
+        self._index = None
+
+    def unregister(self, verb: str):
+        self._handlers.pop(verb, None)
+        self._verbs = None
+        self._index = None
+
+    def __contains__(self, verb: str) -> bool:
+        return verb in self._handlers
+
+    def verbs(self) -> tuple[str, ...]:
+        if self._verbs is None:
+            self._verbs = tuple(self._handlers)
+        return self._verbs
+
+    def suggest(self, verb: str) -> str | None:
+        if self._index is None:
+            self._index = SuggestionIndex(self.verbs())
+        return self._index.suggest(verb)
+
+    def dispatch(self, state, verb: str, target) -> list[str] | None:
+        """Run the handler for verb, or return None if nothing is registered."""
+        handler = self._handlers.get(verb)
+        if handler is None:
+            return None
+        stats = self._stats
+        if stats is None:
+            return handler(state, target)
+        start = perf_counter()
+        try:
+            return handler(state, target)
+        finally:
+            elapsed = perf_counter() - start
+            entry = stats.get(verb)
+            if entry is None:
+                stats[verb] = [1, elapsed, elapsed]
+            else:
+                entry[0] += 1
+                entry[1] += elapsed
+                if elapsed > entry[2]:
+                    entry[2] = elapsed
+
+    # Instrumentation
+
+    def enable_timing(self, dump_at_exit: bool = False, stream=None):
+        if self._stats is None:
+            self._stats = {}
+        if dump_at_exit and not self._dump_registered:
+            self._dump_registered = True
+            atexit.register(self.dump_timing, stream)
+
+    def disable_timing(self):
+        self._stats = None
+
+    def timing(self) -> dict[str, dict]:
+        """Per-verb calls, total_ms and max_ms since timing was enabled."""
+        return {
+            verb: {"calls": calls, "total_ms": total * 1000.0, "max_ms": worst * 1000.0}
+            for verb, (calls, total, worst) in (self._stats or {}).items()
+        }
+
+    def timing_lines(self) -> list[str]:
+        rows = sorted(self.timing().items(), key=lambda kv: kv[1]["total_ms"], reverse=True)
+        lines = [f"{'verb':<12}{'calls':>8}{'total ms':>12}{'mean ms':>10}{'max ms':>10}"]
+        for verb, row in rows:
+            mean = row["total_ms"] / row["calls"]
+            lines.append(
+                f"{verb or '(empty)':<12}{row['calls']:>8}{row['total_ms']:>12.2f}"
+                f"{mean:>10.3f}{row['max_ms']:>10.3f}"
+            )
+        return lines
+
+    def dump_timing(self, stream=None):
+        if not self._stats:
+            return
+        stream = stream or sys.stderr
+        for line in self.timing_lines():
+            print(line, file=stream)
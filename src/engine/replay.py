@@ -0,0 +1,154 @@
+"""
+Record a play session as parsed commands and combat turns, and rebuild it.
+
+The engine has no randomness or clock, so difficulty, an optional starting
+snapshot and the ordered events are enough to reproduce a session exactly.
+From src/:
+
+    python -m engine.replay session.json           # replay, check final state
+    python -m engine.replay a.json b.json          # replay both, diff results
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from pathlib import Path
+
+from engine.constants import DEFAULT_DIFFICULTY
+
+REPLAY_FORMAT = 1
+
+
+class SessionLog:
+    """Difficulty, optional base snapshot and events of one session.
+
+    An event is [verb, target] for a parsed command, or [action] for a
+    combat turn (attack, eat, flee, or an enemy auto-attack tick).
+    """
+
+    __slots__ = ("difficulty", "base", "events", "final")
+
+    def __init__(self, difficulty: str = DEFAULT_DIFFICULTY, base: dict | None = None,
+                 events: list | None = None, final: dict | None = None):
+        self.difficulty = difficulty
+        self.base = base
+        self.events: list[list] = events if events is not None else []
+        self.final = final
+
+    def to_dict(self) -> dict:
+        data = {"format": REPLAY_FORMAT, "difficulty": self.difficulty, "events": self.events}
+        if self.base is not None:
+            data["base"] = self.base
+        if self.final is not None:
+            data["final"] = self.final
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SessionLog":
+        if data.get("format") != REPLAY_FORMAT:
+            raise ValueError(f"unsupported replay format: {data.get('format')}")
+        return cls(data.get("difficulty", DEFAULT_DIFFICULTY), data.get("base"),
+                   list(data.get("events", [])), data.get("final"))
+
+    def dump(self, path):
+        with Path(path).open("w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path) -> "SessionLog":
+        with Path(path).open("r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+class Recorder:
+    """Collects a SessionLog from GameState.process_command and combat_action."""
+
+    def __init__(self, state, from_start: bool = False):
+        base = None if from_start else state.snapshot()
+        self.log = SessionLog(getattr(state, "difficulty", DEFAULT_DIFFICULTY), base)
+
+    @classmethod
+    def attach(cls, state, from_start: bool = False) -> "Recorder":
+        """Start recording state; from_start means it is a brand-new game."""
+        state.recorder = recorder = cls(state, from_start)
+        return recorder
+
+    def command(self, verb: str, target):
+        self.log.events.append([verb, target])
+
+    def combat(self, action: str):
+        self.log.events.append([action])
+
+    def finish(self, state) -> SessionLog:
+        """Stamp the final snapshot so a replay can be checked against it."""
+        self.log.final = state.snapshot()
+        return self.log
+
+
+def replay(log: SessionLog, state=None):
+    """Rebuild the session's GameState without any UI, as fast as it runs."""
+    if state is None:
+        from engine.game_state import GameState
+
+        state = GameState(difficulty=log.difficulty)
+    if log.base is not None and not state.apply_snapshot(log.base):
+        raise ValueError("base snapshot does not fit this world")
+    for event in log.events:
+        if len(event) == 1:
+            state.combat_action(event[0])
+            continue
+        verb, target = event
+        prev_room = state.current_room_id
+        state.process_command(verb, target)
+        # The UI looks for an encounter whenever a command changes room.
+        if state.is_running and state.combat is None and state.current_room_id != prev_room:
+            state.check_encounter()
+    return state
+
+
+def diff_snapshots(a, b, path: str = "") -> list[str]:
+    """Human-readable differences between two snapshot dicts."""
+    if isinstance(a, dict) and isinstance(b, dict):
+        out = []
+        for key in sorted(set(a) | set(b), key=str):
+            sub = f"{path}.{key}" if path else str(key)
+            if key not in a:
+                out.append(f"{sub}: missing on the left")
+            elif key not in b:
+                out.append(f"{sub}: missing on the right")
+            else:
+                out.extend(diff_snapshots(a[key], b[key], sub))
+        return out
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        a, b = list(a), list(b)
+    return [] if a == b else [f"{path}: {a!r} != {b!r}"]
+
+
+def main(argv: list[str]) -> int:
+    if not 1 <= len(argv) <= 2:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+    results = []
+    for path in argv:
+        log = SessionLog.load(path)
+        start = time.perf_counter()
+        state = replay(log)
+        elapsed = time.perf_counter() - start
+        print(f"{path}: {len(log.events)} events in {elapsed * 1000:.1f} ms "
+              f"({len(log.events) / max(elapsed, 1e-9):.0f} events/s)")
+        results.append((log, state.snapshot()))
+    if len(results) == 2:
+        diffs = diff_snapshots(results[0][1], results[1][1])
+    elif results[0][0].final is not None:
+        diffs = diff_snapshots(results[0][0].final, results[0][1])
+    else:
+        diffs = []
+    for line in diffs:
+        print(f"  {line}")
+    return 1 if diffs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,38 +1,112 @@
 from __future__ import annotations
 
-from engine.constants import encode_visited_tiles, decode_visited_tiles
+from engine.models import VisitedTiles
+
+# 1: every room's loot. 2: only rooms whose loot differs from the world template.
+SAVE_FORMAT = 2
+
+
+def touched_rooms(rooms) -> dict:
+    """Rooms a session has copied from the template (all rooms for a plain dict)."""
+    touched = getattr(rooms, "touched", None)
+    return touched() if touched is not None else rooms
+
+
+def _loot_key(loot: dict, loot_hidden: dict) -> tuple:
+    """Comparable form of a room's loot: counts and hidden flags that matter."""
+    present = {k: int(v) for k, v in loot.items() if int(v) > 0}
+    return present, {k for k in present if loot_hidden.get(k)}
+
+
+def _pristine(rooms, room_id: str):
+    template = getattr(rooms, "template", None)
+    return template(room_id) if template is not None else None
 
 
 class SaveMixin:
 
-    def snapshot(self) -> dict:
+    def save_versions(self) -> dict:
+        """Per-section keys that change whenever that part of snapshot() would."""
+        player = self.player
+        touched = touched_rooms(self.rooms)
+        loot = getattr(self.rooms, "loot_version", None)
+        if loot is None:
+            # loot_version only ever grows, so the sum moves on any loot change.
+            loot = sum(room.loot_version for room in touched.values())
+        return {
+            "position": (getattr(self, "difficulty", "normal"), self.current_room_id,
+                         int(self.local_x), int(self.local_y)),
+            "player": (id(player),) + player.state_key(),
+            "visited": (id(player.visited_tiles), len(player.visited_tiles)),
+            "rooms": (id(self.rooms), len(touched), loot),
+        }
+
+    def _snapshot_player(self) -> dict:
+        p = self.player
+        return {
+            "hp": int(p.hp),
+            "max_hp": int(p.max_hp),
+            "inventory": {k: int(v) for k, v in p.inventory.items() if int(v) > 0},
+            "torch_uses": p.torch_uses,
+            "discovered_rooms": sorted(p.discovered_rooms),
+            "explored_rooms": sorted(p.explored_rooms),
+            "room_positions": {
+                rid: [int(pos[0]), int(pos[1])]
+                for rid, pos in p.room_positions.items()
+            },
+            "current_pos": [int(p.current_pos[0]), int(p.current_pos[1])],
+            "defeated_enemies": sorted(p.defeated_enemies),
+        }
+
+    def _snapshot_rooms(self, cached: dict) -> dict:
+        """Loot for the rooms that no longer match the world template."""
         room_state = {}
-        for rid, room in self.rooms.items():
-            room_state[rid] = {
-                "loot": dict(room.loot),
-                "loot_hidden": {k: bool(v) for k, v in room.loot_hidden.items()},
-            }
+        for rid, room in touched_rooms(self.rooms).items():
+            key = (id(room), room.loot_version)
+            hit = cached.get(rid)
+            if hit is None or hit[0] != key:
+                pristine = _pristine(self.rooms, rid)
+                data = None
+                if pristine is None or _loot_key(room.loot, room.loot_hidden) != _loot_key(
+                        pristine.loot, pristine.loot_hidden):
+                    data = {
+                        "loot": dict(room.loot),
+                        "loot_hidden": {k: bool(v) for k, v in room.loot_hidden.items()},
+                    }
+                hit = cached[rid] = (key, data)
+            if hit[1] is not None:
+                room_state[rid] = hit[1]
+        return room_state
+
+    def snapshot(self) -> dict:
+        """Save dict for this state.
+
+        Sections are cached against save_versions() and only rebuilt when
+        their key moves, so the nested dicts are shared between snapshots
+        and must be treated as read-only.
+        """
+        versions = self.save_versions()
+        cache = getattr(self, "_snapshot_cache", None)
+        if cache is None:
+            cache = self._snapshot_cache = {"rooms_by_id": {}}
+        for section, build in (
+            ("player", self._snapshot_player),
+            ("visited", self.player.visited_tiles.encode),
+            ("rooms", lambda: self._snapshot_rooms(cache["rooms_by_id"])),
+        ):
+            hit = cache.get(section)
+            if hit is None or hit[0] != versions[section]:
+                cache[section] = (versions[section], build())
+        player = dict(cache["player"][1])
+        player["visited_bits"] = cache["visited"][1]
         return {
+            "format": SAVE_FORMAT,
             "difficulty": getattr(self, "difficulty", "normal"),
             "current_room_id": self.current_room_id,
             "local_x": int(self.local_x),
             "local_y": int(self.local_y),
-            "player": {
-                "hp": int(self.player.hp),
-                "max_hp": int(self.player.max_hp),
-                "inventory": {k: int(v) for k, v in self.player.inventory.items() if int(v) > 0},
-                "torch_uses": self.player.torch_uses,
-                "discovered_rooms": sorted(self.player.discovered_rooms),
-                "explored_rooms": sorted(self.player.explored_rooms),
-                "room_positions": {
-                    rid: [int(pos[0]), int(pos[1])]
-                    for rid, pos in self.player.room_positions.items()
-                },
-                "current_pos": [int(self.player.current_pos[0]), int(self.player.current_pos[1])],
-                "visited_runs": encode_visited_tiles(self.player.visited_tiles),
-                "defeated_enemies": sorted(self.player.defeated_enemies),
-            },
-            "rooms": room_state,
+            "player": player,
+            "rooms": cache["rooms"][1],
         }
 
     def apply_snapshot(self, snap: dict) -> bool:
@@ -62,22 +136,28 @@ class SaveMixin:
             cur_pos = p.get("current_pos", [0, 0])
             if isinstance(cur_pos, (list, tuple)) and len(cur_pos) == 2:
                 self.player.current_pos = (int(cur_pos[0]), int(cur_pos[1]))
-            if "visited_runs" in p:
-                self.player.visited_tiles = decode_visited_tiles(p.get("visited_runs", []))
-            else:
-                self.player.visited_tiles = set()
-                for tile in p.get("visited_tiles", []):
-                    if isinstance(tile, (list, tuple)) and len(tile) == 2:
-                        self.player.visited_tiles.add((int(tile[0]), int(tile[1])))
+            self.player.visited_tiles = VisitedTiles.from_snapshot(p)
             self.player.defeated_enemies = set(p.get("defeated_enemies", []))
 
+            # Rooms missing from the save are as the template left them.
+            # Format 1 saves list every room; entries that still match the
+            # template are skipped the same way, so the room is never copied.
             room_snap = snap.get("rooms", {})
+            touched = touched_rooms(self.rooms)
+            for room_id, room in list(touched.items()):
+                pristine = _pristine(self.rooms, room_id)
+                if room_id not in room_snap and pristine is not None:
+                    room.replace_loot(dict(pristine.loot), dict(pristine.loot_hidden))
             for room_id, data in room_snap.items():
-                room = self.rooms.get(room_id)
-                if not room:
+                if room_id not in self.rooms:
+                    continue
+                loot = {k: int(v) for k, v in data.get("loot", {}).items() if int(v) > 0}
+                hidden = {k: bool(v) for k, v in data.get("loot_hidden", {}).items()}
+                pristine = _pristine(self.rooms, room_id)
+                if (room_id not in touched and pristine is not None
+                        and _loot_key(loot, hidden) == _loot_key(pristine.loot, pristine.loot_hidden)):
                     continue
-                room.loot = {k: int(v) for k, v in data.get("loot", {}).items() if int(v) > 0}
-                room.loot_hidden = {k: bool(v) for k, v in data.get("loot_hidden", {}).items()}
+                self.rooms[room_id].replace_loot(loot, hidden)
 
             self.current_room_id = rid
             room = self.rooms[rid]
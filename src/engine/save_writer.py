@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+COALESCE_SECONDS = 0.25
+
+
+def _dump(payload: dict) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def atomic_write_text(path: Path, text: str):
+    """Replace path with text so readers only ever see the old or new file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    if hasattr(os, "O_DIRECTORY"):
+        # Persist the rename itself.
+        fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class FileWriter:
+    """Writes journal entries and snapshots straight to disk."""
+
+    def __init__(self, path: Path, log_path: Path):
+        self.path = Path(path)
+        self.log_path = Path(log_path)
+
+    def append(self, entry: dict):
+        self._write([], [entry])
+
+    def snapshot(self, snap: dict):
+        self._write([snap], [])
+
+    def flush(self):
+        pass
+
+    def wait(self):
+        pass
+
+    def check(self):
+        """Raise the error of a failed write that has not been reported yet."""
+
+    def discard(self):
+        pass
+
+    def close(self):
+        pass
+
+    def _write(self, snaps: list[dict], entries: list[dict]):
+        if snaps:
+            atomic_write_text(self.path, _dump(snaps[-1]))
+            atomic_write_text(self.log_path, "")
+        if entries:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.log_path.open("a", encoding="utf-8") as f:
+                f.write("".join(_dump(e) + "\n" for e in entries))
+                f.flush()
+                os.fsync(f.fileno())
+
+
+class BackgroundWriter(FileWriter):
+    """FileWriter that does its disk work on a worker thread.
+
+    The game thread only queues the dicts it built; they are never touched
+    again on that side. Work arriving within interval of the last write
+    is held back and written together, and a queued snapshot drops any
+    entries queued before it.
+    """
+
+    def __init__(self, path: Path, log_path: Path, interval: float = COALESCE_SECONDS):
+        super().__init__(path, log_path)
+        self.interval = interval
+        self.error: Exception | None = None
+        self._cond = threading.Condition()
+        self._snap: dict | None = None
+        self._entries: list[dict] = []
+        self._busy = False
+        self._urgent = False
+        self._closed = False
+        self._last_write = 0.0
+        self._thread = threading.Thread(target=self._run, name="save-writer", daemon=True)
+        self._thread.start()
+
+    def append(self, entry: dict):
+        with self._cond:
+            self._entries.append(entry)
+            self._cond.notify_all()
+
+    def snapshot(self, snap: dict):
+        with self._cond:
+            self._snap = snap
+            self._entries = []
+            self._cond.notify_all()
+
+    def flush(self):
+        """Write anything pending now, wait until it is on disk and raise if it failed."""
+        self.wait()
+        self.check()
+
+    def wait(self):
+        """Write anything pending now and wait until it is done."""
+        with self._cond:
+            self._urgent = True
+            self._cond.notify_all()
+            while self._pending() or self._busy:
+                self._cond.wait()
+            self._urgent = False
+
+    def check(self):
+        with self._cond:
+            error, self.error = self.error, None
+        if error is not None:
+            raise error
+
+    def discard(self):
+        """Drop pending work and wait out any write in progress."""
+        with self._cond:
+            self._snap = None
+            self._entries = []
+            while self._busy:
+                self._cond.wait()
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            with self._cond:
+                self._closed = True
+                self._cond.notify_all()
+            self._thread.join()
+
+    def _pending(self) -> bool:
+        return self._snap is not None or bool(self._entries)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending() and not self._closed:
+                    self._cond.wait()
+                if self._closed and not self._pending():
+                    return
+                while not self._urgent and not self._closed:
+                    wait = self._last_write + self.interval - time.monotonic()
+                    if wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                snaps = [self._snap] if self._snap is not None else []
+                entries = self._entries
+                self._snap, self._entries = None, []
+                self._busy = True
+            error = None
+            try:
+                if snaps or entries:
+                    self._write(snaps, entries)
+            except Exception as exc:
+                error = exc
+            with self._cond:
+                if self.error is None:
+                    # Held until check() reports it to the game thread.
+                    self.error = error
+                self._busy = False
+                self._last_write = time.monotonic()
+                self._cond.notify_all()
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+from engine.journal import SaveJournal
+from engine.save import SAVE_FORMAT
+from engine.save_writer import atomic_write_text
+
+SLOT_COUNT = 3
+
+
+class SlotInfo:
+    """Menu-facing summary of one save slot, read from the slot index."""
+
+    __slots__ = ("slot", "room_id", "room_name", "hp", "max_hp", "difficulty",
+                 "play_time", "saved_at")
+
+    def __init__(self, slot: int, room_id: str, room_name: str, hp: int, max_hp: int,
+                 difficulty: str, play_time: float, saved_at: float):
+        self.slot = slot
+        self.room_id = room_id
+        self.room_name = room_name
+        self.hp = hp
+        self.max_hp = max_hp
+        self.difficulty = difficulty
+        self.play_time = play_time
+        self.saved_at = saved_at
+
+    def to_dict(self) -> dict:
+        return {key: getattr(self, key) for key in SlotInfo.__slots__ if key != "slot"}
+
+    @classmethod
+    def from_dict(cls, slot: int, data: dict) -> "SlotInfo":
+        return cls(
+            slot,
+            str(data.get("room_id", "")),
+            str(data.get("room_name", "")),
+            int(data.get("hp", 0)),
+            int(data.get("max_hp", 0)),
+            str(data.get("difficulty", "normal")),
+            float(data.get("play_time", 0.0)),
+            float(data.get("saved_at", 0.0)),
+        )
+
+    @classmethod
+    def from_snapshot(cls, slot: int, snap: dict, saved_at: float) -> "SlotInfo":
+        """Summary rebuilt from a full save, for slots the index does not cover."""
+        from engine.loader import load_world_template
+
+        rid = snap.get("current_room_id", "")
+        room = load_world_template().rooms.get(rid)
+        player = snap.get("player", {})
+        return cls(slot, rid, getattr(room, "name", "") or rid, int(player.get("hp", 0)),
+                   int(player.get("max_hp", 0)), snap.get("difficulty", "normal"), 0.0, saved_at)
+
+    @classmethod
+    def from_state(cls, slot: int, state, play_time: float) -> "SlotInfo":
+        room = state.get_current_room()
+        return cls(
+            slot,
+            state.current_room_id,
+            getattr(room, "name", "") or state.current_room_id,
+            int(state.player.hp),
+            int(state.player.max_hp),
+            getattr(state, "difficulty", "normal"),
+            play_time,
+            time.time(),
+        )
+
+    def play_time_text(self) -> str:
+        minutes = int(self.play_time // 60)
+        return f"{minutes // 60}:{minutes % 60:02d}"
+
+
+class SaveSlots:
+    """N journaled save slots plus a small index of their summaries.
+
+    The index (slots.json) is all the menu reads; a slot's snapshot and
+    journal are only opened when that slot is loaded. Saves go to the
+    active slot chosen with begin(), which also starts its play clock.
+    """
+
+    def __init__(self, directory: Path, count: int = SLOT_COUNT, background: bool = False,
+                 legacy: Path | None = None):
+        self.directory = Path(directory)
+        self.count = count
+        self.background = background
+        self.legacy = Path(legacy) if legacy is not None else None
+        self.index_path = self.directory / "slots.json"
+        self.active: int | None = None
+        self._journals: dict[int, SaveJournal] = {}
+        self._index: dict[int, SlotInfo] | None = None
+        self._play_base = 0.0
+        self._play_start = 0.0
+
+    def path(self, slot: int) -> Path:
+        return self.directory / f"slot{slot}.json"
+
+    def journal(self, slot: int) -> SaveJournal:
+        journal = self._journals.get(slot)
+        if journal is None:
+            journal = self._journals[slot] = SaveJournal(self.path(slot), background=self.background)
+        return journal
+
+    # Index
+
+    def _load_index(self) -> dict[int, SlotInfo]:
+        if self._index is not None:
+            return self._index
+        index: dict[int, SlotInfo] = {}
+        try:
+            with self.index_path.open("r", encoding="utf-8") as f:
+                raw = json.load(f)
+            for key, data in raw.get("slots", {}).items():
+                slot = int(key)
+                if 1 <= slot <= self.count and self.path(slot).exists():
+                    index[slot] = SlotInfo.from_dict(slot, data)
+        except (OSError, ValueError, AttributeError):
+            pass
+        self._index = index
+        self._migrate_legacy()
+        missing = [s for s in range(1, self.count + 1) if s not in index and self.path(s).exists()]
+        for slot in missing:
+            # Saved, but the index write was lost (e.g. a crash right after).
+            snap = self.journal(slot).load()
+            if snap is not None:
+                index[slot] = SlotInfo.from_snapshot(slot, snap, self.path(slot).stat().st_mtime)
+        if missing:
+            self._write_index()
+        return index
+
+    def _write_index(self):
+        payload = {"slots": {str(s): info.to_dict() for s, info in sorted(self._load_index().items())}}
+        atomic_write_text(self.index_path, json.dumps(payload, ensure_ascii=False, separators=(",", ":")))
+
+    def _migrate_legacy(self):
+        """Move a single-file save from before slots existed into slot 1."""
+        legacy = self.legacy
+        if legacy is None or not legacy.exists() or self.path(1).exists():
+            return
+        snap = SaveJournal(legacy).load()
+        if snap is None:
+            return
+        self._index[1] = SlotInfo.from_snapshot(1, snap, legacy.stat().st_mtime)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        os.replace(legacy, self.path(1))
+        journal = legacy.with_suffix(".journal")
+        if journal.exists():
+            os.replace(journal, self.journal(1).log_path)
+        self._write_index()
+
+    def list(self) -> list[SlotInfo | None]:
+        """One entry per slot, None for empty slots, without loading any game."""
+        index = self._load_index()
+        return [index.get(slot) for slot in range(1, self.count + 1)]
+
+    def latest(self) -> int | None:
+        index = self._load_index()
+        if not index:
+            return None
+        return max(index.values(), key=lambda info: info.saved_at).slot
+
+    # Sessions
+
+    def begin(self, slot: int):
+        """Make slot the one saves go to and start its play clock."""
+        self.active = slot
+        info = self._load_index().get(slot)
+        self._play_base = info.play_time if info else 0.0
+        self._play_start = time.monotonic()
+
+    def play_time(self) -> float:
+        return self._play_base + (time.monotonic() - self._play_start)
+
+    def load(self, slot: int):
+        """Build the GameState saved in slot, or None."""
+        from engine.game_state import GameState
+
+        journal = self.journal(slot)
+        snap = journal.load()
+        if snap is None:
+            return None
+        state = GameState(difficulty=snap.get("difficulty", "normal"))
+        if not state.apply_snapshot(snap):
+            return None
+        if snap.get("format", 1) < SAVE_FORMAT:
+            # Rewrite older saves in the current layout straight away.
+            journal.compact(state)
+        return state
+
+    def save(self, state, compact: bool = False):
+        """Save state to the active slot; raises OSError if a write failed."""
+        slot = self.active
+        if slot is None:
+            return
+        journal = self.journal(slot)
+        if compact:
+            journal.compact(state)
+            journal.flush()
+        else:
+            journal.record(state)
+            # Background writes fail after record() returns; surface the last one.
+            journal.check()
+        index = self._load_index()
+        new_slot = slot not in index
+        index[slot] = SlotInfo.from_state(slot, state, self.play_time())
+        # Rewritten with full snapshots (quit, menu, explicit save) and when
+        # a slot is first used; after a crash the summary may lag the journal.
+        if compact or new_slot:
+            self._write_index()
+
+    def delete(self, slot: int):
+        self.journal(slot).clear()
+        if self._load_index().pop(slot, None) is not None:
+            self._write_index()
+
+    def close(self):
+        for journal in self._journals.values():
+            journal.close()
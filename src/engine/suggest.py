@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from difflib import SequenceMatcher
+
+
+def _deletes(word: str) -> set[str]:
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def _trigrams(word: str) -> set[str]:
+    padded = f"${word}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SuggestionIndex:
+    """Index for "did you mean" lookups.
+
+    Most typos are one slip away from the word: a dropped, extra, swapped
+    or wrong letter. Those are found by probing a table of single-letter
+    deletions, a handful of hash lookups whatever the vocabulary size.
+    Anything further falls back to trigram overlap. Either way only a few
+    candidates get difflib's ratio check.
+    """
+
+    __slots__ = ("_words", "_sizes", "_deleted", "_postings")
+
+    VERIFY = 8
+
+    def __init__(self, words=()):
+        self._words: list[str] = []
+        self._sizes: list[int] = []
+        self._deleted: dict[str, list[int]] = {}
+        self._postings: dict[str, list[int]] = {}
+        for word in dict.fromkeys(words):
+            self.add(word)
+
+    def add(self, word: str):
+        idx = len(self._words)
+        grams = _trigrams(word)
+        self._words.append(word)
+        self._sizes.append(len(grams))
+        for key in _deletes(word) | {word}:
+            self._deleted.setdefault(key, []).append(idx)
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(idx)
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def suggest(self, word: str, cutoff: float = 0.6) -> str | None:
+        """Closest indexed word with difflib ratio >= cutoff, or None."""
+        match = self.match(word, cutoff)
+        return match[0] if match else None
+
+    def match(self, word: str, cutoff: float = 0.6) -> tuple[str, float] | None:
+        near: set[int] = set()
+        for key in _deletes(word) | {word}:
+            near.update(self._deleted.get(key, ()))
+        best = self._best(word, near, cutoff)
+        if best is None:
+            best = self._best(word, self._overlapping(word), cutoff)
+        return best
+
+    def _overlapping(self, word: str) -> list[int]:
+        grams = _trigrams(word)
+        shared: dict[int, int] = {}
+        for gram in grams:
+            for idx in self._postings.get(gram, ()):
+                shared[idx] = shared.get(idx, 0) + 1
+        # Dice overlap picks the few candidates worth a full ratio().
+        sizes, n = self._sizes, len(grams)
+        ranked = sorted(shared, key=lambda i: shared[i] / (sizes[i] + n), reverse=True)
+        return ranked[:self.VERIFY]
+
+    def _best(self, word: str, candidates, cutoff: float) -> tuple[str, float] | None:
+        matcher = SequenceMatcher()
+        matcher.set_seq2(word)
+        best, best_score = None, cutoff
+        for idx in candidates:
+            candidate = self._words[idx]
+            matcher.set_seq1(candidate)
+            if matcher.real_quick_ratio() < best_score or matcher.quick_ratio() < best_score:
+                continue
+            score = matcher.ratio()
+            if score > best_score or (score == best_score and (best is None or candidate > best)):
+                best, best_score = candidate, score
+        return (best, best_score) if best is not None else None
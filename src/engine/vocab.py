@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from engine.constants import ENTER_TARGET_ALIASES
+from engine.suggest import SuggestionIndex
+
+
+class Vocabulary:
+    """Parser targets and enter aliases derived from one loaded world.
+
+    Built once per WorldTemplate, so content packs need no parser edits:
+    every multi-word feature, item and recipe id becomes a phrase the
+    parser recognises.
+    """
+
+    __slots__ = ("ids", "feature_ids", "phrases", "enter_aliases", "indexes")
+
+    def __init__(self, ids: frozenset[str], feature_ids: frozenset[str],
+                 phrases: dict[tuple[str, ...], str], enter_aliases: dict[str, str],
+                 indexes: dict[str, SuggestionIndex]):
+        self.ids = ids
+        # Ids that only name a feature, so only mean something in its room.
+        self.feature_ids = feature_ids
+        self.phrases = phrases
+        self.enter_aliases = enter_aliases
+        self.indexes = indexes
+
+    def suggest(self, word: str, *kinds: str) -> str | None:
+        """Closest known "items", "features" or "recipes" id to a typo."""
+        best = None
+        for kind in kinds:
+            match = self.indexes[kind].match(word)
+            if match and (best is None or match[1] > best[1]):
+                best = match
+        return best[0] if best else None
+
+
+def build_vocabulary(game_data: dict, rooms: dict) -> Vocabulary:
+    from engine.parser import TARGET_ALIASES, TWO_WORD_TARGETS
+
+    features = [feat for room in rooms.values() for feat in room.features]
+    feature_ids = {feat.id for feat in features if feat.id}
+    held: set[str] = set(game_data.get("items", {}))
+    held.update(game_data.get("recipes", {}))
+    for recipe in game_data.get("combine_recipes", {}).values():
+        if recipe.get("result"):
+            held.add(recipe["result"])
+    ids = feature_ids | held | set(rooms)
+
+    # Room ids stay out of the phrases: no command takes one as a target,
+    # and "enter cave entrance" should still reach the cave feature.
+    phrases: dict[tuple[str, ...], str] = {}
+    for target_id in sorted(feature_ids | held):
+        tokens = tuple(target_id.split("_"))
+        if len(tokens) > 1:
+            phrases[tokens] = target_id
+    for feat in features:
+        for alias in feat.aliases:
+            tokens = tuple(alias.split("_"))
+            if len(tokens) > 1:
+                phrases.setdefault(tokens, feat.id)
+    # Hand-written synonyms only cover phrases that are not spelled like an id.
+    phrases.update(TWO_WORD_TARGETS)
+    for alias, target in TARGET_ALIASES.items():
+        phrases[(alias,)] = target
+
+    # "enter shed" -> tool_shed: the last word of an enterable feature id,
+    # when no other enterable feature or world id claims that word.
+    heads: dict[str, set[str]] = {}
+    for feat in features:
+        if feat.enter_to and "_" in feat.id:
+            heads.setdefault(feat.id.rsplit("_", 1)[1], set()).add(feat.id)
+    enter_aliases = {
+        head: next(iter(owners))
+        for head, owners in sorted(heads.items())
+        if len(owners) == 1 and head not in ids
+    }
+    enter_aliases.update(ENTER_TARGET_ALIASES)
+
+    indexes = {
+        "items": SuggestionIndex(sorted(game_data.get("items", {}))),
+        "features": SuggestionIndex(sorted({feat.id for feat in features if feat.id})),
+        "recipes": SuggestionIndex(sorted(game_data.get("recipes", {}))),
+    }
+    return Vocabulary(frozenset(ids), frozenset(feature_ids - held), phrases, enter_aliases, indexes)
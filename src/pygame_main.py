@@ -1,8 +1,17 @@
-import json
+import os
+import time
 from pathlib import Path
+from array import array
+from collections import OrderedDict
 from functools import lru_cache
 import pygame
+try:
+    import numpy as np
+except ImportError:  # optional; only speeds up the terrain compile
+    np = None
 from engine.game_state import GameState, MAP_ROOM_POS
+from engine.replay import Recorder
+from engine.slots import SaveSlots
 from engine.parser import parse_command
 
 WIDTH  = 960
@@ -13,8 +22,14 @@ LINE_HEIGHT = 26
 GAME_INPUT_HEIGHT = 56
 MAP_INPUT_HEIGHT = 86
 MAX_LOG_LINES = 300
-SAVE_FILE = Path(__file__).resolve().parents[1] / "data" / "savegame.json"
-MAP_GLYPH_CACHE: dict[tuple[int, str, tuple[int, int, int]], pygame.Surface] = {}
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+# Single save from before slots; moved into slot 1 the first time slots are read.
+SAVE_FILE = DATA_DIR / "savegame.json"
+SAVE_SLOTS = SaveSlots(DATA_DIR / "saves", background=True, legacy=SAVE_FILE)
+# Set to a file path to record each session for engine.replay (bug reports, perf checks).
+RECORD_FILE = os.environ.get("DARK_FOREST_RECORD")
+# One GlyphAtlas per map cell size.
+MAP_GLYPH_CACHE: dict[int, "GlyphAtlas"] = {}
 
 
 def clamp_log(lines):
@@ -72,34 +87,49 @@ def _format_log_lines_for_view(log_lines, font, font_bold, max_w):
     return collapsed
 
 
-def save_game_state(state):
+# Set when a save fails, until the game screen shows it.
+_SAVE_WARNING: str | None = None
+
+
+def save_game_state(state, compact=False) -> bool:
+    global _SAVE_WARNING
     try:
-        SAVE_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with SAVE_FILE.open("w", encoding="utf-8") as f:
-            json.dump(state.snapshot(), f, ensure_ascii=False, separators=(",", ":"))
-    except Exception:
-        pass
+        SAVE_SLOTS.save(state, compact=compact)
+    except Exception as exc:
+        reason = getattr(exc, "strerror", None) or exc
+        _SAVE_WARNING = f"Warning: the game could not be saved ({reason})."
+        return False
+    return True
+
+
+def take_save_warning() -> str | None:
+    global _SAVE_WARNING
+    warning, _SAVE_WARNING = _SAVE_WARNING, None
+    return warning
 
 
-def load_game_state():
+def load_game_state(slot):
     try:
-        if not SAVE_FILE.exists():
-            return None
-        with SAVE_FILE.open("r", encoding="utf-8") as f:
-            payload = json.load(f)
-        difficulty = payload.get("difficulty", "normal")
-        state = GameState(difficulty=difficulty)
-        if state.apply_snapshot(payload):
-            return state
+        return SAVE_SLOTS.load(slot)
     except Exception:
         return None
-    return None
 
 
-def clear_game_state():
+def finish_recording(state):
+    recorder = getattr(state, "recorder", None)
+    if recorder is None or not RECORD_FILE:
+        return
+    try:
+        recorder.finish(state).dump(RECORD_FILE)
+    except Exception:
+        pass
+
+
+def clear_game_state(slot=None):
     try:
-        if SAVE_FILE.exists():
-            SAVE_FILE.unlink()
+        slot = SAVE_SLOTS.active if slot is None else slot
+        if slot is not None:
+            SAVE_SLOTS.delete(slot)
     except Exception:
         pass
 
@@ -224,7 +254,7 @@ def run_victory_screen(screen, clock, state):
 
         # Use the existing world map renderer to keep the game's visual language,
         # focused on the mountain pass where the external lighthouse sits.
-        screen.fill((9, 11, 8))
+        screen.fill(MAP_BACKDROP)
         draw_map_overlay(
             screen,
             f_map_t,
@@ -343,6 +373,7 @@ def run_defeat_screen(screen, clock):
 
 
 def _finish_after_game_end(screen, clock, state):
+    finish_recording(state)
     if getattr(state, "game_outcome", None) == "won":
         run_victory_screen(screen, clock, state)
     elif getattr(state, "game_outcome", None) == "died":
@@ -419,24 +450,21 @@ def run_menu(screen, clock):
     ff = pygame.font.SysFont(None, 20)
     cy = HEIGHT // 2 - 20
     cr = pygame.Rect(0, 0, 320, 52); cr.center = (WIDTH//2, cy)
-    sr = pygame.Rect(0, 0, 320, 52); sr.center = (WIDTH//2, cy + 58)
-    hr = pygame.Rect(0, 0, 320, 52); hr.center = (WIDTH//2, cy + 116)
-    rr = pygame.Rect(0, 0, 320, 52); rr.center = (WIDTH//2, cy + 174)
+    lr = pygame.Rect(0, 0, 320, 52); lr.center = (WIDTH//2, cy + 58)
+    sr = pygame.Rect(0, 0, 320, 52); sr.center = (WIDTH//2, cy + 116)
+    hr = pygame.Rect(0, 0, 320, 52); hr.center = (WIDTH//2, cy + 174)
     qr = pygame.Rect(0, 0, 320, 52); qr.center = (WIDTH//2, cy + 232)
-    reset_armed = False
-    reset_until = 0
 
     while True:
         clock.tick(FPS)
         mp = pygame.mouse.get_pos()
-        has_save = SAVE_FILE.exists()
-        if reset_armed and pygame.time.get_ticks() > reset_until:
-            reset_armed = False
+        latest = SAVE_SLOTS.latest()
+        has_save = latest is not None
 
         ch = point_in_rect(mp, cr) and has_save
+        lh = point_in_rect(mp, lr) and has_save
         sh = point_in_rect(mp, sr)
         hh = point_in_rect(mp, hr)
-        rh = point_in_rect(mp, rr) and has_save
         qh = point_in_rect(mp, qr)
         for ev in pygame.event.get():
             if ev.type == pygame.QUIT: return "quit"
@@ -444,26 +472,19 @@ def run_menu(screen, clock):
             if ev.type == pygame.KEYDOWN:
                 if ev.key == pygame.K_c and has_save:
                     return "continue"
+                if ev.key == pygame.K_l and has_save:
+                    return "load"
                 if ev.key == pygame.K_n:
                     return "start"
                 if ev.key == pygame.K_h:
                     return "how"
-                if ev.key == pygame.K_r and has_save:
-                    if reset_armed:
-                        return "reset"
-                    reset_armed = True
-                    reset_until = pygame.time.get_ticks() + 3000
                 if ev.key == pygame.K_RETURN:
                     return "continue" if has_save else "start"
             if ev.type == pygame.MOUSEBUTTONDOWN and ev.button == 1:
                 if ch: return "continue"
+                if lh: return "load"
                 if sh: return "start"
                 if hh: return "how"
-                if rh:
-                    if reset_armed:
-                        return "reset"
-                    reset_armed = True
-                    reset_until = pygame.time.get_ticks() + 3000
                 if qh: return "quit"
         screen.fill((14,14,14))
         t = ft.render("THE DARK FOREST", True, (240,240,240))
@@ -471,19 +492,122 @@ def run_menu(screen, clock):
         hint = fh.render("A text-based survival adventure", True, (190,190,190))
         screen.blit(hint, hint.get_rect(center=(WIDTH//2, 144)))
         draw_button(screen, cr, "Continue Saved Game", fb, ch, has_save)
+        draw_button(screen, lr, "Load / Manage Saves", fb, lh, has_save)
         draw_button(screen, sr, "New Game", fb, sh)
         draw_button(screen, hr, "How to Play", fb, hh)
-        draw_button(screen, rr, "Reset Save", fb, rh, has_save)
         draw_button(screen, qr, "Quit", fb, qh)
         if has_save:
-            k_hint = "Shortcuts: C continue   N new game   H help   R reset save   ESC quit"
+            info = SAVE_SLOTS.list()[latest - 1]
+            last = fh.render(f"Slot {latest}: {_slot_summary(info)}", True, (150, 150, 150))
+            screen.blit(last, last.get_rect(center=(WIDTH // 2, cr.top - 16)))
+            k_hint = "Shortcuts: C continue   L load   N new game   H help   ESC quit"
         else:
             k_hint = "Shortcuts: N new game   H help   ESC quit"
         screen.blit(ff.render(k_hint, True, (112, 112, 112)), (PADDING * 2, HEIGHT - 24))
-        if reset_armed and has_save:
-            warn = "Press Reset Save again within 3 seconds to confirm."
-            ws = ff.render(warn, True, (196, 145, 110))
-            screen.blit(ws, ws.get_rect(center=(WIDTH // 2, rr.bottom + 20)))
+        pygame.display.flip()
+
+
+def _slot_summary(info) -> str:
+    if info is None:
+        return "Empty"
+    saved = time.strftime("%Y-%m-%d %H:%M", time.localtime(info.saved_at))
+    return (f"{info.room_name}   HP {info.hp}/{info.max_hp}   {info.difficulty.title()}   "
+            f"{info.play_time_text()} played   {saved}")
+
+
+def run_slot_select(screen, clock, purpose):
+    """Pick a save slot. purpose is "load" (occupied slots only) or "new".
+
+    Overwriting a slot in "new", or deleting one with DEL, needs a second
+    press within 3 seconds. Returns the slot number or None.
+    """
+    ft = pygame.font.SysFont(None, 46, bold=True)
+    fs = pygame.font.SysFont(None, 28, bold=True)
+    fd = pygame.font.SysFont(None, 22)
+    ff = pygame.font.SysFont(None, 20)
+
+    rows = []
+    for i in range(SAVE_SLOTS.count):
+        r = pygame.Rect(0, 0, 640, 64)
+        r.center = (WIDTH // 2, 190 + i * 84)
+        rows.append(r)
+    br = pygame.Rect(0, 0, 200, 46)
+    br.center = (WIDTH // 2, rows[-1].bottom + 60)
+    selected = 0
+    armed = None   # (action, slot, until)
+
+    while True:
+        clock.tick(FPS)
+        mp = pygame.mouse.get_pos()
+        slots = SAVE_SLOTS.list()
+        bh = point_in_rect(mp, br)
+        now = pygame.time.get_ticks()
+        if armed and now > armed[2]:
+            armed = None
+
+        def choose(idx):
+            nonlocal armed
+            info = slots[idx]
+            if purpose == "load":
+                return idx + 1 if info is not None else None
+            if info is None or (armed and armed[:2] == ("overwrite", idx)):
+                return idx + 1
+            armed = ("overwrite", idx, now + 3000)
+            return None
+
+        for ev in pygame.event.get():
+            if ev.type == pygame.QUIT:
+                return None
+            if ev.type == pygame.KEYDOWN:
+                if ev.key == pygame.K_ESCAPE:
+                    return None
+                if ev.key == pygame.K_UP:
+                    selected = (selected - 1) % len(rows)
+                elif ev.key == pygame.K_DOWN:
+                    selected = (selected + 1) % len(rows)
+                elif pygame.K_1 <= ev.key < pygame.K_1 + len(rows):
+                    selected = ev.key - pygame.K_1
+                    picked = choose(selected)
+                    if picked:
+                        return picked
+                elif ev.key == pygame.K_RETURN:
+                    picked = choose(selected)
+                    if picked:
+                        return picked
+                elif ev.key in (pygame.K_DELETE, pygame.K_BACKSPACE) and slots[selected] is not None:
+                    if armed and armed[:2] == ("delete", selected):
+                        SAVE_SLOTS.delete(selected + 1)
+                        armed = None
+                    else:
+                        armed = ("delete", selected, now + 3000)
+            if ev.type == pygame.MOUSEBUTTONDOWN and ev.button == 1:
+                if bh:
+                    return None
+                for idx, rect in enumerate(rows):
+                    if point_in_rect(mp, rect):
+                        selected = idx
+                        picked = choose(idx)
+                        if picked:
+                            return picked
+
+        screen.fill((14, 14, 14))
+        title = "LOAD GAME" if purpose == "load" else "CHOOSE A SLOT"
+        t = ft.render(title, True, (240, 240, 240))
+        screen.blit(t, t.get_rect(center=(WIDTH // 2, 100)))
+        for idx, (rect, info) in enumerate(zip(rows, slots)):
+            enabled = info is not None or purpose == "new"
+            hovered = point_in_rect(mp, rect) or idx == selected
+            draw_button(screen, rect, f"Slot {idx + 1}", fs, hovered and enabled, enabled)
+            dt = fd.render(_slot_summary(info), True, (170, 170, 170))
+            screen.blit(dt, dt.get_rect(center=(WIDTH // 2, rect.bottom + 12)))
+        draw_button(screen, br, "Back", fs, bh)
+        if armed:
+            action, idx, _until = armed
+            verb = "overwrite" if action == "overwrite" else "delete"
+            warn = ff.render(f"Press again within 3 seconds to {verb} slot {idx + 1}.", True, (196, 145, 110))
+            screen.blit(warn, warn.get_rect(center=(WIDTH // 2, br.top - 18)))
+        foot = ff.render("1-%d / ENTER choose   DEL delete   ESC back" % len(rows), True, (112, 112, 112))
+        screen.blit(foot, foot.get_rect(center=(WIDTH // 2, HEIGHT - 24)))
         pygame.display.flip()
 
 
@@ -1093,6 +1217,71 @@ def _build_river_samples(path):
 RIVER_SAMPLES = _build_river_samples(RIVER_PATH_MAIN) + _build_river_samples(RIVER_PATH_LAKE_BRANCH)
 
 
+class SampleGrid:
+    """Uniform grid of buckets over (x, y, ...) samples.
+
+    nearest() scans the query's bucket and then rings of buckets around it,
+    stopping once a ring is further away than the best sample so far, so
+    only the buckets near the answer are looked at. Ties go to the lowest
+    sample index, the same answer as a linear scan over the list.
+    """
+
+    def __init__(self, samples, cell: int = 6):
+        self.samples = samples
+        self.cell = cell
+        # (bx, by) -> [(index, x, y), ...] for each non-empty bucket.
+        self.buckets: dict[tuple[int, int], list[tuple]] = {}
+        for idx, sample in enumerate(samples):
+            key = (int(sample[0] // cell), int(sample[1] // cell))
+            self.buckets.setdefault(key, []).append((idx, sample[0], sample[1]))
+        if self.buckets:
+            bxs = [bx for bx, _by in self.buckets]
+            bys = [by for _bx, by in self.buckets]
+            self.extent = (min(bxs), min(bys), max(bxs), max(bys))
+        else:
+            self.extent = None
+
+    def nearest(self, x, y) -> tuple[int, float]:
+        """(index, squared distance) of the closest sample, or (-1, 10**9)."""
+        best, best_d2 = -1, 10**9
+        if self.extent is None:
+            return best, best_d2
+        buckets = self.buckets
+        cell = self.cell
+        bx0, by0, bx1, by1 = self.extent
+        qx, qy = int(x // cell), int(y // cell)
+        # Distance from the query to the nearest side of its own bucket.
+        edge = min(x - qx * cell, (qx + 1) * cell - x, y - qy * cell, (qy + 1) * cell - y)
+        # Rings that do not reach the grid's extent are empty.
+        first = max(bx0 - qx, qx - bx1, by0 - qy, qy - by1, 0)
+        for r in range(first, max(qx - bx0, bx1 - qx, qy - by0, by1 - qy) + 1):
+            if r:
+                gap = (r - 1) * cell + edge
+                if gap * gap > best_d2:
+                    break
+            for by in range(max(qy - r, by0), min(qy + r, by1) + 1):
+                if by == qy - r or by == qy + r:
+                    row = range(max(qx - r, bx0), min(qx + r, bx1) + 1)
+                else:
+                    row = [bx for bx in (qx - r, qx + r) if bx0 <= bx <= bx1]
+                for bx in row:
+                    members = buckets.get((bx, by))
+                    if members is None:
+                        continue
+                    for idx, sx, sy in members:
+                        dx = x - sx
+                        dy = y - sy
+                        d2 = dx * dx + dy * dy
+                        if d2 < best_d2 or (d2 == best_d2 and idx < best):
+                            best, best_d2 = idx, d2
+        return best, best_d2
+
+
+RIVER_GRID = SampleGrid(RIVER_SAMPLES)
+# (wcol, wrow) -> (sample, d2); filled per tile or a window at a time while compiling terrain.
+_RIVER_NEAREST: dict[tuple[int, int], tuple] = {}
+
+
 def _build_path_tiles(path, thickness=1):
     tiles = set()
     if len(path) < 2:
@@ -1194,19 +1383,30 @@ def _in_free_corridor(wcol, wrow):
     return False
 
 
-@lru_cache(maxsize=131072)
 def _nearest_river_sample(wcol, wrow):
-    best = None
-    best_d2 = 10**9
-    for sample in RIVER_SAMPLES:
-        sx, sy = sample[0], sample[1]
-        dx = wcol - sx
-        dy = wrow - sy
-        d2 = dx * dx + dy * dy
-        if d2 < best_d2:
-            best_d2 = d2
-            best = sample
-    return best, best_d2
+    hit = _RIVER_NEAREST.get((wcol, wrow))
+    if hit is None:
+        idx, d2 = RIVER_GRID.nearest(wcol, wrow)
+        hit = _RIVER_NEAREST[(wcol, wrow)] = (RIVER_SAMPLES[idx] if idx >= 0 else None, d2)
+    return hit
+
+
+def _prefetch_river_window(col0, row0, cols, rows):
+    """Fill the nearest-sample memo for a whole window in one NumPy pass."""
+    if np is None or not RIVER_SAMPLES:
+        return
+    sx = np.array([sample[0] for sample in RIVER_SAMPLES], dtype=np.float64)
+    sy = np.array([sample[1] for sample in RIVER_SAMPLES], dtype=np.float64)
+    px = np.arange(col0, col0 + cols, dtype=np.float64)
+    for wrow in range(row0, row0 + rows):
+        dx = px[:, None] - sx[None, :]
+        dy = float(wrow) - sy
+        d2 = dx * dx + (dy * dy)[None, :]
+        # argmin keeps the first of equal distances, as the scan does.
+        idx = d2.argmin(axis=1)
+        best = d2[np.arange(cols), idx]
+        for k in range(cols):
+            _RIVER_NEAREST[(col0 + k, wrow)] = (RIVER_SAMPLES[idx[k]], float(best[k]))
 
 
 @lru_cache(maxsize=131072)
@@ -1589,19 +1789,402 @@ def _dist_to_nearest_room(wcol, wrow):
     return best
 
 
+def _in_cave_gray_biome(wcol, wrow):
+    # Keep grey tone tightly scoped to the cave tunnel path itself.
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            if (wcol + dx, wrow + dy) in CAVE_TUNNEL_TILES:
+                return True
+    return False
 
 
+# Colour palette
+MAP_PALETTE = {
+    "room_floor_cur":  (62, 55, 42),
+    "room_floor_exp":  (30, 27, 20),
+    "room_floor_fog":  (16, 16, 12),
+    "cabin_floor_cur": (92, 74, 52),
+    "cabin_floor_exp": (58, 44, 30),
+    "cabin_floor_fog": (30, 24, 16),
+    "cliff_floor_cur": (104, 104, 106),
+    "cliff_floor_exp": (72, 72, 76),
+    "cliff_floor_fog": (38, 38, 42),
+    "tower_floor_cur": (86, 94, 104),
+    "tower_floor_exp": (56, 64, 72),
+    "tower_floor_fog": (32, 36, 42),
+    "cave_floor_cur":  (8, 8, 10),
+    "cave_floor_exp":  (6, 6, 8),
+    "cave_floor_fog":  (3, 3, 4),
+    "lake_floor_cur":  (20, 104, 164),
+    "lake_floor_exp":  (16, 84, 138),
+    "lake_floor_fog":  (8, 34, 56),
+    "tree_cur":        (80,130, 60),
+    "tree_exp":        (48, 80, 42),
+    "tree_fog":        (26, 38, 20),
+    "cabin_edge_cur":  (176, 146, 112),
+    "cabin_edge_exp":  (126, 102, 76),
+    "cabin_edge_fog":  (62, 48, 34),
+    "cliff_edge_cur":  (150, 150, 155),
+    "cliff_edge_exp":  (108, 108, 114),
+    "cliff_edge_fog":  (58, 58, 62),
+    "tower_edge_cur":  (176, 182, 192),
+    "tower_edge_exp":  (126, 134, 146),
+    "tower_edge_fog":  (66, 72, 80),
+    "cave_edge_cur":   (18, 18, 22),
+    "cave_edge_exp":   (12, 12, 16),
+    "cave_edge_fog":   (7, 7, 9),
+    "lake_edge_cur":   (94, 176, 208),
+    "lake_edge_exp":   (72, 132, 160),
+    "lake_edge_fog":   (28, 56, 74),
+    "coast_cliff":     (128, 130, 136),
+    "path":            (48, 42, 30),
+    "player":          (245,245,215),
+    "feature":         (195,165, 55),
+    "label_exp":       (100,125, 78),
+    "label_fog":       (38,  48, 28),
+    "forest_near":     (35, 58, 30),
+    "forest_mid":      (28, 48, 22),
+    "forest_far":      (22, 38, 16),
+    "forest_dense":    (14, 24, 10),
+    "cave_forest_near": (72, 74, 78),
+    "cave_forest_mid":  (58, 60, 64),
+    "cave_forest_far":  (46, 48, 52),
+    "cave_forest_dense": (34, 36, 40),
+    "obs_path":        (45, 40, 28),
+    "lantern_glow_hot":  (246, 224, 132),
+    "lantern_glow_warm": (228, 176, 88),
+    "lantern_glow_dim":  (176, 122, 62),
+    "raft_glow_hot":   (250, 178, 94),
+    "raft_glow_warm":  (236, 152, 78),
+    "raft_glow_dim":   (194, 122, 64),
+    "highland_green":  (66, 108, 64),
+    "highland_dark":   (48, 84, 48),
+    "ridge_stone":     (126, 134, 128),
+    "peak_snow":       (194, 202, 204),
+    "peak_rock":       (156, 166, 170),
+    "valley_grass":    (90, 142, 84),
+    "valley_shadow":   (64, 106, 60),
+}
 
-def draw_map_overlay(
-    screen,
-    font_title,
-    font_body,
-    state,
-    last_cmd="",
-    show_title=True,
-    show_legend=True,
-    focus_room_id=None,
-):
+
+# Highland kinds, in the order the map checks them.
+MOUNTAIN_NONE, MOUNTAIN_PEAK, MOUNTAIN_VALLEY, MOUNTAIN_RIDGE, MOUNTAIN_HIGHLAND = range(5)
+
+
+def _mountain_kind(wcol, wrow):
+    if _is_peak_tile(wcol, wrow):
+        return MOUNTAIN_PEAK
+    if _is_valley_tile(wcol, wrow):
+        return MOUNTAIN_VALLEY
+    if _is_ridge_tile(wcol, wrow):
+        return MOUNTAIN_RIDGE
+    if _is_highland_tile(wcol, wrow):
+        return MOUNTAIN_HIGHLAND
+    return MOUNTAIN_NONE
+
+
+def _segment_dist2_np(px, py, paths):
+    """Squared distance from each point to the nearest segment of any path.
+
+    NumPy counterpart of _dist2_to_path over several polylines at once:
+    points along one axis, every segment along the other, then a min.
+    """
+    segments = [(x0, y0, x1, y1) for path in paths for (x0, y0), (x1, y1) in zip(path, path[1:])]
+    if not segments:
+        return np.full(px.shape, 10**9, dtype=np.float64)
+    seg = np.array(segments, dtype=np.float64)
+    x0, y0 = seg[:, 0:1], seg[:, 1:2]
+    vx, vy = seg[:, 2:3] - x0, seg[:, 3:4] - y0
+    wx = px[None, :] - x0
+    wy = py[None, :] - y0
+    vv = vx * vx + vy * vy
+    live = vv > 1e-9
+    t = np.clip((wx * vx + wy * vy) / np.where(live, vv, 1.0), 0.0, 1.0)
+    # Zero-length segments measure to their start point.
+    t = np.where(live, t, 0.0)
+    dx = px[None, :] - (x0 + vx * t)
+    dy = py[None, :] - (y0 + vy * t)
+    return (dx * dx + dy * dy).min(axis=0)
+
+
+def _mountain_kinds(col0, row0, cols, rows, obs=None):
+    """_mountain_kind for every tile of a window, row by row.
+
+    With NumPy the room shapes, patch ellipses and the valley and ridge
+    distances are computed for the whole window in one pass each. obs holds
+    the window's TERRAIN_OBSTACLES codes, as in TerrainRaster.obs; water
+    tiles are read from it rather than from the tile predicates.
+    """
+    if np is None:
+        return [_mountain_kind(wcol, wrow)
+                for wrow in range(row0, row0 + rows)
+                for wcol in range(col0, col0 + cols)]
+    ys, xs = np.divmod(np.arange(cols * rows), cols)
+    px = (xs + col0).astype(np.float64)
+    py = (ys + row0).astype(np.float64)
+    if obs is None:
+        obs = [TERRAIN_OBSTACLES.index(_obstacle_at(wcol, wrow)[0] or "")
+               for wrow in range(row0, row0 + rows)
+               for wcol in range(col0, col0 + cols)]
+    # Reefs and shoals only ever sit on bay tiles.
+    water = np.isin(np.asarray(obs), [TERRAIN_OBSTACLES.index(o) for o in TERRAIN_WATER])
+
+    # _in_room_shape: the first non-transparent room whose box holds the tile.
+    shaped = np.zeros(px.shape, dtype=bool)
+    claimed = np.zeros(px.shape, dtype=bool)
+    for rid, rx, ry, rw, rh in MAP_NON_INTERIOR_BOUNDS:
+        if rid in TRANSPARENT_ROOMS:
+            continue
+        box = ~claimed & (px >= rx) & (px < rx + rw) & (py >= ry) & (py < ry + rh)
+        cx = (rw - 1) / 2.0
+        cy = (rh - 1) / 2.0
+        ax = max(cx - 0.4, 1.0)
+        ay = max(cy - 0.4, 1.0)
+        d = ((px - rx - cx) / ax) ** 2 + ((py - ry - cy) / ay) ** 2
+        shaped |= box & (d <= 1.2)
+        claimed |= box
+    land = ~shaped & ~water
+
+    def in_patches(patches):
+        hit = np.zeros(px.shape, dtype=bool)
+        for cx, cy, rx, ry in patches:
+            ex = (px - cx) / rx
+            ey = (py - cy) / ry
+            hit |= ex * ex + ey * ey <= 1.0
+        return hit
+
+    highland = land & (px >= 50) & in_patches(MOUNTAIN_HIGHLAND_PATCHES)
+    peak = land & (px >= 60) & in_patches(MOUNTAIN_PEAK_PATCHES)
+    valley = land & (px >= 50) & (_segment_dist2_np(px, py, [MOUNTAIN_VALLEY_AXIS]) <= 2.8 * 2.8)
+    ridge = highland & ~valley & ~peak & (_segment_dist2_np(px, py, MOUNTAIN_RIDGE_LINES) <= 1.5 * 1.5)
+    kinds = np.select(
+        [peak, valley, ridge, highland],
+        [MOUNTAIN_PEAK, MOUNTAIN_VALLEY, MOUNTAIN_RIDGE, MOUNTAIN_HIGHLAND],
+        MOUNTAIN_NONE,
+    )
+    return kinds.tolist()
+
+
+def _mountain_glyph(kind, wcol, wrow):
+    C = MAP_PALETTE
+    if kind == MOUNTAIN_PEAK:
+        seed = (wcol * 13 + wrow * 11) % 13
+        if seed in (0, 5, 9):
+            return "A", C["peak_snow"]
+        if seed in (2, 6):
+            return "/", C["peak_rock"]
+        if seed in (3, 7):
+            return "\\", C["ridge_stone"]
+        if seed in (10, 12):
+            return "_", C["peak_rock"]
+        return "^", C["peak_snow"] if seed % 2 else C["peak_rock"]
+    if kind == MOUNTAIN_VALLEY:
+        seed = (wcol * 7 + wrow * 5) % 8
+        chars = ".,'`..,,"
+        return chars[seed % len(chars)], C["valley_grass"] if seed not in (2, 6) else C["valley_shadow"]
+    if kind == MOUNTAIN_RIDGE:
+        seed = (wcol * 9 + wrow * 7) % 12
+        if seed in (0, 4):
+            return "/", C["ridge_stone"]
+        if seed in (1, 5):
+            return "\\", C["ridge_stone"]
+        if seed in (2, 8):
+            return "^", C["peak_rock"]
+        if seed in (3, 9):
+            return "_", C["highland_dark"]
+        ch = "|" if seed in (6, 10) else "^"
+        return ch, C["ridge_stone"] if (wcol + wrow) % 2 else C["highland_dark"]
+    if kind == MOUNTAIN_HIGHLAND:
+        seed = (wcol * 5 + wrow * 3) % 10
+        if seed in (0, 4, 7):
+            ch = ":"
+        elif seed in (1, 6):
+            ch = "."
+        elif seed in (2, 8):
+            ch = ","
+        else:
+            ch = "`"
+        return ch, C["highland_dark"] if seed in (5, 8, 9) else C["highland_green"]
+    return None
+
+
+def _forest_glyph(wcol, wrow):
+    C = MAP_PALETTE
+    dist = _dist_to_nearest_room(wcol, wrow)
+    seed = (wcol*7 + wrow*13) % 8
+    gray = "cave_" if _in_cave_gray_biome(wcol, wrow) else ""
+    if dist == 1:
+        if seed < 6:
+            return FOREST_CHARS_NEAR[seed % len(FOREST_CHARS_NEAR)], C[gray + "forest_near"]
+        return None
+    if dist <= 3:
+        return FOREST_CHARS_MID[seed % len(FOREST_CHARS_MID)], C[gray + "forest_mid"]
+    if dist <= 6:
+        return FOREST_CHARS_FAR[seed % len(FOREST_CHARS_FAR)], C[gray + "forest_far"]
+    return FOREST_CHARS_DENSE[seed % len(FOREST_CHARS_DENSE)], C[gray + "forest_dense"]
+
+
+# Obstacle kinds as stored in TerrainRaster.obs; 0 is no obstacle.
+TERRAIN_OBSTACLES = ("", "tunnel", "island", "reef", "river", "lake", "shoal", "bay", "bramble", "cliff", "darkness")
+TERRAIN_ZONES = ("outside", "border", "inside")
+# Obstacles that are _is_water_tile tiles.
+TERRAIN_WATER = ("reef", "river", "lake", "shoal", "bay")
+
+# TerrainRaster.flags bits.
+TF_RAFT = 1        # raft crossing or route tile
+TF_COAST = 2       # coast cliff
+TF_MOUNTAIN = 4    # peak, valley, ridge or highland; look is in fog_glyph/fog_color
+TF_FOREST = 8      # visited look is plain woods, so open-water features may sit on it
+TF_NEAR_ROOM = 16  # within REVEAL_RADIUS + 2 of an overworld room
+
+# Rule predicates whose lru caches only matter while a raster is compiled.
+_TERRAIN_RULES = (
+    _room_at_cached, _overworld_room_at_cached, _in_room_shape, _is_cave_tunnel_tile,
+    _obstacle_at, _in_free_corridor, _is_river_tile, _is_lake_tile,
+    _west_ocean_limit, _is_bay_tile, _is_island_tile, _is_island_shoal_tile,
+    _is_jagged_rock_tile, _bay_depth_factor, _is_highland_tile, _is_peak_tile,
+    _is_valley_tile, _is_ridge_tile, _is_water_tile, _is_freshwater_bank_tile,
+    _is_coast_cliff_tile, _zone_char, _dist_to_nearest_room,
+)
+
+
+class TerrainRaster:
+    """Map terrain for a window of world tiles, evaluated once into arrays.
+
+    Everything that depends only on position is baked here: the room and
+    ellipse zone owning each tile (overworld and with interiors), the
+    obstacle and the room that reveals it, flag bits, the glyph and colour
+    a visited tile shows and the highland look shown once the mountains are
+    unlocked. Glyphs and colours are indices into glyphs and colors; glyph
+    0 draws nothing. draw_map_overlay only adds the state-dependent gating.
+    """
+
+    __slots__ = ("col0", "row0", "cols", "rows", "room", "iroom", "obs", "trigger",
+                 "flags", "glyph", "color", "fog_glyph", "fog_color", "glyphs", "colors",
+                 "triggers")
+
+    def __init__(self, col0: int, row0: int, cols: int, rows: int):
+        self.col0, self.row0, self.cols, self.rows = col0, row0, cols, rows
+        size = cols * rows
+        self.room = array("H", bytes(2 * size))
+        self.iroom = array("H", bytes(2 * size))
+        self.obs = array("B", bytes(size))
+        self.trigger = array("B", bytes(size))
+        self.flags = array("B", bytes(size))
+        self.glyph = array("B", bytes(size))
+        self.color = array("H", bytes(2 * size))
+        self.fog_glyph = array("B", bytes(size))
+        self.fog_color = array("H", bytes(2 * size))
+        self.glyphs: list[str] = [""]
+        self.colors: list[tuple[int, int, int]] = [(0, 0, 0)]
+        self.triggers: list[str] = [""]
+        self._compile()
+
+    def covers(self, col0: int, row0: int, cols: int, rows: int) -> bool:
+        return (self.col0 <= col0 and self.row0 <= row0
+                and col0 + cols <= self.col0 + self.cols
+                and row0 + rows <= self.row0 + self.rows)
+
+    def index(self, wcol: int, wrow: int) -> int:
+        return (wrow - self.row0) * self.cols + (wcol - self.col0)
+
+    def _compile(self):
+        glyph_ids = {"": 0}
+        color_ids = {}
+        trigger_ids = {"": 0}
+
+        def glyph(ch):
+            gid = glyph_ids.get(ch)
+            if gid is None:
+                gid = glyph_ids[ch] = len(self.glyphs)
+                self.glyphs.append(ch)
+            return gid
+
+        def color(col):
+            cid = color_ids.get(col)
+            if cid is None:
+                cid = color_ids[col] = len(self.colors)
+                self.colors.append(col)
+            return cid
+
+        def room_code(info, order):
+            if info is None:
+                return 0
+            rid, lc, lr = info
+            rw, rh = MAP_ROOM_SIZE.get(rid, (1, 1))
+            return (order[rid] + 1) << 2 | TERRAIN_ZONES.index(_ellipse_zone(lc, lr, rw, rh))
+
+        def first_index(bounds):
+            order = {}
+            for idx, entry in enumerate(bounds):
+                order.setdefault(entry[0], idx)
+            return order
+
+        overworld_order = first_index(MAP_NON_INTERIOR_BOUNDS)
+        room_order = first_index(MAP_ROOM_BOUNDS)
+
+        C = MAP_PALETTE
+        raft_tiles = RAFT_CROSSING_TILES | RAFT_ROUTE_TILES
+        # Bank tiles look one tile past the edge.
+        _prefetch_river_window(self.col0 - 1, self.row0 - 1, self.cols + 2, self.rows + 2)
+        i = 0
+        for wrow in range(self.row0, self.row0 + self.rows):
+            for wcol in range(self.col0, self.col0 + self.cols):
+                self.room[i] = room_code(_overworld_room_at_cached(wcol, wrow), overworld_order)
+                self.iroom[i] = room_code(_room_at_cached(wcol, wrow), room_order)
+                obs, trigger_rid = _obstacle_at(wcol, wrow)
+                if obs:
+                    self.obs[i] = TERRAIN_OBSTACLES.index(obs)
+                    tid = trigger_ids.get(trigger_rid)
+                    if tid is None:
+                        tid = trigger_ids[trigger_rid] = len(self.triggers)
+                        self.triggers.append(trigger_rid)
+                    self.trigger[i] = tid
+                i += 1
+
+        mountain_kinds = _mountain_kinds(self.col0, self.row0, self.cols, self.rows, self.obs)
+        i = 0
+        for wrow in range(self.row0, self.row0 + self.rows):
+            for wcol in range(self.col0, self.col0 + self.cols):
+                flags = 0
+                if (wcol, wrow) in raft_tiles:
+                    flags |= TF_RAFT
+                if _is_coast_cliff_tile(wcol, wrow):
+                    flags |= TF_COAST
+                if _dist_to_nearest_room(wcol, wrow) <= REVEAL_RADIUS + 2:
+                    flags |= TF_NEAR_ROOM
+                mountain = _mountain_glyph(mountain_kinds[i], wcol, wrow)
+                if mountain is not None:
+                    flags |= TF_MOUNTAIN
+                    self.fog_glyph[i] = glyph(mountain[0])
+                    self.fog_color[i] = color(mountain[1])
+
+                if self.obs[i]:
+                    look = _zone_char(TERRAIN_OBSTACLES[self.obs[i]], wcol, wrow)
+                elif _in_free_corridor(wcol, wrow):
+                    look = ".", C["path"]
+                elif flags & TF_COAST:
+                    look = "^" if (wcol + wrow) % 2 else "|", C["coast_cliff"]
+                elif mountain is not None:
+                    look = mountain
+                elif _is_freshwater_bank_tile(wcol, wrow):
+                    seed = (wcol * 9 + wrow * 7) % 8
+                    look = ["!", "|", "^", "|", "!", "^", "|", "!"][seed], C["forest_dense"]
+                else:
+                    flags |= TF_FOREST
+                    look = _forest_glyph(wcol, wrow)
+                if look is not None:
+                    self.glyph[i] = glyph(look[0])
+                    self.color[i] = color(look[1])
+                self.flags[i] = flags
+                i += 1
+
+
+_TERRAIN: TerrainRaster | None = None
+
+
+def _map_window(focus_room_id=None):
+    """(CELL, win_cols, win_rows, map_col0, map_row0) of the map panel."""
     avail_w = WIDTH - (PADDING * 2)
     avail_h = HEIGHT - MAP_INPUT_HEIGHT - 32
     # Fill the available map panel while preserving the world orientation.
@@ -1610,11 +2193,6 @@ def draw_map_overlay(
     CELL = max(6, min(9, avail_w // max(base_cols, 1)))
     win_cols = max(80, avail_w // CELL)
     win_rows = max(56, avail_h // CELL)
-    try:
-        mf = pygame.font.SysFont("Courier New", CELL+1)
-    except Exception:
-        mf = pygame.font.SysFont(None, CELL+2)
-
     map_col0 = MAP_WIN_COL0 - (win_cols - base_cols) // 2
     map_row0 = MAP_WIN_ROW0 - (win_rows - base_rows) // 2
     if focus_room_id and focus_room_id in MAP_ROOM_POS and focus_room_id in MAP_ROOM_SIZE:
@@ -1622,113 +2200,252 @@ def draw_map_overlay(
         rw, rh = MAP_ROOM_SIZE[focus_room_id]
         map_col0 = rx + rw // 2 - win_cols // 2
         map_row0 = ry + rh // 2 - win_rows // 2
+    return CELL, win_cols, win_rows, map_col0, map_row0
+
+
+def get_terrain(col0, row0, cols, rows) -> TerrainRaster:
+    """The terrain raster, compiled on first use over every map window.
+
+    A window outside the current raster (the panel size changed) widens it.
+    """
+    global _TERRAIN
+    terrain = _TERRAIN
+    if terrain is not None and terrain.covers(col0, row0, cols, rows):
+        return terrain
+    windows = [(col0, row0, cols, rows)]
+    windows += [(c, r, w, h) for _cell, w, h, c, r in map(_map_window, (None, *MAP_ROOM_SIZE))]
+    if terrain is not None:
+        windows.append((terrain.col0, terrain.row0, terrain.cols, terrain.rows))
+    c0 = min(c for c, _r, _w, _h in windows)
+    r0 = min(r for _c, r, _w, _h in windows)
+    c1 = max(c + w for c, _r, w, _h in windows)
+    r1 = max(r + h for _c, r, _w, h in windows)
+    _TERRAIN = TerrainRaster(c0, r0, c1 - c0, r1 - r0)
+    for rule in _TERRAIN_RULES:
+        rule.cache_clear()
+    _RIVER_NEAREST.clear()
+    return _TERRAIN
+
+
+MAP_BACKDROP = (9, 11, 8)
+MAP_LEGEND = "@ you   ? undiscovered   . path   ~~~ water   ### bramble   ^^^ cliff   |!| deep woods   raft for deep navy water"
+# More newly seen tiles than this since the last frame redraw the whole layer.
+MAP_PATCH_LIMIT = 400
+
+
+@lru_cache(maxsize=None)
+def _map_font(cell):
+    try:
+        return pygame.font.SysFont("Courier New", cell+1)
+    except Exception:
+        return pygame.font.SysFont(None, cell+2)
+
+
+class GlyphAtlas:
+    """Map glyphs for one font, rendered once into slots of a single surface.
+
+    Holds at most `capacity` glyphs. Past that the least recently drawn
+    glyph gives up its slot, so colour-animated glyphs cannot grow it.
+    Glyphs too large for a slot keep a surface of their own.
+    """
+
+    COLUMNS = 32
+
+    def __init__(self, font, capacity: int):
+        self.font = font
+        self.capacity = capacity
+        sizes = [font.size(chr(code)) for code in range(32, 127)] + [font.size(chr(9670))]
+        self.slot_w = max(w for w, _h in sizes)
+        self.slot_h = max(h for _w, h in sizes)
+        rows = -(-capacity // self.COLUMNS)
+        self.surface = pygame.Surface((self.COLUMNS * self.slot_w, rows * self.slot_h), pygame.SRCALPHA)
+        self.entries: OrderedDict[tuple[str, tuple], tuple[pygame.Surface, pygame.Rect | None]] = OrderedDict()
+        self._free = [
+            pygame.Rect((n % self.COLUMNS) * self.slot_w, (n // self.COLUMNS) * self.slot_h, self.slot_w, self.slot_h)
+            for n in reversed(range(capacity))
+        ]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, ch, color, flush):
+        """(source, area) to blit for ch in color.
+
+        flush() is called first if a slot has to be reused, so blits still
+        queued from the old glyph are drawn before it is overwritten.
+        """
+        key = (ch, color)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            return entry
+        if len(self.entries) >= self.capacity:
+            flush()
+            _source, area = self.entries.popitem(last=False)[1]
+            if area is not None:
+                self._free.append(pygame.Rect(area.x, area.y, self.slot_w, self.slot_h))
+        glyph = self.font.render(ch, True, color)
+        w, h = glyph.get_size()
+        if w > self.slot_w or h > self.slot_h:
+            entry = (glyph, None)
+        else:
+            slot = self._free.pop()
+            self.surface.fill((0, 0, 0, 0), slot)
+            # Copy the glyph's pixels and alpha as they are, without blending.
+            self.surface.blit(glyph, slot, special_flags=pygame.BLEND_RGBA_ADD)
+            entry = (self.surface, pygame.Rect(slot.x, slot.y, w, h))
+        self.entries[key] = entry
+        return entry
+
+
+# Atlas slots per map colour: room for each colour in a couple of glyphs
+# before the least recently used start being reused.
+MAP_ATLAS_SLOTS_PER_COLOUR = 2
+
+
+def _glyph_atlas(cell) -> GlyphAtlas:
+    atlas = MAP_GLYPH_CACHE.get(cell)
+    if atlas is None:
+        colours = {*FEATURE_COLORS.values(), *MAP_PALETTE.values(), *ITEM_MAP_COLORS.values()}
+        if _TERRAIN is not None:
+            colours.update(_TERRAIN.colors)
+        atlas = MAP_GLYPH_CACHE[cell] = GlyphAtlas(_map_font(cell), len(colours) * MAP_ATLAS_SLOTS_PER_COLOUR)
+    return atlas
+
+
+@lru_cache(maxsize=1)
+def _map_legend():
+    lf = pygame.font.SysFont(None, 20)
+    return lf.render(MAP_LEGEND, True, (55, 75, 45))
+
+
+class MapView:
+    """Window geometry and the state-derived switches one map frame uses."""
+
+    __slots__ = ("focus_room_id", "cell", "cols", "rows", "col0", "row0", "opx", "opy",
+                 "terrain", "visited", "cur_rid", "explored", "discovered", "has_raft",
+                 "has_lantern", "panoramic_view", "bay_unlocked", "mountain_unlocked",
+                 "focus_bounds", "plx", "ply")
+
+    def __init__(self, state, focus_room_id=None):
+        self.focus_room_id = focus_room_id
+        CELL, win_cols, win_rows, map_col0, map_row0 = _map_window(focus_room_id)
+        self.cell, self.cols, self.rows, self.col0, self.row0 = CELL, win_cols, win_rows, map_col0, map_row0
+        # Map pixel origin: centre the map window on screen
+        self.opx = (WIDTH - win_cols * CELL) // 2
+        self.opy = (HEIGHT - MAP_INPUT_HEIGHT - win_rows * CELL) // 2 + 18
+        self.terrain = get_terrain(map_col0, map_row0, win_cols, win_rows)
+
+        self.visited = state.player.visited_tiles
+        self.cur_rid = cur_rid = state.current_room_id
+        self.explored = explored = state.player.explored_rooms
+        self.discovered = discovered = state.player.discovered_rooms
+        self.has_raft = has_raft = state.player.inventory.get("raft", 0) > 0
+        self.has_lantern = state.player.inventory.get("lantern", 0) > 0
+        panoramic_unlocked = any(r in explored or r in discovered for r in ("mountain_pass", "lighthouse_interior", "lighthouse_top"))
+        self.panoramic_view = panoramic_view = (not focus_room_id) and (cur_rid in {"mountain_pass", "lighthouse_interior", "lighthouse_top"} or panoramic_unlocked)
+        self.bay_unlocked = panoramic_view or ("mountain_pass" in discovered) or (has_raft and cur_rid in {"river_run", "river_lake", "far_shore"}) or cur_rid == "open_waters"
+        self.mountain_unlocked = panoramic_view or any(
+            rid in discovered or rid in explored
+            for rid in ("mountain_pass", "lighthouse_interior", "lighthouse_top")
+        )
 
-    # Map pixel origin: centre the map window on screen
+        self.focus_bounds = None
+        if focus_room_id and focus_room_id in MAP_ROOM_POS and focus_room_id in MAP_ROOM_SIZE:
+            _frx, _fry = MAP_ROOM_POS[focus_room_id]
+            _frw, _frh = MAP_ROOM_SIZE[focus_room_id]
+            self.focus_bounds = (_frx, _fry, _frx + _frw, _fry + _frh)
+
+        self.plx = None
+        self.ply = None
+        if cur_rid in MAP_ROOM_POS and cur_rid in MAP_ROOM_SIZE:
+            cur_room = getattr(state.rooms, "peek", state.rooms.get)(cur_rid)
+            cur_rw, cur_rh = MAP_ROOM_SIZE[cur_rid]
+            if cur_room and cur_room.is_walkable:
+                self.plx = MAP_ROOM_POS[cur_rid][0] + state.local_x
+                self.ply = MAP_ROOM_POS[cur_rid][1] + state.local_y
+            else:
+                self.plx = MAP_ROOM_POS[cur_rid][0] + cur_rw // 2
+                self.ply = MAP_ROOM_POS[cur_rid][1] + cur_rh // 2
+
+    def static_key(self, state) -> tuple:
+        """Moves whenever the static layer would change, apart from newly seen tiles."""
+        versions = state.save_versions()
+        return (
+            id(state), id(state.rooms), id(self.visited), self.focus_room_id,
+            self.cell, self.cols, self.rows, self.col0, self.row0, self.cur_rid,
+            # The player section covers the room sets and the raft.
+            versions["player"], versions["rooms"],
+        )
+
+    def in_window(self, wcol, wrow) -> bool:
+        return self.col0 <= wcol < self.col0 + self.cols and self.row0 <= wrow < self.row0 + self.rows
+
+    def tile_visited(self, wcol, wrow) -> bool:
+        if self.panoramic_view or self.visited.has(wcol, wrow):
+            return True
+        if self.focus_bounds is not None:
+            fx0, fy0, fx1, fy1 = self.focus_bounds
+            return fx0 <= wcol < fx1 and fy0 <= wrow < fy1
+        return False
+
+    def putter(self, surface):
+        """(put, flush) for surface.
+
+        put(wcol, wrow, ch, color) queues one map glyph from the atlas and
+        flush() draws the queue, in order, with a single Surface.blits.
+        """
+        CELL = self.cell
+        glyph = _glyph_atlas(CELL).get
+        opx = self.opx - self.col0 * CELL
+        opy = self.opy - self.row0 * CELL
+        max_py = HEIGHT - MAP_INPUT_HEIGHT
+        queue = []
+
+        def flush():
+            if queue:
+                surface.blits(queue, doreturn=False)
+                queue.clear()
+
+        def put(wcol, wrow, ch, color):
+            px = opx + wcol*CELL
+            py = opy + wrow*CELL
+            if 0 <= px < WIDTH and 0 <= py < max_py:
+                source, area = glyph(ch, color, flush)
+                queue.append((source, (px, py), area))
+
+        return put, flush
+
+
+def _render_map_static(surface, view, state, region=None):
+    """Draw the parts of the map that only change with view.static_key().
+
+    region=(col_lo, row_lo, col_hi, row_hi) redraws just those tiles: the
+    surface is clipped to them and every tile whose glyph can reach into
+    them is drawn again, in the usual order, so the result matches a full
+    redraw.
+    """
+    CELL = view.cell
+    map_col0, map_row0 = view.col0, view.row0
+    win_cols, win_rows = view.cols, view.rows
+    opx, opy = view.opx, view.opy
     map_px_w = win_cols * CELL
     map_px_h = win_rows * CELL
-    opx = (WIDTH  - map_px_w) // 2
-    opy = (HEIGHT - MAP_INPUT_HEIGHT - map_px_h) // 2 + 18
-
-    # Title
-    if show_title:
-        ts = font_title.render("MAP", True, (140, 170, 110))
-        screen.blit(ts, ts.get_rect(center=(WIDTH//2, opy-22)))
-
-    visited = state.player.visited_tiles
-    cur_rid  = state.current_room_id
-    explored = state.player.explored_rooms
-    discovered = state.player.discovered_rooms
-    has_raft = state.player.inventory.get("raft", 0) > 0
-    has_lantern = state.player.inventory.get("lantern", 0) > 0
-    panoramic_unlocked = any(r in explored or r in discovered for r in ("mountain_pass", "lighthouse_interior", "lighthouse_top"))
-    panoramic_view = (not focus_room_id) and (cur_rid in {"mountain_pass", "lighthouse_interior", "lighthouse_top"} or panoramic_unlocked)
-    bay_unlocked = panoramic_view or ("mountain_pass" in discovered) or (has_raft and cur_rid in {"river_run", "river_lake", "far_shore"}) or cur_rid == "open_waters"
-    mountain_unlocked = panoramic_view or any(
-        rid in discovered or rid in explored
-        for rid in ("mountain_pass", "lighthouse_interior", "lighthouse_top")
-    )
-    rooms    = state.rooms
-    flicker = (pygame.time.get_ticks() // 170) % 4
-
-    plx = None
-    ply = None
-    if cur_rid in MAP_ROOM_POS and cur_rid in MAP_ROOM_SIZE:
-        cur_room = rooms.get(cur_rid)
-        cur_rw, cur_rh = MAP_ROOM_SIZE[cur_rid]
-        if cur_room and cur_room.is_walkable:
-            plx = MAP_ROOM_POS[cur_rid][0] + state.local_x
-            ply = MAP_ROOM_POS[cur_rid][1] + state.local_y
-        else:
-            plx = MAP_ROOM_POS[cur_rid][0] + cur_rw // 2
-            ply = MAP_ROOM_POS[cur_rid][1] + cur_rh // 2
-
-    # Colour palette
-    C = {
-        "room_floor_cur":  (62, 55, 42),
-        "room_floor_exp":  (30, 27, 20),
-        "room_floor_fog":  (16, 16, 12),
-        "cabin_floor_cur": (92, 74, 52),
-        "cabin_floor_exp": (58, 44, 30),
-        "cabin_floor_fog": (30, 24, 16),
-        "cliff_floor_cur": (104, 104, 106),
-        "cliff_floor_exp": (72, 72, 76),
-        "cliff_floor_fog": (38, 38, 42),
-        "tower_floor_cur": (86, 94, 104),
-        "tower_floor_exp": (56, 64, 72),
-        "tower_floor_fog": (32, 36, 42),
-        "cave_floor_cur":  (8, 8, 10),
-        "cave_floor_exp":  (6, 6, 8),
-        "cave_floor_fog":  (3, 3, 4),
-        "lake_floor_cur":  (20, 104, 164),
-        "lake_floor_exp":  (16, 84, 138),
-        "lake_floor_fog":  (8, 34, 56),
-        "tree_cur":        (80,130, 60),
-        "tree_exp":        (48, 80, 42),
-        "tree_fog":        (26, 38, 20),
-        "cabin_edge_cur":  (176, 146, 112),
-        "cabin_edge_exp":  (126, 102, 76),
-        "cabin_edge_fog":  (62, 48, 34),
-        "cliff_edge_cur":  (150, 150, 155),
-        "cliff_edge_exp":  (108, 108, 114),
-        "cliff_edge_fog":  (58, 58, 62),
-        "tower_edge_cur":  (176, 182, 192),
-        "tower_edge_exp":  (126, 134, 146),
-        "tower_edge_fog":  (66, 72, 80),
-        "cave_edge_cur":   (18, 18, 22),
-        "cave_edge_exp":   (12, 12, 16),
-        "cave_edge_fog":   (7, 7, 9),
-        "lake_edge_cur":   (94, 176, 208),
-        "lake_edge_exp":   (72, 132, 160),
-        "lake_edge_fog":   (28, 56, 74),
-        "coast_cliff":     (128, 130, 136),
-        "path":            (48, 42, 30),
-        "player":          (245,245,215),
-        "feature":         (195,165, 55),
-        "label_exp":       (100,125, 78),
-        "label_fog":       (38,  48, 28),
-        "forest_near":     (35, 58, 30),
-        "forest_mid":      (28, 48, 22),
-        "forest_far":      (22, 38, 16),
-        "forest_dense":    (14, 24, 10),
-        "cave_forest_near": (72, 74, 78),
-        "cave_forest_mid":  (58, 60, 64),
-        "cave_forest_far":  (46, 48, 52),
-        "cave_forest_dense": (34, 36, 40),
-        "obs_path":        (45, 40, 28),
-        "lantern_glow_hot":  (246, 224, 132),
-        "lantern_glow_warm": (228, 176, 88),
-        "lantern_glow_dim":  (176, 122, 62),
-        "raft_glow_hot":   (250, 178, 94),
-        "raft_glow_warm":  (236, 152, 78),
-        "raft_glow_dim":   (194, 122, 64),
-        "highland_green":  (66, 108, 64),
-        "highland_dark":   (48, 84, 48),
-        "ridge_stone":     (126, 134, 128),
-        "peak_snow":       (194, 202, 204),
-        "peak_rock":       (156, 166, 170),
-        "valley_grass":    (90, 142, 84),
-        "valley_shadow":   (64, 106, 60),
-    }
+    focus_room_id = view.focus_room_id
+    visited = view.visited
+    cur_rid = view.cur_rid
+    explored = view.explored
+    discovered = view.discovered
+    has_raft = view.has_raft
+    panoramic_view = view.panoramic_view
+    bay_unlocked = view.bay_unlocked
+    mountain_unlocked = view.mountain_unlocked
+    focus_bounds = view.focus_bounds
+    # Reads only; peek so drawing the map never copies an untouched room.
+    peek = getattr(state.rooms, "peek", state.rooms.get)
+    put, flush = view.putter(surface)
+
+    C = MAP_PALETTE
 
     TREE_CHARS = ["*","'","*",",","*","'","*"]
 
@@ -1749,37 +2466,38 @@ def draw_map_overlay(
             return chr(9670)  # ♦
         return TREE_CHARS[(lc + lr*3) % len(TREE_CHARS)]
 
-    def put(wcol, wrow, ch, color):
-        px = opx + (wcol - map_col0)*CELL
-        py = opy + (wrow - map_row0)*CELL
-        if 0 <= px < WIDTH and 0 <= py < HEIGHT - MAP_INPUT_HEIGHT:
-            key = (CELL, ch, color)
-            surf = MAP_GLYPH_CACHE.get(key)
-            if surf is None:
-                surf = mf.render(ch, True, color)
-                MAP_GLYPH_CACHE[key] = surf
-            screen.blit(surf, (px, py))
-
-    def in_cave_gray_biome(wcol, wrow):
-        # Keep grey tone tightly scoped to the cave tunnel path itself.
-        for dy in (-1, 0, 1):
-            for dx in (-1, 0, 1):
-                if (wcol + dx, wrow + dy) in CAVE_TUNNEL_TILES:
-                    return True
-        return False
+    col_lo, row_lo = map_col0, map_row0
+    col_hi, row_hi = map_col0 + win_cols, map_row0 + win_rows
+    if region is not None:
+        r_col0, r_row0, r_col1, r_row1 = region
+        surface.set_clip(pygame.Rect(
+            opx + (r_col0 - map_col0) * CELL, opy + (r_row0 - map_row0) * CELL,
+            (r_col1 - r_col0) * CELL, (r_row1 - r_row0) * CELL,
+        ))
+        surface.fill(MAP_BACKDROP)
+        # Glyphs hang right and down from their cell, at most this many cells.
+        reach = _glyph_reach(CELL)
+        col_lo, row_lo = max(col_lo, r_col0 - reach), max(row_lo, r_row0 - reach)
+        col_hi, row_hi = min(col_hi, r_col1), min(row_hi, r_row1)
 
     # Fill the map panel background to avoid empty black gutters.
-    pygame.draw.rect(screen, (9, 14, 10), (opx, opy, map_px_w, map_px_h))
-
-    focus_bounds = None
-    if focus_room_id and focus_room_id in MAP_ROOM_POS and focus_room_id in MAP_ROOM_SIZE:
-        _frx, _fry = MAP_ROOM_POS[focus_room_id]
-        _frw, _frh = MAP_ROOM_SIZE[focus_room_id]
-        focus_bounds = (_frx, _fry, _frx + _frw, _fry + _frh)
-
-    for wrow in range(map_row0, map_row0 + win_rows):
-        for wcol in range(map_col0, map_col0 + win_cols):
-            tile_visited = panoramic_view or ((wcol, wrow) in visited)
+    pygame.draw.rect(surface, (9, 14, 10), (opx, opy, map_px_w, map_px_h))
+
+    terrain = view.terrain
+    room_codes = terrain.iroom if focus_room_id else terrain.room
+    room_bounds = MAP_ROOM_BOUNDS if focus_room_id else MAP_NON_INTERIOR_BOUNDS
+    t_obs, t_trigger, t_flags = terrain.obs, terrain.trigger, terrain.flags
+    t_glyph, t_color, t_fog_glyph, t_fog_color = terrain.glyph, terrain.color, terrain.fog_glyph, terrain.fog_color
+    glyphs, colors, triggers = terrain.glyphs, terrain.colors, terrain.triggers
+    bay_obstacles = {TERRAIN_OBSTACLES.index(o) for o in ("bay", "reef", "island", "shoal")}
+    crossing_known = any(r in discovered for r in ("riverbank", "far_shore", "river_lake"))
+    coast_known = "mountain_pass" in discovered
+
+    for wrow in range(row_lo, row_hi):
+        row_base = terrain.index(0, wrow)
+        for wcol in range(col_lo, col_hi):
+            i = row_base + wcol
+            tile_visited = panoramic_view or visited.has(wcol, wrow)
             if not tile_visited and focus_bounds is not None:
                 fx0, fy0, fx1, fy1 = focus_bounds
                 if fx0 <= wcol < fx1 and fy0 <= wrow < fy1:
@@ -1794,17 +2512,19 @@ def draw_map_overlay(
                     elif bg_seed == 1:
                         put(wcol, wrow, "'", (12, 18, 13))
 
-            room_info = _room_at(wcol, wrow, rooms, focus_room_id)
+            room_code = room_codes[i]
+            room_info = None
             transparent_room_info = None
-            if room_info and room_info[0] in TRANSPARENT_ROOMS:
-                transparent_room_info = room_info
-                room_info = None
+            if room_code:
+                rid, rx, ry, rw, rh = room_bounds[(room_code >> 2) - 1]
+                room_info = (rid, wcol - rx, wrow - ry, TERRAIN_ZONES[room_code & 3])
+                if rid in TRANSPARENT_ROOMS:
+                    transparent_room_info = room_info
+                    room_info = None
             if room_info:
-                rid, lc, lr = room_info
+                rid, lc, lr, zone = room_info
                 if focus_room_id and rid != focus_room_id:
                     continue
-                rw, rh = MAP_ROOM_SIZE.get(rid, (1,1))
-                zone = _ellipse_zone(lc, lr, rw, rh)
 
                 if zone == "outside":
                     pass  # part of bounding box but outside circle: treat as forest
@@ -1821,7 +2541,7 @@ def draw_map_overlay(
 
                     if zone == "border":
                         # Check if exit gap
-                        room = rooms.get(rid)
+                        room = peek(rid)
                         is_gap = room and (
                             (lr==0     and lc==rw//2 and "north" in room.exits) or
                             (lr==rh-1  and lc==rw//2 and "south" in room.exits) or
@@ -1839,7 +2559,7 @@ def draw_map_overlay(
                                 put(wcol, wrow, "+" if (lc + lr) % 2 else "|", tc)
                             elif is_cliff_room:
                                 tc = C["cliff_edge_cur"] if is_cur else (C["cliff_edge_exp"] if is_exp else C["cliff_edge_fog"])
-                                edge_ch = "^" if _is_coast_cliff_tile(wcol, wrow) and (lc + lr) % 2 else (":" if (lc + lr) % 2 else ".")
+                                edge_ch = "^" if t_flags[i] & TF_COAST and (lc + lr) % 2 else (":" if (lc + lr) % 2 else ".")
                                 put(wcol, wrow, edge_ch, tc)
                             elif is_tower_room:
                                 tc = C["tower_edge_cur"] if is_cur else (C["tower_edge_exp"] if is_exp else C["tower_edge_fog"])
@@ -1919,38 +2639,14 @@ def draw_map_overlay(
                                 else:
                                     put(wcol, wrow, ",", C["room_floor_fog"])
 
-                    # Cave lantern halo: warm ASCII light around the player only.
-                    if is_cave_room and is_cur and tile_visited and has_lantern and plx is not None and ply is not None:
-                        dist = max(abs(wcol - plx), abs(wrow - ply))
-                        phase = (flicker + wcol + wrow) % 4
-                        if dist == 1:
-                            glow_ch = "*" if phase % 2 == 0 else "+"
-                            put(wcol, wrow, glow_ch, C["lantern_glow_hot"])
-                        elif dist == 2:
-                            glow_ch = ":" if phase in (0, 2) else "."
-                            put(wcol, wrow, glow_ch, C["lantern_glow_warm"])
-                        elif dist == 3 and phase == 0:
-                            put(wcol, wrow, "'", C["lantern_glow_dim"])
-
-                    # Raft marker: stable orange/white square around player on water routes.
-                    water_nav_room = rid in {"river_run", "river_lake", "far_shore", "open_waters"}
-                    if water_nav_room and is_cur and tile_visited and has_raft and plx is not None and ply is not None:
-                        dx = wcol - plx
-                        dy = wrow - ply
-                        if max(abs(dx), abs(dy)) == 1 and (abs(dx) == 1 or abs(dy) == 1):
-                            corner = abs(dx) == 1 and abs(dy) == 1
-                            ch = "#" if corner else "O"
-                            col = (246, 244, 236) if corner else C["raft_glow_hot"]
-                            put(wcol, wrow, ch, col)
-
                     # Shore cliffs blend into the lighthouse room edge only where water touches.
-                    if is_cliff_room and (tile_visited or is_exp) and _is_coast_cliff_tile(wcol, wrow):
+                    if is_cliff_room and (tile_visited or is_exp) and t_flags[i] & TF_COAST:
                         shore_col = C["coast_cliff"] if tile_visited else C["cliff_edge_exp"]
                         put(wcol, wrow, "^" if (wcol + wrow) % 2 else "|", shore_col)
 
                     # Features (explored only, inside only)
                     if actual_exp and zone == "inside":
-                        room = rooms.get(rid)
+                        room = peek(rid)
                         if room:
                             for feat in room.features:
                                 feat_id = feat.get("id", "")
@@ -1967,32 +2663,20 @@ def draw_map_overlay(
 
                     # Visible loot items (explored only, inside only)
                     if actual_exp and zone == "inside":
-                        room = rooms.get(rid)
-                        if room:
-                            visible = room.visible_loot()
-                            if visible:
-                                item_list = list(visible.keys())
-                                half = len(item_list) // 2
-                                item_row = rh // 2 + 2
-                                for ii, item_name in enumerate(item_list):
-                                    ix = rw // 2 + ii - half
-                                    if lc == ix and lr == item_row and tile_visited:
-                                        item_info = state.game_data.get("items", {}).get(item_name, {})
-                                        itype = item_info.get("type", "")
-                                        icol = ITEM_MAP_COLORS.get(itype, (200, 180, 80))
-                                        put(wcol, wrow, item_name[0].upper(), icol)
-
-                    # Player marker
-                    if is_cur:
-                        if wcol == plx and wrow == ply:
-                            put(wcol, wrow, "@", C["player"])
+                        room = peek(rid)
+                        if room and tile_visited:
+                            for item_name in room.items_at(lc, lr):
+                                item_info = state.game_data.get("items", {}).get(item_name, {})
+                                itype = item_info.get("type", "")
+                                icol = ITEM_MAP_COLORS.get(itype, (200, 180, 80))
+                                put(wcol, wrow, item_name[0].upper(), icol)
 
                     # Room initial label for explored unexplored-here rooms
                     if is_disc and not is_cur:
                         cx_label = MAP_ROOM_POS[rid][0] + rw//2
                         cy_label = MAP_ROOM_POS[rid][1] + rh//2
                         if wcol == cx_label and wrow == cy_label:
-                            room = rooms.get(rid)
+                            room = peek(rid)
                             ch = "?" if not is_exp else (room.name[0].upper() if room else "?")
                             col = C["label_fog"] if not is_exp else C["label_exp"]
                             put(wcol, wrow, ch, col)
@@ -2003,130 +2687,44 @@ def draw_map_overlay(
                     put(wcol, wrow, ".", focus_bg_col)
                 continue
 
-            if has_raft and ((wcol, wrow) in RAFT_CROSSING_TILES or (wcol, wrow) in RAFT_ROUTE_TILES):
-                crossing_known = any(r in discovered for r in ("riverbank", "far_shore", "river_lake"))
+            flags = t_flags[i]
+            if has_raft and flags & TF_RAFT:
                 if tile_visited or crossing_known:
                     put(wcol, wrow, ".", C["obs_path"])
                 continue
 
-            obs, trigger_rid = _obstacle_at(wcol, wrow)
+            obs = t_obs[i]
             if obs:
-                if obs in {"bay", "reef", "island", "shoal"} and not bay_unlocked:
+                if obs in bay_obstacles and not bay_unlocked:
                     continue
-                zone_known = trigger_rid in discovered
+                zone_known = triggers[t_trigger[i]] in discovered
                 if tile_visited or zone_known:
-                    ch, col = _zone_char(obs, wcol, wrow)
-                    put(wcol, wrow, ch, col)
-                elif _dist_to_nearest_room(wcol, wrow) <= REVEAL_RADIUS + 2:
+                    put(wcol, wrow, glyphs[t_glyph[i]], colors[t_color[i]])
+                elif flags & TF_NEAR_ROOM:
                     put(wcol, wrow, ".", (18, 18, 14))
                 continue
 
-            if _in_free_corridor(wcol, wrow) and tile_visited:
-                put(wcol, wrow, ".", C["path"])
-                continue
-
-            coast_known = "mountain_pass" in discovered
-            if (tile_visited or coast_known) and _is_coast_cliff_tile(wcol, wrow):
-                c = "^" if (wcol + wrow) % 2 else "|"
-                put(wcol, wrow, c, C["coast_cliff"])
-                continue
-
-            if (tile_visited or mountain_unlocked) and _is_peak_tile(wcol, wrow):
-                seed = (wcol * 13 + wrow * 11) % 13
-                if seed in (0, 5, 9):
-                    ch = "A"
-                    col = C["peak_snow"]
-                elif seed in (2, 6):
-                    ch = "/"
-                    col = C["peak_rock"]
-                elif seed in (3, 7):
-                    ch = "\\"
-                    col = C["ridge_stone"]
-                elif seed in (10, 12):
-                    ch = "_"
-                    col = C["peak_rock"]
-                else:
-                    ch = "^"
-                    col = C["peak_snow"] if seed % 2 else C["peak_rock"]
-                put(wcol, wrow, ch, col)
-                continue
-
-            if (tile_visited or mountain_unlocked) and _is_valley_tile(wcol, wrow):
-                seed = (wcol * 7 + wrow * 5) % 8
-                chars = ".,'`..,,"
-                ch = chars[seed % len(chars)]
-                col = C["valley_grass"] if seed not in (2, 6) else C["valley_shadow"]
-                put(wcol, wrow, ch, col)
-                continue
-
-            if (tile_visited or mountain_unlocked) and _is_ridge_tile(wcol, wrow):
-                seed = (wcol * 9 + wrow * 7) % 12
-                if seed in (0, 4):
-                    ch = "/"
-                    col = C["ridge_stone"]
-                elif seed in (1, 5):
-                    ch = "\\"
-                    col = C["ridge_stone"]
-                elif seed in (2, 8):
-                    ch = "^"
-                    col = C["peak_rock"]
-                elif seed in (3, 9):
-                    ch = "_"
-                    col = C["highland_dark"]
-                else:
-                    ch = "|" if seed in (6, 10) else "^"
-                    col = C["ridge_stone"] if (wcol + wrow) % 2 else C["highland_dark"]
-                put(wcol, wrow, ch, col)
-                continue
-
-            if (tile_visited or mountain_unlocked) and _is_highland_tile(wcol, wrow):
-                seed = (wcol * 5 + wrow * 3) % 10
-                if seed in (0, 4, 7):
-                    ch = ":"
-                elif seed in (1, 6):
-                    ch = "."
-                elif seed in (2, 8):
-                    ch = ","
-                else:
-                    ch = "`"
-                col = C["highland_dark"] if seed in (5, 8, 9) else C["highland_green"]
-                put(wcol, wrow, ch, col)
-                continue
-
-            if tile_visited and _is_freshwater_bank_tile(wcol, wrow):
-                seed = (wcol * 9 + wrow * 7) % 8
-                bank_chars = ["!", "|", "^", "|", "!", "^", "|", "!"]
-                put(wcol, wrow, bank_chars[seed], C["forest_dense"])
+            if tile_visited:
+                # Corridor, coast, highland, bank or woods, whichever owns the tile.
+                if t_glyph[i]:
+                    put(wcol, wrow, glyphs[t_glyph[i]], colors[t_color[i]])
+                if not flags & TF_FOREST:
+                    continue
+            elif flags & TF_COAST and coast_known:
+                put(wcol, wrow, "^" if (wcol + wrow) % 2 else "|", C["coast_cliff"])
                 continue
-
-            if not tile_visited:
+            elif flags & TF_MOUNTAIN and mountain_unlocked:
+                put(wcol, wrow, glyphs[t_fog_glyph[i]], colors[t_fog_color[i]])
                 continue
-            dist = _dist_to_nearest_room(wcol, wrow)
-            seed = (wcol*7 + wrow*13) % 8
-            is_cave_gray = in_cave_gray_biome(wcol, wrow)
-            if dist == 1:
-                if seed < 6:
-                    ch = FOREST_CHARS_NEAR[seed % len(FOREST_CHARS_NEAR)]
-                    put(wcol, wrow, ch, C["cave_forest_near"] if is_cave_gray else C["forest_near"])
-            elif dist <= 3:
-                ch = FOREST_CHARS_MID[seed % len(FOREST_CHARS_MID)]
-                put(wcol, wrow, ch, C["cave_forest_mid"] if is_cave_gray else C["forest_mid"])
-            elif dist <= 6:
-                ch = FOREST_CHARS_FAR[seed % len(FOREST_CHARS_FAR)]
-                put(wcol, wrow, ch, C["cave_forest_far"] if is_cave_gray else C["forest_far"])
             else:
-                ch = FOREST_CHARS_DENSE[seed % len(FOREST_CHARS_DENSE)]
-                put(wcol, wrow, ch, C["cave_forest_dense"] if is_cave_gray else C["forest_dense"])
+                continue
 
             if transparent_room_info:
-                trid, tlc, tlr = transparent_room_info
-                trw, trh = MAP_ROOM_SIZE.get(trid, (1, 1))
-                tzone = _ellipse_zone(tlc, tlr, trw, trh)
+                trid, tlc, tlr, tzone = transparent_room_info
                 if tzone != "outside":
-                    t_is_cur = (trid == cur_rid)
                     t_actual_exp = trid in explored
                     if t_actual_exp and tzone == "inside":
-                        room = rooms.get(trid)
+                        room = peek(trid)
                         if room:
                             for feat in room.features:
                                 feat_id = feat.get("id", "")
@@ -2134,51 +2732,34 @@ def draw_map_overlay(
                                 if fx == tlc and fy == tlr and tile_visited:
                                     fcol = FEATURE_COLORS.get(feat_id, C["feature"])
                                     put(wcol, wrow, feat.get("label", "?"), fcol)
-                            visible = room.visible_loot()
-                            if visible:
-                                item_list = list(visible.keys())
-                                half = len(item_list) // 2
-                                item_row = trh // 2 + 2
-                                for ii, item_name in enumerate(item_list):
-                                    ix = trw // 2 + ii - half
-                                    if tlc == ix and tlr == item_row and tile_visited:
-                                        item_info = state.game_data.get("items", {}).get(item_name, {})
-                                        itype = item_info.get("type", "")
-                                        icol = ITEM_MAP_COLORS.get(itype, (200, 180, 80))
-                                        put(wcol, wrow, item_name[0].upper(), icol)
-                    if t_is_cur and wcol == plx and wrow == ply:
-                        put(wcol, wrow, "@", C["player"])
+                            if tile_visited:
+                                for item_name in room.items_at(tlc, tlr):
+                                    item_info = state.game_data.get("items", {}).get(item_name, {})
+                                    itype = item_info.get("type", "")
+                                    icol = ITEM_MAP_COLORS.get(itype, (200, 180, 80))
+                                    put(wcol, wrow, item_name[0].upper(), icol)
 
     if cur_rid in TRANSPARENT_ROOMS and cur_rid in MAP_ROOM_POS and cur_rid in MAP_ROOM_SIZE and not focus_room_id:
         trid = cur_rid
         trx, try_row = MAP_ROOM_POS[trid]
         trw, trh = MAP_ROOM_SIZE[trid]
-        t_room = rooms.get(trid)
+        t_room = peek(trid)
         if t_room:
             for feat in t_room.features:
                 fx, fy = feat.get("pos", (-1, -1))
                 wcol = trx + fx
                 wrow = try_row + fy
-                if panoramic_view or (wcol, wrow) in visited:
+                if panoramic_view or visited.has(wcol, wrow):
                     fcol = FEATURE_COLORS.get(feat.get("id", ""), C["feature"])
                     put(wcol, wrow, feat.get("label", "?"), fcol)
-            visible = t_room.visible_loot()
-            if visible:
-                item_list = list(visible.keys())
-                half = len(item_list) // 2
-                item_row = trh // 2 + 2
-                for ii, item_name in enumerate(item_list):
-                    ix = trw // 2 + ii - half
-                    wcol = trx + ix
-                    wrow = try_row + item_row
-                    if panoramic_view or (wcol, wrow) in visited:
-                        item_info = state.game_data.get("items", {}).get(item_name, {})
-                        itype = item_info.get("type", "")
-                        icol = ITEM_MAP_COLORS.get(itype, (200, 180, 80))
-                        put(wcol, wrow, item_name[0].upper(), icol)
-        if plx is not None and ply is not None:
-            put(plx, ply, "@", C["player"])
-
+            for item_name, (ix, iy) in t_room.item_positions().items():
+                wcol = trx + ix
+                wrow = try_row + iy
+                if panoramic_view or visited.has(wcol, wrow):
+                    item_info = state.game_data.get("items", {}).get(item_name, {})
+                    itype = item_info.get("type", "")
+                    icol = ITEM_MAP_COLORS.get(itype, (200, 180, 80))
+                    put(wcol, wrow, item_name[0].upper(), icol)
     if has_raft and not focus_room_id and bay_unlocked:
         ax, ay = RAFT_OCEAN_SPRITE_ANCHOR
         for dx, dy, ch, col in RAFT_OCEAN_SPRITE:
@@ -2186,23 +2767,157 @@ def draw_map_overlay(
             ty = ay + dy
             if _is_bay_tile(tx, ty) and not _is_island_tile(tx, ty):
                 put(tx, ty, ch, col)
-        if cur_rid == "open_waters" and plx is not None and ply is not None:
-            for dx, dy, ch, col in RAFT_OCEAN_SPRITE:
-                tx = plx + dx
-                ty = ply + dy
-                if tx == plx and ty == ply:
+
+    flush()
+    surface.set_clip(None)
+
+
+@lru_cache(maxsize=None)
+def _glyph_reach(cell):
+    mf = _map_font(cell)
+    widest = max(mf.size(ch)[0] for ch in ("W", "@", "#", chr(9670)))
+    return (max(widest, mf.get_linesize()) - 1) // cell
+
+
+def _draw_map_marks(screen, view):
+    """Per-frame marks over the static layer: player, lantern glow, raft."""
+    plx, ply = view.plx, view.ply
+    if plx is None or ply is None:
+        return
+    put, flush = view.putter(screen)
+    C = MAP_PALETTE
+    cur_rid = view.cur_rid
+    focus_room_id = view.focus_room_id
+    terrain = view.terrain
+    room_codes = terrain.iroom if focus_room_id else terrain.room
+    room_bounds = MAP_ROOM_BOUNDS if focus_room_id else MAP_NON_INTERIOR_BOUNDS
+
+    def in_cur_room(wcol, wrow):
+        # Drawn by the room itself, not as open ground or another room.
+        if not view.in_window(wcol, wrow):
+            return False
+        code = room_codes[terrain.index(wcol, wrow)]
+        if not code or room_bounds[(code >> 2) - 1][0] != cur_rid:
+            return False
+        if focus_room_id and cur_rid != focus_room_id:
+            return False
+        return TERRAIN_ZONES[code & 3] != "outside"
+
+    if cur_rid in TRANSPARENT_ROOMS:
+        if not focus_room_id:
+            put(plx, ply, "@", C["player"])
+            if view.has_raft and view.bay_unlocked and cur_rid == "open_waters":
+                for dx, dy, ch, col in RAFT_OCEAN_SPRITE:
+                    if dx or dy:
+                        put(plx + dx, ply + dy, ch, col)
+        flush()
+        return
+
+    # Cave lantern halo: warm ASCII light around the player only.
+    if cur_rid in ("cave_entrance", "cave_chamber") and view.has_lantern:
+        flicker = (pygame.time.get_ticks() // 170) % 4
+        for wrow in range(ply - 3, ply + 4):
+            for wcol in range(plx - 3, plx + 4):
+                if not in_cur_room(wcol, wrow) or not view.tile_visited(wcol, wrow):
                     continue
-                put(tx, ty, ch, col)
+                dist = max(abs(wcol - plx), abs(wrow - ply))
+                phase = (flicker + wcol + wrow) % 4
+                if dist == 1:
+                    glow_ch = "*" if phase % 2 == 0 else "+"
+                    put(wcol, wrow, glow_ch, C["lantern_glow_hot"])
+                elif dist == 2:
+                    glow_ch = ":" if phase in (0, 2) else "."
+                    put(wcol, wrow, glow_ch, C["lantern_glow_warm"])
+                elif dist == 3 and phase == 0:
+                    put(wcol, wrow, "'", C["lantern_glow_dim"])
+
+    # Raft marker: stable orange/white square around player on water routes.
+    if cur_rid in {"river_run", "river_lake", "far_shore"} and view.has_raft:
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                wcol, wrow = plx + dx, ply + dy
+                if (dx or dy) and in_cur_room(wcol, wrow) and view.tile_visited(wcol, wrow):
+                    corner = abs(dx) == 1 and abs(dy) == 1
+                    ch = "#" if corner else "O"
+                    col = (246, 244, 236) if corner else C["raft_glow_hot"]
+                    put(wcol, wrow, ch, col)
+
+    if in_cur_room(plx, ply):
+        put(plx, ply, "@", C["player"])
+    flush()
+
+
+class StaticMapLayer:
+    """Pre-rendered map terrain, rooms, features and fog for one view.
+
+    update() redraws the whole surface when the view's static key moves.
+    Otherwise it only patches tiles revealed since the last frame, which
+    _mark_visited collects in state.reveal_log while the map is open.
+    detach() stops the collecting when the map closes.
+    """
+
+    def __init__(self):
+        self.surface: pygame.Surface | None = None
+        self.key: tuple | None = None
+        self.visited_count = 0
+
+    def update(self, view, state):
+        key = view.static_key(state)
+        fresh = getattr(state, "reveal_log", None)
+        if (self.surface is None or key != self.key or fresh is None
+                or len(fresh) > MAP_PATCH_LIMIT
+                or len(view.visited) != self.visited_count + len(fresh)):
+            # The panel can run a row or so into the input strip.
+            height = max(HEIGHT - MAP_INPUT_HEIGHT, view.opy + view.rows * view.cell)
+            self.surface = pygame.Surface((WIDTH, height))
+            self.surface.fill(MAP_BACKDROP)
+            _render_map_static(self.surface, view, state)
+            self.key = key
+        elif fresh and not view.panoramic_view:
+            cols = [x for x, y in fresh if view.in_window(x, y)]
+            rows = [y for x, y in fresh if view.in_window(x, y)]
+            if cols:
+                _render_map_static(self.surface, view, state,
+                                   (min(cols), min(rows), max(cols) + 1, max(rows) + 1))
+        state.reveal_log = []
+        self.visited_count = len(view.visited)
+
+    def detach(self, state):
+        """Stop logging reveals; the next update() after this redraws in full."""
+        state.reveal_log = None
+
+
+_MAP_LAYER = StaticMapLayer()
+
+
+def draw_map_overlay(
+    screen,
+    font_title,
+    font_body,
+    state,
+    last_cmd="",
+    show_title=True,
+    show_legend=True,
+    focus_room_id=None,
+):
+    view = MapView(state, focus_room_id)
+    _MAP_LAYER.update(view, state)
+    screen.blit(_MAP_LAYER.surface, (0, 0))
+
+    # Title
+    if show_title:
+        ts = font_title.render("MAP", True, (140, 170, 110))
+        screen.blit(ts, ts.get_rect(center=(WIDTH//2, view.opy-22)))
+
+    _draw_map_marks(screen, view)
 
     if show_legend:
-        lf = pygame.font.SysFont(None, 20)
-        leg = "@ you   ? undiscovered   . path   ~~~ water   ### bramble   ^^^ cliff   |!| deep woods   raft for deep navy water"
-        ls = lf.render(leg, True, (55, 75, 45))
+        ls = _map_legend()
         screen.blit(ls, ls.get_rect(center=(WIDTH//2, HEIGHT-MAP_INPUT_HEIGHT-8)))
 
 
 def draw_map_screen(screen, font_mt, font_mb, font_in, state, input_text, cursor_idx, cursor_on, last_cmd, last_response):
-    screen.fill((9, 11, 8))
+    screen.fill(MAP_BACKDROP)
     focus_room_id = (
         state.current_room_id
         if state.current_room_id in FOCUSED_INTERIOR_ROOMS
@@ -2423,6 +3138,11 @@ _combat_fonts = {}
 _combat_anims: dict[str, tuple[int, int, int]] = {}
 COMBAT_ANIM_DURATION = 300
 ENEMY_AUTO_ATTACK_MS = 3000
+COMBAT_KEYS = {pygame.K_a: "attack", pygame.K_e: "eat", pygame.K_f: "flee"}
+COMBAT_END_LINES = {
+    "attack": "The threat is gone. You steady yourself.",
+    "flee": "You break away and catch your breath.",
+}
 
 ENCOUNTER_HINTS = {
     "feral_boar": "You hear heavy snorting and hooves scraping the dirt ahead...",
@@ -2435,6 +3155,26 @@ def _trigger_combat_anim(who: str, dx: int, dy: int):
     _combat_anims[who] = (pygame.time.get_ticks(), dx, dy)
 
 
+def _combat_turn(state, action: str, hp_flash):
+    """Play one combat action with its animation; returns (log lines, hp_flash)."""
+    now = pygame.time.get_ticks()
+    prev_hp = state.player.hp
+    if action == "attack":
+        _trigger_combat_anim("player", 30, 0)
+        hp_flash = ("enemy", "damage", now)
+    elif action in ("flee", "tick"):
+        _trigger_combat_anim("enemy", -20, 0)
+        hp_flash = ("player", "damage", now)
+    lines = state.combat_action(action)
+    if action in ("attack", "eat"):
+        if state.player.hp > prev_hp:
+            hp_flash = ("player", "heal", now)
+        elif state.player.hp < prev_hp:
+            hp_flash = ("player", "damage", now)
+        _trigger_combat_anim("enemy", -15, 0)
+    return lines, hp_flash
+
+
 def _combat_anim_offset(who: str) -> tuple[int, int]:
     anim = _combat_anims.get(who)
     if not anim:
@@ -2590,18 +3330,14 @@ def draw_combat_screen(screen, state, combat_log, btn_hovered, last_enemy_attack
 
 
 def _dispatch(cmd, state, log_lines):
-    prev_room = state.current_room_id
     log_lines.append(f"> {cmd}")
-    from engine.parser import parse_command
-    v, t = parse_command(cmd)
-    result = state.process_command(v, t)
-    log_lines.extend(result)
-    room_changed = state.current_room_id != prev_room
-    for line in reversed(result):
+    result = state.run_command(cmd, check_encounter=False)
+    log_lines.extend(result.lines)
+    for line in reversed(result.lines):
         stripped = line.strip()
         if stripped:
-            return stripped, room_changed
-    return "", room_changed
+            return stripped, result.room_changed
+    return "", result.room_changed
 
 
 def _is_save_command(cmd: str) -> bool:
@@ -2636,19 +3372,24 @@ def _edit_input_line(ev, text: str, cursor_idx: int) -> tuple[bool, str, int]:
 
 
 
-def run_game(screen, clock, state=None, difficulty="normal"):
+def run_game(screen, clock, slot, state=None, difficulty="normal"):
     font    = pygame.font.SysFont(None, 24)
     font_b  = pygame.font.SysFont(None, 24, bold=True)
     font_mt = pygame.font.SysFont(None, 42, bold=True)
     font_mb = pygame.font.SysFont(None, 24)
 
     if state is None:
-        state = load_game_state()
+        state = load_game_state(slot)
+    SAVE_SLOTS.begin(slot)
     if state is None:
         state = GameState(difficulty=difficulty)
         log_lines = list(state.get_intro_lines()) + list(state.describe_current_room())
+        if RECORD_FILE:
+            Recorder.attach(state, from_start=True)
     else:
         log_lines = ["\nSession resumed."] + list(state.describe_current_room())
+        if RECORD_FILE:
+            Recorder.attach(state)
     input_text = ""
     cursor_idx = 0
     scroll = 0
@@ -2668,10 +3409,16 @@ def run_game(screen, clock, state=None, difficulty="normal"):
     while True:
         clock.tick(FPS)
         cursor_on = (pygame.time.get_ticks() % 900) < 450
+        combat_actions = []
+        save_warning = take_save_warning()
+        if save_warning:
+            log_lines.append(save_warning)
+            log_lines = clamp_log(log_lines)
 
         for ev in pygame.event.get():
             if ev.type == pygame.QUIT:
-                save_game_state(state)
+                save_game_state(state, compact=True)
+                finish_recording(state)
                 return "quit", state
             if ev.type == pygame.KEYDOWN:
                 if ev.key == pygame.K_ESCAPE:
@@ -2679,59 +3426,22 @@ def run_game(screen, clock, state=None, difficulty="normal"):
                         continue
                     if mode in ("map", "inventory"):
                         mode = "game"; continue
-                    save_game_state(state)
+                    save_game_state(state, compact=True)
+                    finish_recording(state)
                     return "menu", state
                 if mode == "combat":
-                    if ev.key == pygame.K_a:
-                        _trigger_combat_anim("player", 30, 0)
-                        hp_flash = ("enemy", "damage", pygame.time.get_ticks())
-                        combat_log.extend(state.combat.player_attack(state.player.inventory))
-                        prev_hp = state.player.hp
-                        combat_log.extend(state.combat.enemy_attack(state.player))
-                        if state.player.hp < prev_hp:
-                            hp_flash = ("player", "damage", pygame.time.get_ticks())
-                        _trigger_combat_anim("enemy", -15, 0)
-                        last_enemy_attack_t = pygame.time.get_ticks()
-                        if state.combat.finished:
-                            state.finish_combat()
-                            if not state.is_running:
-                                return _finish_after_game_end(screen, clock, state)
-                            mode = "game"
-                            log_lines.append("The threat is gone. You steady yourself.")
-                            save_game_state(state)
-                    elif ev.key == pygame.K_e:
-                        prev_hp = state.player.hp
-                        combat_log.extend(state.combat.player_eat(state.player))
-                        if state.player.hp > prev_hp:
-                            hp_flash = ("player", "heal", pygame.time.get_ticks())
-                        combat_log.extend(state.combat.enemy_attack(state.player))
-                        if state.player.hp < prev_hp:
-                            hp_flash = ("player", "damage", pygame.time.get_ticks())
-                        _trigger_combat_anim("enemy", -15, 0)
-                        last_enemy_attack_t = pygame.time.get_ticks()
-                        if state.combat.finished:
-                            state.finish_combat()
-                            if not state.is_running:
-                                return _finish_after_game_end(screen, clock, state)
-                            mode = "game"
-                            save_game_state(state)
-                    elif ev.key == pygame.K_f:
-                        _trigger_combat_anim("enemy", -20, 0)
-                        hp_flash = ("player", "damage", pygame.time.get_ticks())
-                        combat_log.extend(state.combat.player_flee(state.player))
-                        state.finish_combat()
-                        if not state.is_running:
-                            return _finish_after_game_end(screen, clock, state)
-                        mode = "game"
-                        log_lines.append("You break away and catch your breath.")
-                        save_game_state(state)
+                    if ev.key in COMBAT_KEYS:
+                        combat_actions.append(COMBAT_KEYS[ev.key])
                     continue
                 if ev.key == pygame.K_F5:
-                    save_game_state(state)
-                    log_lines.extend(["> save", "Game saved."])
+                    if save_game_state(state, compact=True):
+                        log_lines.extend(["> save", "Game saved."])
+                        last_response = "Game saved."
+                    else:
+                        log_lines.append("> save")
+                        last_response = "Save failed."
                     log_lines = clamp_log(log_lines)
                     last_cmd = "save"
-                    last_response = "Game saved."
                     continue
                 if ev.key == pygame.K_m and not input_text:
                     mode = "map" if mode != "map" else "game"; continue
@@ -2799,10 +3509,13 @@ def run_game(screen, clock, state=None, difficulty="normal"):
                         if cmd:
                             if _is_save_command(cmd):
                                 last_cmd = cmd
-                                save_game_state(state)
-                                log_lines.extend([f"> {cmd}", "Game saved."])
+                                if save_game_state(state, compact=True):
+                                    log_lines.extend([f"> {cmd}", "Game saved."])
+                                    last_response = "Game saved."
+                                else:
+                                    log_lines.append(f"> {cmd}")
+                                    last_response = "Save failed."
                                 log_lines = clamp_log(log_lines)
-                                last_response = "Game saved."
                                 continue
                             last_cmd = cmd
                             last_response, room_changed = _dispatch(cmd, state, log_lines)
@@ -2831,49 +3544,8 @@ def run_game(screen, clock, state=None, difficulty="normal"):
                         if enabled and rect.collidepoint(ev.pos):
                             action = btn_name
                             break
-                    if action == "attack":
-                        _trigger_combat_anim("player", 30, 0)
-                        hp_flash = ("enemy", "damage", pygame.time.get_ticks())
-                        combat_log.extend(state.combat.player_attack(state.player.inventory))
-                        prev_hp = state.player.hp
-                        combat_log.extend(state.combat.enemy_attack(state.player))
-                        if state.player.hp < prev_hp:
-                            hp_flash = ("player", "damage", pygame.time.get_ticks())
-                        _trigger_combat_anim("enemy", -15, 0)
-                        last_enemy_attack_t = pygame.time.get_ticks()
-                        if state.combat.finished:
-                            state.finish_combat()
-                            if not state.is_running:
-                                return _finish_after_game_end(screen, clock, state)
-                            mode = "game"
-                            log_lines.append("The threat is gone. You steady yourself.")
-                            save_game_state(state)
-                    elif action == "eat":
-                        prev_hp = state.player.hp
-                        combat_log.extend(state.combat.player_eat(state.player))
-                        if state.player.hp > prev_hp:
-                            hp_flash = ("player", "heal", pygame.time.get_ticks())
-                        combat_log.extend(state.combat.enemy_attack(state.player))
-                        if state.player.hp < prev_hp:
-                            hp_flash = ("player", "damage", pygame.time.get_ticks())
-                        _trigger_combat_anim("enemy", -15, 0)
-                        last_enemy_attack_t = pygame.time.get_ticks()
-                        if state.combat.finished:
-                            state.finish_combat()
-                            if not state.is_running:
-                                return _finish_after_game_end(screen, clock, state)
-                            mode = "game"
-                            save_game_state(state)
-                    elif action == "flee":
-                        _trigger_combat_anim("enemy", -20, 0)
-                        hp_flash = ("player", "damage", pygame.time.get_ticks())
-                        combat_log.extend(state.combat.player_flee(state.player))
-                        state.finish_combat()
-                        if not state.is_running:
-                            return _finish_after_game_end(screen, clock, state)
-                        mode = "game"
-                        log_lines.append("You break away and catch your breath.")
-                        save_game_state(state)
+                    if action:
+                        combat_actions.append(action)
 
             if ev.type == pygame.MOUSEBUTTONDOWN and ev.button == 1 and mode == "inventory":
                 items_list = state.player.inventory_items()
@@ -2903,19 +3575,23 @@ def run_game(screen, clock, state=None, difficulty="normal"):
                     combat_btn_hovered = btn_name
                     break
 
-        if mode == "combat" and state.combat and not state.combat.finished:
-            now = pygame.time.get_ticks()
-            if now - last_enemy_attack_t >= ENEMY_AUTO_ATTACK_MS:
-                _trigger_combat_anim("enemy", -20, 0)
-                combat_log.extend(state.combat.enemy_attack(state.player))
-                hp_flash = ("player", "damage", now)
-                last_enemy_attack_t = now
-                if state.combat.finished:
-                    state.finish_combat()
-                    if not state.is_running:
-                        return _finish_after_game_end(screen, clock, state)
-                    mode = "game"
-                    save_game_state(state)
+        if mode == "combat" and state.combat and not state.combat.finished and not combat_actions:
+            if pygame.time.get_ticks() - last_enemy_attack_t >= ENEMY_AUTO_ATTACK_MS:
+                combat_actions.append("tick")
+        for action in combat_actions:
+            if state.combat is None:
+                break
+            lines, hp_flash = _combat_turn(state, action, hp_flash)
+            combat_log.extend(lines)
+            if action != "flee":
+                last_enemy_attack_t = pygame.time.get_ticks()
+            if state.combat is None:
+                if not state.is_running:
+                    return _finish_after_game_end(screen, clock, state)
+                mode = "game"
+                if action in COMBAT_END_LINES:
+                    log_lines.append(COMBAT_END_LINES[action])
+                save_game_state(state)
 
         if mode == "combat":
             combat_buttons = draw_combat_screen(screen, state, combat_log, combat_btn_hovered, last_enemy_attack_t, hp_flash)
@@ -2925,6 +3601,8 @@ def run_game(screen, clock, state=None, difficulty="normal"):
             draw_map_screen(screen, font_mt, font_mb, font, state, input_text, cursor_idx, cursor_on, last_cmd, last_response)
         else:
             draw_game_screen(screen, font, font_b, log_lines, input_text, cursor_idx, scroll, cursor_on, state)
+        if mode != "map" and state.reveal_log is not None:
+            _MAP_LAYER.detach(state)
         pygame.display.flip()
 
     return "menu", state
@@ -2935,32 +3613,38 @@ def main():
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("The Dark Forest")
     clock = pygame.time.Clock()
-    saved_state = None
+    # The last slot played and its live state, so returning from the menu skips a reload.
+    resume_slot, saved_state = None, None
     while True:
         choice = run_menu(screen, clock)
         if choice == "quit": break
         if choice == "how":
             run_instructions(screen, clock)
             continue
-        if choice == "reset":
-            clear_game_state()
-            saved_state = None
-            continue
         if choice == "start":
             difficulty = run_difficulty_select(screen, clock)
             if difficulty is None:
                 continue
-            clear_game_state()
-            saved_state = None
-            action, saved_state = run_game(screen, clock, None, difficulty)
+            slot = run_slot_select(screen, clock, "new")
+            if slot is None:
+                continue
+            clear_game_state(slot)
+            resume_slot, saved_state = slot, None
+            action, saved_state = run_game(screen, clock, slot, None, difficulty)
             if action == "quit":
                 break
             continue
-        if choice == "continue":
-            action, saved_state = run_game(screen, clock, saved_state)
+        if choice in ("continue", "load"):
+            slot = SAVE_SLOTS.latest() if choice == "continue" else run_slot_select(screen, clock, "load")
+            if slot is None:
+                continue
+            state = saved_state if slot == resume_slot else None
+            resume_slot = slot
+            action, saved_state = run_game(screen, clock, slot, state)
             if action == "quit":
                 break
             continue
+    SAVE_SLOTS.close()
     pygame.quit()
 
 
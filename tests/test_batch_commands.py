@@ -0,0 +1,28 @@
+from engine.game_state import GameState
+
+
+def test_process_commands_returns_one_result_per_command():
+    gs = GameState()
+    results = gs.process_commands(["look", "xyzzy", "inventory"])
+    assert [r.verb for r in results] == ["look", "xyzzy", "inventory"]
+    assert results[1].lines[0].startswith("Unknown command")
+    assert all(r.is_running for r in results)
+    assert not any(r.room_changed for r in results)
+
+
+def test_process_commands_stops_when_game_ends():
+    gs = GameState()
+    results = gs.process_commands(["look", "quit", "look", "look"])
+    assert len(results) == 2
+    assert results[-1].is_running is False
+    assert results[-1].game_outcome == "quit"
+
+
+def test_process_commands_saves_once_per_batch():
+    gs = GameState()
+    gs.player.inventory["machete"] = 1
+    gs.local_y = 0
+    saves = []
+    results = gs.process_commands(["go north", "look", "inventory"], save=saves.append)
+    assert saves == [gs]
+    assert results[0].room_changed
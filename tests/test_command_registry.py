@@ -0,0 +1,62 @@
+from engine import registry as registry_module
+from engine.game_state import GameState
+from engine.registry import CommandRegistry, command
+
+
+def test_every_core_verb_is_registered():
+    for verb in ("look", "help", "hint", "go", "gather", "take", "craft", "examine",
+                 "enter", "drop", "read", "use", "combine", "inventory", "quit",
+                 "dig", "leave", "exit", "eat", "save", "status"):
+        assert verb in GameState.commands
+
+
+def test_subclass_can_add_and_override_verbs():
+    class PluginState(GameState):
+        @command("wave")
+        def handle_wave(self, target):
+            return [f"You wave at the {target}."]
+
+        @command("look", takes_target=False)
+        def handle_look(self):
+            return ["Plugin look."]
+
+    gs = PluginState()
+    assert gs.process_command("wave", "trees") == ["You wave at the trees."]
+    assert gs.process_command("look", None) == ["Plugin look."]
+    assert "wave" not in GameState.commands
+
+
+def test_undecorated_override_keeps_the_verb():
+    class QuietState(GameState):
+        def handle_look(self, target=None):
+            return ["Quiet look."]
+
+    gs = QuietState()
+    assert gs.process_command("look", None) == ["Quiet look."]
+    assert GameState().process_command("look", None) != ["Quiet look."]
+
+
+def test_timing_dump_is_registered_once(monkeypatch):
+    registered = []
+    monkeypatch.setattr(registry_module.atexit, "register", lambda *args: registered.append(args))
+    registry = CommandRegistry()
+    registry.enable_timing(dump_at_exit=True)
+    registry.enable_timing(dump_at_exit=True)
+    assert len(registered) == 1
+
+
+def test_timing_counts_calls_per_verb():
+    gs = GameState()
+    registry = GameState.commands
+    registry.enable_timing()
+    try:
+        gs.process_command("look", None)
+        gs.process_command("look", None)
+        gs.process_command("go", "north")
+        stats = registry.timing()
+    finally:
+        registry.disable_timing()
+    assert stats["look"]["calls"] == 2
+    assert stats["go"]["calls"] == 1
+    assert stats["look"]["total_ms"] >= stats["look"]["max_ms"] >= 0
+    assert registry.timing() == {}
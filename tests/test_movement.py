@@ -209,6 +209,38 @@ class TestNearbyItemHints:
 
         assert not any("nearby item" in l.lower() for l in lines)
 
+    def test_item_grid_follows_take_drop_and_reveal(self):
+        room = Room(make_walkable_room("clearing", 7, 7, features=[
+            {"id": "stump", "label": "S", "desc": "A stump.", "pos": [1, 1]},
+        ]))
+        room.loot = {"note": 1, "key": 1}
+        room.loot_hidden = {"key": True}
+        room.loot_hint = {"key": "stump"}
+        assert room.item_near(3, 5) == "note"
+        assert room.item_near(1, 1) is None
+
+        room.reveal_loot_for_feature("stump")
+        assert room.item_near(1, 1) == "key"
+
+        room.take_loot("note")
+        assert room.item_near(3, 5) is None
+        room.put_loot("note")
+        assert room.item_near(3, 5) == "note"
+        assert room.item_positions() == {"key": (1, 1), "note": (3, 5)}
+
+    def test_item_placement_cached_until_loot_changes(self):
+        state = build_state([make_walkable_room("clearing", 7, 7)], "clearing")
+        state.item_registry = {}
+        room = state.rooms["clearing"]
+        room.put_loot("note")
+        placed = room.item_positions()
+        state.handle_go("north")
+        assert room.item_positions() is placed
+        version = room.loot_version
+        state.handle_take("note")
+        assert room.loot_version == version + 1
+        assert room.item_positions() == {}
+
 
 
 class TestRoomTransition:
@@ -121,3 +121,81 @@ def test_parse_recipes_alias():
     verb, target = parse_command("recipes")
     assert verb == "craft"
     assert target == "list"
+
+
+def test_parse_three_word_world_target():
+    verb, target = parse_command("dig at the x marks spot")
+    assert verb == "dig"
+    assert target == "x_marks_spot"
+    assert parse_command("examine x marks spot") == ("examine", "x_marks_spot")
+
+
+def test_parse_world_target_not_in_manual_table():
+    assert parse_command("take signal flare") == ("take", "signal_flare")
+
+
+def test_command_matcher_takes_longest_target():
+    from engine.parser import CommandMatcher
+
+    matcher = CommandMatcher({
+        ("big", "red"): "big_red",
+        ("big", "red", "button", "panel"): "big_red_button_panel",
+    })
+    assert matcher.parse("press the big red button panel now") == ("press", "big_red_button_panel")
+    assert matcher.parse("press big red button") == ("press", "big_red")
+    assert matcher.parse("press big") == ("press", "big")
+
+
+def test_parse_cache_counts_hits_and_clears_on_world_reload():
+    from engine import loader
+    from engine.parser import clear_parse_cache, parse_cache_info
+
+    clear_parse_cache()
+    parse_command("go north")
+    parse_command("go north")
+    parse_command("take old map")
+    info = parse_cache_info()
+    assert (info.hits, info.misses) == (1, 2)
+
+    loader.clear_world_cache()
+    assert parse_command("go north") == ("go", "north")
+    assert parse_cache_info().misses == 1
+
+
+@pytest.mark.parametrize("room_id, text, expected", [
+    ("thick_forest", "enter cabin door", "You step into the cabin."),
+    ("cave_entrance", "examine x marks spot", "You look closely at the flat stone."),
+    ("riverbank", "enter lake channel", "You step into the shallows. Move with go north, south, east, or west."),
+])
+def test_phrase_for_a_feature_in_another_room_falls_back_to_head_word(room_id, text, expected):
+    from engine.game_state import GameState
+
+    state = GameState()
+    state.current_room_id = room_id
+    verb, target = parse_command(text)
+    assert target.candidates[-1] == text.split()[1]
+    assert state.process_command(verb, target)[0] == expected
+
+
+def test_phrase_for_a_feature_in_this_room_keeps_longest_reading():
+    from engine.game_state import GameState
+
+    state = GameState()
+    state.current_room_id = "open_waters"
+    verb, target = parse_command("examine x marks spot")
+    assert state.process_command(verb, target)[0] == "You look closely at the x marks spot."
+
+
+@pytest.mark.parametrize("room_id, text, expected", [
+    ("cave_entrance", "enter cave entrance", "You step into the cave tunnel."),
+    ("mountain_pass", "enter lighthouse top", "You step into the lighthouse."),
+    ("riverbank", "enter shed interior", "You step into the tool shed."),
+])
+def test_room_names_are_not_parsed_as_targets(room_id, text, expected):
+    from engine.game_state import GameState
+
+    state = GameState()
+    state.current_room_id = room_id
+    verb, target = parse_command(text)
+    assert target == text.split()[1]
+    assert state.process_command(verb, target)[0] == expected
@@ -6,4 +6,22 @@ def test_player_inventory_starts_at_zero():
 
     assert player.inventory["wood"] == 0
     assert player.inventory["stone"] == 0
-    assert player.inventory["food"] == 0
\ No newline at end of file
+    assert player.inventory["food"] == 0
+
+def test_carried_weight_tracks_inventory_changes():
+    registry = {"wood": {"weight": 1}, "raft": {"weight": 8},
+                "backpack": {"weight": 2, "carry_bonus": 10}}
+    player = Player()
+    assert player.carried_weight(registry) == 0
+    player.inventory.add("raft")
+    player.inventory["wood"] = 3
+    assert player.carried_weight(registry) == 11
+    player.inventory.remove("wood", 2)
+    player.inventory.pop("raft")
+    assert player.carried_weight(registry) == 1
+    assert player.carry_limit(registry) == 20
+    player.inventory.add("backpack")
+    assert player.carry_limit(registry) == 30
+    player.inventory = {"wood": 5}
+    assert player.carried_weight(registry) == 5
+    assert player.carry_limit(registry) == 20
@@ -6,6 +6,7 @@ focused interior view renders instead of a black screen.
 """
 
 import os
+import pygame
 import pytest
 
 os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
@@ -13,13 +14,42 @@ os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
 from engine.game_state import GameState, MAP_ROOM_POS
 from pygame_main import (
     FOCUSED_INTERIOR_ROOMS,
+    GlyphAtlas,
+    HEIGHT,
     INTERIOR_ONLY_ROOMS,
+    MOUNTAIN_RIDGE_LINES,
+    MOUNTAIN_VALLEY_AXIS,
+    MAP_GLYPH_CACHE,
     MAP_NON_INTERIOR_BOUNDS,
     MAP_ROOM_BOUNDS,
     MAP_ROOM_SIZE,
+    MapView,
+    RAFT_CROSSING_TILES,
+    RIVER_SAMPLES,
+    SampleGrid,
+    StaticMapLayer,
+    TERRAIN_OBSTACLES,
+    TERRAIN_ZONES,
+    TF_COAST,
+    TF_RAFT,
+    WIDTH,
+    _ellipse_zone,
+    _is_coast_cliff_tile,
+    _map_font,
+    _map_window,
+    _mountain_kind,
+    _mountain_kinds,
+    _RIVER_NEAREST,
+    _dist2_to_path,
+    _nearest_river_sample,
+    _obstacle_at,
+    _prefetch_river_window,
+    _render_map_static,
     _overworld_room_at_cached,
     _room_at,
     _room_at_cached,
+    _segment_dist2_np,
+    get_terrain,
 )
 
 
@@ -125,3 +155,206 @@ class TestLightweightGameStateIntegration:
         state = GameState()
         state.current_room_id = "cabin_interior"
         assert state.current_room_id in FOCUSED_INTERIOR_ROOMS
+
+
+class TestTerrainRaster:
+    def _terrain(self):
+        _cell, cols, rows, col0, row0 = _map_window()
+        return get_terrain(col0, row0, cols, rows)
+
+    def test_raster_covers_every_map_window(self):
+        terrain = self._terrain()
+        for rid in (None, *MAP_ROOM_SIZE):
+            _cell, cols, rows, col0, row0 = _map_window(rid)
+            assert terrain.covers(col0, row0, cols, rows)
+
+    def test_raster_matches_rule_predicates(self):
+        terrain = self._terrain()
+        for wrow in range(terrain.row0, terrain.row0 + terrain.rows, 3):
+            for wcol in range(terrain.col0, terrain.col0 + terrain.cols, 3):
+                i = terrain.index(wcol, wrow)
+                obs, trigger = _obstacle_at(wcol, wrow)
+                assert TERRAIN_OBSTACLES[terrain.obs[i]] == (obs or "")
+                assert terrain.triggers[terrain.trigger[i]] == (trigger or "")
+                assert bool(terrain.flags[i] & TF_COAST) == _is_coast_cliff_tile(wcol, wrow)
+                info = _overworld_room_at_cached(wcol, wrow)
+                code = terrain.room[i]
+                if info is None:
+                    assert code == 0
+                else:
+                    rid, lc, lr = info
+                    assert MAP_NON_INTERIOR_BOUNDS[(code >> 2) - 1][0] == rid
+                    assert TERRAIN_ZONES[code & 3] == _ellipse_zone(lc, lr, *MAP_ROOM_SIZE[rid])
+
+    def test_interior_layer_prefers_interiors(self):
+        terrain = self._terrain()
+        code = terrain.iroom[terrain.index(20, 2)]
+        assert MAP_ROOM_BOUNDS[(code >> 2) - 1][0] == "cabin_interior"
+        code = terrain.room[terrain.index(20, 2)]
+        assert MAP_NON_INTERIOR_BOUNDS[(code >> 2) - 1][0] == "thick_forest"
+
+    def test_raft_tiles_are_flagged(self):
+        terrain = self._terrain()
+        for wcol, wrow in RAFT_CROSSING_TILES:
+            assert terrain.flags[terrain.index(wcol, wrow)] & TF_RAFT
+
+
+def _scan_nearest(samples, x, y):
+    best, best_d2 = -1, 10**9
+    for idx, sample in enumerate(samples):
+        d2 = (x - sample[0]) ** 2 + (y - sample[1]) ** 2
+        if d2 < best_d2:
+            best, best_d2 = idx, d2
+    return best, best_d2
+
+
+class TestRiverSampleGrid:
+    def test_grid_matches_linear_scan(self):
+        grid = SampleGrid(RIVER_SAMPLES)
+        for x in range(-70, 130, 3):
+            for y in range(-40, 110, 3):
+                assert grid.nearest(x, y) == _scan_nearest(RIVER_SAMPLES, x, y)
+
+    def test_rings_match_linear_scan_on_scattered_samples(self):
+        import random
+
+        rnd = random.Random(7)
+        samples = [(rnd.randint(-50, 250), rnd.randint(-30, 40)) for _ in range(300)]
+        for cell in (1, 4, 9):
+            grid = SampleGrid(samples, cell=cell)
+            for _ in range(300):
+                x, y = rnd.randint(-120, 320), rnd.randint(-90, 100)
+                assert grid.nearest(x, y) == _scan_nearest(samples, x, y)
+
+    def test_ties_go_to_the_first_sample(self):
+        samples = [(4.0, 0.0), (0.0, 4.0), (-4.0, 0.0), (0.0, -4.0)]
+        assert SampleGrid(samples, cell=2).nearest(0, 0) == (0, 16.0)
+
+    def test_empty_grid(self):
+        assert SampleGrid([]).nearest(3, 4) == (-1, 10**9)
+
+    def test_numpy_window_matches_grid(self):
+        pytest.importorskip("numpy")
+        _RIVER_NEAREST.clear()
+        _prefetch_river_window(-10, 20, 60, 30)
+        batch = dict(_RIVER_NEAREST)
+        _RIVER_NEAREST.clear()
+        assert len(batch) == 60 * 30
+        for (x, y), hit in batch.items():
+            assert hit == _nearest_river_sample(x, y)
+
+
+class TestHighlandKernel:
+    def test_window_kinds_match_tile_predicates(self):
+        col0, row0, cols, rows = 45, -5, 50, 40
+        kinds = _mountain_kinds(col0, row0, cols, rows)
+        expected = [_mountain_kind(wcol, wrow)
+                    for wrow in range(row0, row0 + rows)
+                    for wcol in range(col0, col0 + cols)]
+        assert kinds == expected
+        assert any(kinds)
+
+    def test_numpy_segment_kernel_matches_path_distance(self):
+        np = pytest.importorskip("numpy")
+        xs, ys = np.meshgrid(np.arange(40.0, 95.0, 0.7), np.arange(0.0, 40.0, 0.9))
+        px, py = xs.ravel(), ys.ravel()
+        for paths in ([MOUNTAIN_VALLEY_AXIS], MOUNTAIN_RIDGE_LINES, [[(3, 3), (3, 3), (6, 7)]]):
+            got = _segment_dist2_np(px, py, paths).tolist()
+            want = [min(_dist2_to_path(x, y, path) for path in paths)
+                    for x, y in zip(px.tolist(), py.tolist())]
+            assert got == want
+
+
+class TestStaticMapLayer:
+    def _pixels(self, layer):
+        return pygame.image.tobytes(layer.surface, "RGB")
+
+    def _redrawn(self, state):
+        layer = StaticMapLayer()
+        layer.update(MapView(state), state)
+        return self._pixels(layer)
+
+    def test_moves_log_reveals_once_the_map_listens(self):
+        state = GameState()
+        state.process_command("go", "east")
+        assert state.reveal_log is None
+        state.reveal_log = []
+        state.process_command("go", "east")
+        assert state.reveal_log
+        assert all(state.player.visited_tiles.has(x, y) for x, y in state.reveal_log)
+
+    def test_closing_the_map_stops_logging_reveals(self):
+        pygame.font.init()
+        state = GameState()
+        layer = StaticMapLayer()
+        layer.update(MapView(state), state)
+        layer.detach(state)
+        state.process_command("go", "east")
+        assert state.reveal_log is None
+        layer.update(MapView(state), state)
+        assert self._pixels(layer) == self._redrawn(state)
+
+    def test_drawing_the_map_leaves_untouched_rooms_untouched(self):
+        pygame.font.init()
+        state = GameState()
+        touched = set(state.rooms.touched())
+        for focus in (None, *MAP_ROOM_SIZE):
+            layer = StaticMapLayer()
+            view = MapView(state, focus)
+            layer.update(view, state)
+            assert view.static_key(state) == layer.key
+        assert set(state.rooms.touched()) == touched
+
+    def test_replacing_the_room_sets_moves_the_key(self):
+        state = GameState()
+        key = MapView(state).static_key(state)
+        explored = state.player.explored_rooms
+        state.player.explored_rooms = {"mountain_pass"} | set(list(explored)[1:])
+        assert len(state.player.explored_rooms) == len(explored)
+        assert MapView(state).static_key(state) != key
+        key = MapView(state).static_key(state)
+        state.player.discovered_rooms.add("mountain_pass")
+        assert MapView(state).static_key(state) != key
+
+    def test_patched_layer_matches_full_redraw(self):
+        pygame.font.init()
+        state = GameState()
+        layer = StaticMapLayer()
+        layer.update(MapView(state), state)
+        key = layer.key
+        patched = 0
+        for direction in ("east", "east", "south", "south", "west", "north"):
+            state.process_command("go", direction)
+            assert state.current_room_id == "clearing"
+            patched += len(state.reveal_log)
+            layer.update(MapView(state), state)
+            assert layer.key == key
+            assert state.reveal_log == []
+            assert self._pixels(layer) == self._redrawn(state)
+        assert patched
+
+
+class TestGlyphAtlas:
+    def test_atlas_is_bounded(self):
+        pygame.font.init()
+        atlas = GlyphAtlas(_map_font(8), 4)
+        size = atlas.surface.get_size()
+        flushes = []
+        for shade in range(20):
+            atlas.get("*", (shade, 100, 50), lambda: flushes.append(shade))
+        assert len(atlas) == 4
+        assert len(flushes) == 16
+        assert atlas.surface.get_size() == size
+        assert ("*", (19, 100, 50)) in atlas.entries
+        assert ("*", (0, 100, 50)) not in atlas.entries
+
+    def test_slot_reuse_keeps_pixels_exact(self, monkeypatch):
+        pygame.font.init()
+        state = GameState()
+        view = MapView(state)
+        roomy = pygame.Surface((WIDTH, HEIGHT))
+        _render_map_static(roomy, view, state)
+        monkeypatch.setitem(MAP_GLYPH_CACHE, view.cell, GlyphAtlas(_map_font(view.cell), 6))
+        tight = pygame.Surface((WIDTH, HEIGHT))
+        _render_map_static(tight, view, state)
+        assert pygame.image.tobytes(tight, "RGB") == pygame.image.tobytes(roomy, "RGB")
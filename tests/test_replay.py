@@ -0,0 +1,46 @@
+from engine.game_state import GameState
+from engine.replay import Recorder, SessionLog, diff_snapshots, replay
+
+
+def _play(state, commands):
+    for text in commands:
+        state.run_command(text)
+
+
+def test_replay_rebuilds_recorded_session(tmp_path):
+    gs = GameState(difficulty="hard")
+    recorder = Recorder.attach(gs, from_start=True)
+    _play(gs, ["take note", "read note", "take machete", "go north", "enter cabin",
+               "take lantern", "look", "inventory"])
+    recorder.finish(gs).dump(tmp_path / "session.json")
+
+    log = SessionLog.load(tmp_path / "session.json")
+    assert log.base is None and log.difficulty == "hard"
+    rebuilt = replay(log)
+    assert diff_snapshots(log.final, rebuilt.snapshot()) == []
+
+
+def test_replay_covers_combat_turns():
+    gs = GameState()
+    gs.player.inventory["machete"] = 1
+    gs.local_y = 0
+    recorder = Recorder.attach(gs)
+    assert gs.run_command("go north").encounter == "feral_boar"
+    gs.combat_action("tick")
+    while gs.combat is not None:
+        gs.combat_action("attack")
+    log = recorder.finish(gs)
+    assert log.events[0] == ["go", "north"] and ["tick"] in log.events
+
+    rebuilt = replay(log)
+    assert rebuilt.combat is None
+    assert diff_snapshots(log.final, rebuilt.snapshot()) == []
+    assert "thick_forest:feral_boar" in rebuilt.player.defeated_enemies
+
+
+def test_diff_snapshots_reports_paths():
+    a = GameState().snapshot()
+    b = GameState()
+    b.player.hp -= 3
+    diffs = diff_snapshots(a, b.snapshot())
+    assert diffs == [f"player.hp: {a['player']['hp']} != {a['player']['hp'] - 3}"]
@@ -93,6 +93,17 @@ class TestRoomFeatures:
         ids = {f["id"] for f in room_map["mountain_pass"].features}
         assert "lighthouse" in ids
 
+    def test_find_feature_by_id_label_and_alias(self):
+        room = Room({"id": "r", "width": 5, "height": 5, "features": [
+            {"id": "old_well", "label": "W", "pos": [1, 1], "aliases": ["Well"]},
+            {"id": "w", "label": "X", "pos": [2, 2]},
+        ]})
+        assert room.find_feature("old_well")["id"] == "old_well"
+        assert room.find_feature("w")["id"] == "old_well"
+        assert room.find_feature("well")["id"] == "old_well"
+        assert room.find_feature("x")["id"] == "w"
+        assert room.find_feature("missing") is None
+
 
 class TestRoomExits:
     def test_clearing_has_four_exits(self, room_map):
@@ -0,0 +1,174 @@
+import json
+
+import pytest
+
+from engine.game_state import GameState
+from engine.journal import SaveJournal
+from engine.save_writer import BackgroundWriter
+
+
+def _restore(journal):
+    snap = journal.load()
+    state = GameState(difficulty=snap.get("difficulty", "normal"))
+    assert state.apply_snapshot(snap) is True
+    return state
+
+
+def test_journal_replays_moves_over_snapshot(tmp_path):
+    journal = SaveJournal(tmp_path / "save.json")
+    gs = GameState()
+    journal.record(gs)
+    gs.player.inventory["machete"] = 1
+    gs.process_command("go", "east")
+    journal.record(gs)
+    gs.process_command("go", "east")
+    journal.record(gs)
+
+    assert len((tmp_path / "save.journal").read_text().splitlines()) == 2
+    restored = _restore(journal)
+    assert (restored.current_room_id, restored.local_x, restored.local_y) == (
+        gs.current_room_id, gs.local_x, gs.local_y)
+    assert restored.player.inventory.get("machete") == 1
+    assert restored.player.visited_tiles == gs.player.visited_tiles
+
+
+def test_journal_entry_carries_only_changes(tmp_path):
+    journal = SaveJournal(tmp_path / "save.json")
+    gs = GameState()
+    journal.record(gs)
+    gs.process_command("look", None)
+    journal.record(gs)
+    line = (tmp_path / "save.journal").read_text()
+    assert '"rooms"' not in line and '"inventory"' not in line
+
+
+def test_journal_entry_writes_only_dirty_fields_and_rooms(tmp_path):
+    journal = SaveJournal(tmp_path / "save.json")
+    gs = GameState()
+    first, second = list(gs.rooms)[:2]
+    gs.rooms[first].put_loot("stone")
+    gs.rooms[second]
+    journal.record(gs)
+    gs.player.hp -= 1
+    gs.player.discovered_rooms.add(second)
+    gs.rooms[second].put_loot("wood")
+    journal.record(gs)
+
+    entry = json.loads((tmp_path / "save.journal").read_text())
+    assert set(entry["player"]) == {"hp", "discovered_rooms"}
+    assert set(entry["rooms"]) == {second}
+    assert not gs.player.change_log and not gs.rooms.loot_log
+    restored = _restore(journal)
+    assert restored.rooms[first].loot.get("stone") == gs.rooms[first].loot.get("stone")
+    assert restored.rooms[second].loot.get("wood") == gs.rooms[second].loot.get("wood")
+
+
+def test_journal_compacts_and_ignores_stale_entries(tmp_path):
+    journal = SaveJournal(tmp_path / "save.json", compact_every=3)
+    gs = GameState()
+    journal.record(gs)
+    for _ in range(3):
+        gs.process_command("go", "east")
+        journal.record(gs)
+    assert (tmp_path / "save.journal").read_text() == ""
+
+    gs.player.inventory["stone"] = 4
+    journal.record(gs)
+    restored = _restore(SaveJournal(tmp_path / "save.json"))
+    assert restored.player.inventory.get("stone") == 4
+    assert restored.local_x == gs.local_x
+
+
+def test_journal_skips_log_older_than_snapshot(tmp_path):
+    journal = SaveJournal(tmp_path / "save.json")
+    gs = GameState()
+    journal.record(gs)
+    gs.process_command("go", "east")
+    journal.record(gs)
+    stale = (tmp_path / "save.journal").read_text()
+    gs.process_command("go", "east")
+    journal.compact(gs)
+    (tmp_path / "save.journal").write_text(stale)
+
+    restored = _restore(SaveJournal(tmp_path / "save.json"))
+    assert restored.local_x == gs.local_x
+
+
+def test_background_writer_coalesces_and_flushes(tmp_path):
+    journal = SaveJournal(tmp_path / "save.json", background=True)
+    journal.writer.interval = 60.0
+    gs = GameState()
+    journal.record(gs)
+    journal.flush()
+    for _ in range(5):
+        gs.process_command("go", "east")
+        journal.record(gs)
+    # Still held back by the coalescing window.
+    assert (tmp_path / "save.journal").read_text() == ""
+    journal.flush()
+    assert len((tmp_path / "save.journal").read_text().splitlines()) == 5
+    journal.close()
+    assert journal.writer.error is None
+    assert _restore(SaveJournal(tmp_path / "save.json")).local_x == gs.local_x
+    assert not (tmp_path / "save.json.tmp").exists()
+
+
+def test_background_snapshot_supersedes_queued_entries(tmp_path):
+    journal = SaveJournal(tmp_path / "save.json", background=True)
+    journal.writer.interval = 60.0
+    gs = GameState()
+    journal.record(gs)
+    journal.flush()
+    gs.process_command("go", "east")
+    journal.record(gs)
+    journal.compact(gs)
+    journal.close()
+    assert (tmp_path / "save.journal").read_text() == ""
+    assert _restore(SaveJournal(tmp_path / "save.json")).local_x == gs.local_x
+
+
+def test_journal_skips_commands_that_change_nothing(tmp_path):
+    journal = SaveJournal(tmp_path / "save.json")
+    gs = GameState()
+    journal.record(gs)
+    gs.local_y = 0
+    journal.record(gs)
+    for verb, target in (("look", None), ("help", None), ("inventory", None),
+                         ("xyzzy", None), ("go", "sideways"), ("take", "unicorn")):
+        gs.process_command(verb, target)
+        journal.record(gs)
+    assert len((tmp_path / "save.journal").read_text().splitlines()) == 1
+
+
+class _FailingWriter(BackgroundWriter):
+    def _write(self, snaps, entries):
+        raise OSError(28, "No space left on device")
+
+
+def test_background_write_failure_is_raised_by_flush(tmp_path):
+    writer = _FailingWriter(tmp_path / "save.json", tmp_path / "save.journal", interval=0.0)
+    writer.snapshot({"format": 1})
+    with pytest.raises(OSError):
+        writer.flush()
+    # Reported once; close() still stops the worker.
+    writer.flush()
+    writer.close()
+    assert not writer._thread.is_alive()
+
+
+def test_journal_rewrites_snapshot_after_failed_write(tmp_path, monkeypatch):
+    journal = SaveJournal(tmp_path / "save.json", background=True)
+    gs = GameState()
+    journal.compact(gs)
+    journal.flush()
+    monkeypatch.setattr(journal.writer, "_write", _FailingWriter._write.__get__(journal.writer))
+    gs.process_command("go", "east")
+    journal.record(gs)
+    with pytest.raises(OSError):
+        journal.flush()
+    monkeypatch.undo()
+    gs.process_command("go", "east")
+    journal.record(gs)
+    journal.close()
+    assert (tmp_path / "save.journal").read_text() == ""
+    assert _restore(SaveJournal(tmp_path / "save.json")).local_x == gs.local_x
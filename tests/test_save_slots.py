@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from engine.game_state import GameState
+from engine.journal import SaveJournal
+from engine.slots import SaveSlots
+
+
+def _played(slots, slot, difficulty="normal"):
+    gs = GameState(difficulty=difficulty)
+    slots.begin(slot)
+    gs.player.inventory["machete"] = 1
+    gs.process_command("go", "east")
+    slots.save(gs, compact=True)
+    return gs
+
+
+def test_list_reads_index_without_loading(tmp_path, monkeypatch):
+    slots = SaveSlots(tmp_path)
+    gs = _played(slots, 2, "hard")
+
+    fresh = SaveSlots(tmp_path)
+    monkeypatch.setattr(SaveJournal, "load", lambda self: (_ for _ in ()).throw(AssertionError))
+    listing = fresh.list()
+    assert listing[0] is None and listing[2] is None
+    info = listing[1]
+    assert (info.room_id, info.hp, info.difficulty) == (gs.current_room_id, gs.player.hp, "hard")
+    assert info.room_name and info.saved_at > 0
+    assert fresh.latest() == 2
+
+
+def test_load_roundtrip_and_latest(tmp_path):
+    slots = SaveSlots(tmp_path)
+    first = _played(slots, 1)
+    _played(slots, 3)
+    assert slots.latest() == 3
+
+    restored = SaveSlots(tmp_path).load(1)
+    assert restored.snapshot() == first.snapshot()
+    assert SaveSlots(tmp_path).load(2) is None
+
+
+def test_delete_clears_slot_and_index(tmp_path):
+    slots = SaveSlots(tmp_path)
+    _played(slots, 1)
+    slots.delete(1)
+    assert not slots.path(1).exists()
+    assert SaveSlots(tmp_path).list() == [None, None, None]
+    assert SaveSlots(tmp_path).latest() is None
+
+
+def test_missing_index_entry_is_rebuilt(tmp_path):
+    slots = SaveSlots(tmp_path)
+    gs = _played(slots, 1)
+    (tmp_path / "slots.json").write_text(json.dumps({"slots": {}}))
+
+    info = SaveSlots(tmp_path).list()[0]
+    assert info is not None and info.room_id == gs.current_room_id
+    assert "1" in json.loads((tmp_path / "slots.json").read_text())["slots"]
+
+
+def test_legacy_save_moves_into_slot_one(tmp_path):
+    legacy = tmp_path / "savegame.json"
+    journal = SaveJournal(legacy)
+    gs = GameState()
+    journal.record(gs)
+    gs.process_command("go", "east")
+    journal.record(gs)
+
+    slots = SaveSlots(tmp_path / "saves", legacy=legacy)
+    assert slots.latest() == 1
+    assert not legacy.exists() and not legacy.with_suffix(".journal").exists()
+    restored = slots.load(1)
+    assert (restored.current_room_id, restored.local_x, restored.local_y) == (
+        gs.current_room_id, gs.local_x, gs.local_y)
+
+
+def test_save_raises_when_a_background_write_failed(tmp_path):
+    slots = SaveSlots(tmp_path, background=True)
+    gs = _played(slots, 1)
+    journal = slots.journal(1)
+
+    def fail(snaps, entries):
+        raise OSError(30, "Read-only file system")
+
+    journal.writer._write = fail
+    gs.process_command("go", "east")
+    slots.save(gs)
+    journal.writer.wait()
+    with pytest.raises(OSError):
+        slots.save(gs)
+    del journal.writer._write
+    slots.save(gs, compact=True)
+    slots.close()
+    assert slots.load(1).local_x == gs.local_x
@@ -36,3 +36,65 @@ def test_snapshot_restores_room_loot_visibility():
     restored = GameState()
     assert restored.apply_snapshot(snap) is True
     assert "lantern" in restored.rooms["cabin_interior"].visible_loot()
+
+
+def test_snapshot_reuses_unchanged_sections():
+    gs = GameState()
+    first = gs.snapshot()
+    gs.process_command("look", None)
+    second = gs.snapshot()
+    assert second["rooms"] is first["rooms"]
+    assert second["player"]["visited_bits"] is first["player"]["visited_bits"]
+
+    gs.player.inventory["stone"] = 2
+    third = gs.snapshot()
+    assert third["player"]["inventory"]["stone"] == 2
+    assert third["rooms"] is first["rooms"]
+
+
+def test_snapshot_lists_only_rooms_that_differ_from_template():
+    gs = GameState()
+    gs.player.inventory["machete"] = 1
+    gs.local_y = 0
+    gs.process_command("go", "north")
+    assert gs.snapshot()["rooms"] == {}
+
+    gs.process_command("enter", "cabin")
+    assert gs.snapshot()["rooms"] == {}
+
+    gs.process_command("take", "lantern")
+    snap = gs.snapshot()
+    assert list(snap["rooms"]) == ["cabin_interior"]
+    assert "lantern" not in snap["rooms"]["cabin_interior"]["loot"]
+    assert snap["format"] == 2
+
+
+def test_full_room_listing_from_old_saves_still_loads():
+    gs = GameState()
+    gs.player.inventory["machete"] = 1
+    gs.local_y = 0
+    gs.process_command("go", "north")
+    gs.process_command("enter", "cabin")
+    gs.process_command("take", "lantern")
+    snap = dict(gs.snapshot())
+    del snap["format"]
+    rooms = {}
+    for rid in gs.rooms:
+        room = gs.rooms[rid]
+        rooms[rid] = {"loot": dict(room.loot), "loot_hidden": dict(room.loot_hidden)}
+    snap["rooms"] = rooms
+
+    restored = GameState()
+    assert restored.apply_snapshot(snap) is True
+    assert "lantern" not in restored.rooms["cabin_interior"].loot
+    assert set(restored.rooms.touched()) < set(rooms)
+    assert list(restored.snapshot()["rooms"]) == ["cabin_interior"]
+
+
+def test_apply_snapshot_resets_rooms_missing_from_save():
+    gs = GameState()
+    baseline = gs.snapshot()
+    room = gs.rooms[gs.current_room_id]
+    room.put_loot("stone", 3)
+    assert gs.apply_snapshot(baseline) is True
+    assert gs.rooms[gs.current_room_id].loot == gs.rooms.template(gs.current_room_id).loot
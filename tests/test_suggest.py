@@ -0,0 +1,25 @@
+from engine.game_state import GameState
+from engine.suggest import SuggestionIndex
+
+
+def test_index_finds_single_slip_typos():
+    index = SuggestionIndex(["take", "look", "torch", "machete", "stump"])
+    assert index.suggest("tkae") == "take"
+    assert index.suggest("lok") == "look"
+    assert index.suggest("torhc") == "torch"
+    assert index.suggest("mchete") == "machete"
+    assert index.suggest("stummp") == "stump"
+
+
+def test_index_falls_back_to_overlap_and_respects_cutoff():
+    index = SuggestionIndex(["signal_brazier", "signal_lens", "raft"])
+    assert index.suggest("signl_brazer") == "signal_brazier"
+    assert index.suggest("xyzzy") is None
+
+
+def test_unknown_verb_and_target_suggestions():
+    gs = GameState()
+    assert gs.process_command("tkae", None)[0] == "Unknown command: tkae. Did you mean take?"
+    assert gs.process_command("craft", "torhc") == ["You don't know how to craft torhc. Try: craft torch."]
+    assert gs.process_command("take", "mchete")[-1] == "Did you mean machete?"
+    assert gs.process_command("take", "raft") == ["There is no raft here."]
@@ -0,0 +1,49 @@
+from engine.game_state import GameState
+from engine.models import VisitedTiles
+
+
+def test_mark_and_test_across_chunks_and_negative_coords():
+    tiles = VisitedTiles()
+    for tile in [(0, 0), (31, 31), (32, 0), (-1, -1), (-33, 5)]:
+        assert tiles.mark(*tile) is True
+    assert tiles.mark(0, 0) is False
+    assert len(tiles) == 5
+    assert (-1, -1) in tiles and (31, 31) in tiles
+    assert (1, 0) not in tiles and (-2, -1) not in tiles
+    assert sorted(tiles) == sorted([(0, 0), (31, 31), (32, 0), (-1, -1), (-33, 5)])
+
+
+def test_reveal_disc_matches_the_old_square_scan():
+    for radius in (0, 1, 2, 3, 5):
+        expected = {
+            (30 + dx, -2 + dy)
+            for dy in range(-radius, radius + 1)
+            for dx in range(-radius, radius + 1)
+            if dx * dx + dy * dy <= radius * radius + 1
+        }
+        tiles = VisitedTiles()
+        assert set(tiles.reveal_disc(30, -2, radius)) == expected
+        assert tiles.reveal_disc(30, -2, radius) == []
+        assert tiles == expected
+
+
+def test_encode_roundtrip_and_old_formats():
+    tiles = VisitedTiles([(5, 5), (6, 5), (40, -3)])
+    restored = VisitedTiles.from_snapshot({"visited_bits": tiles.encode()})
+    assert restored == tiles
+    runs = {"visited_runs": [[5, [[5, 6]]], [-3, [[40, 40]]]]}
+    assert VisitedTiles.from_snapshot(runs) == tiles
+    listed = {"visited_tiles": [[5, 5], [6, 5], [40, -3]]}
+    assert VisitedTiles.from_snapshot(listed) == tiles
+
+
+def test_snapshot_with_old_visited_runs_loads():
+    gs = GameState()
+    snap = dict(gs.snapshot())
+    snap["player"] = dict(snap["player"])
+    del snap["player"]["visited_bits"]
+    snap["player"]["visited_runs"] = [[20, [[18, 22]]]]
+    restored = GameState()
+    assert restored.apply_snapshot(snap) is True
+    assert (22, 20) in restored.player.visited_tiles
+    assert len(restored.player.visited_tiles) == 5
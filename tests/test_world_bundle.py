@@ -0,0 +1,80 @@
+import os
+import shutil
+
+import pytest
+
+from engine import loader
+from engine.models import Room
+
+
+@pytest.fixture
+def data_path(tmp_path):
+    path = tmp_path / "game.json"
+    shutil.copy(loader.DATA_PATH, path)
+    yield path
+    loader.clear_world_cache()
+
+
+def _age(path, seconds):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - int(seconds * 1e9)))
+
+
+def test_bundle_round_trips_rooms(data_path):
+    bundle = loader.compile_world_bundle(data_path)
+    _age(data_path, 10)
+    world = loader.load_world_bundle(bundle, data_path)
+    fresh = loader.WorldTemplate(loader.load_game_data(data_path))
+    assert world is not None
+    assert world.rooms.keys() == fresh.rooms.keys()
+    for rid, room in fresh.rooms.items():
+        bundled = world.rooms[rid]
+        assert isinstance(bundled, Room)
+        assert bundled.features == room.features
+        assert bundled.loot == room.loot
+        assert bundled.exits == room.exits
+        assert bundled.get_description({"lantern": 1}) == room.get_description({"lantern": 1})
+    assert world.item_registry == fresh.item_registry
+    assert world.recipes == fresh.recipes
+
+
+def test_loader_prefers_fresh_bundle(data_path, monkeypatch):
+    loader.compile_world_bundle(data_path)
+    _age(data_path, 10)
+    monkeypatch.setattr(loader, "load_game_data", lambda *a, **k: pytest.fail("parsed JSON"))
+    world = loader.load_world_template(data_path)
+    assert "clearing" in world.rooms
+
+
+def test_loader_ignores_stale_bundle(data_path):
+    bundle = loader.compile_world_bundle(data_path)
+    _age(bundle, 10)
+    assert loader.load_world_bundle(bundle, data_path) is None
+    assert "clearing" in loader.load_world_template(data_path).rooms
+
+
+def test_loader_ignores_corrupt_bundle(data_path):
+    bundle = loader.bundle_path_for(data_path)
+    bundle.write_bytes(b"not a bundle")
+    _age(data_path, 10)
+    assert loader.load_world_bundle(bundle, data_path) is None
+    assert "clearing" in loader.load_world_template(data_path).rooms
+
+
+def test_bundle_carries_derived_indexes(data_path, monkeypatch):
+    bundle = loader.compile_world_bundle(data_path)
+    _age(data_path, 10)
+    fresh = loader.WorldTemplate(loader.load_game_data(data_path))
+    monkeypatch.setattr(loader, "build_vocabulary", lambda *a: pytest.fail("rebuilt vocabulary"))
+    monkeypatch.setattr(Room, "_index_features", lambda self: pytest.fail("rebuilt index"))
+    world = loader.load_world_bundle(bundle, data_path)
+    assert world is not None
+    assert world.vocabulary.phrases == fresh.vocabulary.phrases
+    assert world.vocabulary.feature_ids == fresh.vocabulary.feature_ids
+    assert world.vocabulary.suggest("lanturn", "items") == fresh.vocabulary.suggest("lanturn", "items")
+    for rid, room in fresh.rooms.items():
+        bundled = world.rooms[rid]
+        for feat in room.features:
+            found = bundled.find_feature(feat.id)
+            assert found == room.find_feature(feat.id)
+            assert any(found is f for f in bundled.features)
@@ -0,0 +1,64 @@
+from engine.game_state import GameState
+from engine.loader import load_world_template
+from engine.models import SessionRooms
+
+
+def test_sessions_share_one_world_template():
+    a = GameState()
+    b = GameState()
+    assert a.game_data is b.game_data
+    assert a.item_registry is b.item_registry
+    assert a.game_data is load_world_template().game_data
+
+
+def test_session_rooms_share_static_data():
+    world = load_world_template()
+    gs = GameState()
+    room = gs.rooms["clearing"]
+    template = world.rooms["clearing"]
+    assert room is not template
+    assert room.features is template.features
+    assert room.exits is template.exits
+    assert room.loot is not template.loot
+
+
+def test_loot_changes_stay_in_one_session():
+    a = GameState()
+    b = GameState()
+    a.process_command("take", "machete")
+    assert "machete" not in a.rooms["clearing"].loot
+    assert b.rooms["clearing"].loot.get("machete") == 1
+    assert load_world_template().rooms["clearing"].loot.get("machete") == 1
+
+
+def test_untouched_rooms_are_not_copied():
+    rooms = load_world_template().new_session_rooms()
+    assert isinstance(rooms, SessionRooms)
+    assert "clearing" in rooms
+    assert rooms.touched() == {}
+    rooms.get("clearing")
+    assert set(rooms.touched()) == {"clearing"}
+    assert len(rooms) == len(load_world_template().rooms)
+
+
+def test_room_records_are_slotted():
+    gs = GameState()
+    room = gs.rooms["clearing"]
+    feat = room.features[0]
+    assert not hasattr(room, "__dict__")
+    assert not hasattr(gs.player, "__dict__")
+    assert not hasattr(feat, "__dict__")
+    assert feat["id"] == feat.id and feat.get("missing", 1) == 1
+    assert room.id is load_world_template().rooms["clearing"].id
+
+
+def test_vocabulary_is_generated_from_world_ids():
+    vocab = load_world_template().vocabulary
+    assert vocab.phrases[("maintenance", "locker")] == "maintenance_locker"
+    assert vocab.phrases[("x", "marks", "spot")] == "x_marks_spot"
+    assert ("cabin", "interior") not in vocab.phrases
+    assert "cabin_interior" in vocab.ids
+    assert vocab.enter_aliases["shed"] == "tool_shed"
+    assert vocab.enter_aliases["stairs"] == "spiral_stairs"
+    assert vocab.enter_aliases["tower"] == "lighthouse"
+    assert GameState().vocabulary is vocab